@@ -5,6 +5,8 @@ import pandas as pd
 import os
 from typing import Dict, Any
 
+from golden_hook_x_features import fib_proximity
+
 """
 GoldenHookX (Freqtrade):
   - Long-only futures, ≥2x leverage (never 1x).
@@ -66,12 +68,7 @@ class GoldenHookX(IStrategy):
         # - Proximity score: closeness to 0.382/0.5/0.618 retracement
         df['swing_high'] = df['high'].rolling(48, min_periods=2).max()
         df['swing_low']  = df['low'].rolling(48, min_periods=2).min()
-        rng = (df['swing_high'] - df['swing_low']).replace(0, np.nan)
-        f382 = df['swing_high'] - 0.382 * rng
-        f50  = df['swing_high'] - 0.500 * rng
-        f618 = df['swing_high'] - 0.618 * rng
-        prox = 100 - 100 * ((df['close'] - pd.concat([f382,f50,f618], axis=1).apply(lambda r: r.iloc[(r - df['close']).abs().argmin()], axis=1)).abs() / (0.5 * rng))
-        df['hc'] = prox.clip(lower=0, upper=100).fillna(0)
+        df['hc'] = fib_proximity(df['swing_high'], df['swing_low'], df['close'])
 
         # Trend Strength (TS): EMA slopes + structure
         hh = (df['high'] > df['high'].shift(1)) & (df['close'] > df['close'].shift(1))
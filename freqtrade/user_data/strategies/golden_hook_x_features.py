@@ -0,0 +1,24 @@
+"""
+Golden Hook X features that do not need freqtrade.
+
+Kept next to GoldenHookX.py (freqtrade puts the strategy directory on the
+import path) so they can be imported and tested without freqtrade.
+"""
+import numpy as np
+import pandas as pd
+
+FIB_LEVELS = (0.382, 0.500, 0.618)
+
+
+def fib_proximity(swing_high: pd.Series, swing_low: pd.Series, close: pd.Series) -> pd.Series:
+    """
+    Hook confluence proxy, 0..100: how close each close is to its nearest
+    0.382/0.5/0.618 retracement of its own swing range (100 on a level, 0 at
+    half the range or more away). Rows with no swing range score 0.
+    """
+    rng = (swing_high - swing_low).replace(0, np.nan)
+    # Levels are all NaN together when the range is
+    levels = np.column_stack([(swing_high - f * rng).to_numpy() for f in FIB_LEVELS])
+    nearest_dist = np.abs(levels - close.to_numpy()[:, None]).min(axis=1)
+    prox = 100 - 100 * pd.Series(nearest_dist, index=close.index) / (0.5 * rng)
+    return prox.clip(lower=0, upper=100).fillna(0)
@@ -11,11 +11,45 @@ from typing import Optional, Union
 from freqtrade.strategy import IStrategy, merge_informative_pair, stoploss_from_open, DecimalParameter, IntParameter, BooleanParameter
 from freqtrade.persistence import Trade
 
+try:
+    # Indicators shared with the ticklet_ai strategies and analyzers through its indicator cache
+    from ticklet_ai.services.indicator_cache import CachedIndicators
+except ImportError:  # deployed on its own, without the ticklet_ai package
+    CachedIndicators = None
+
 # --------------------------------
 # Trading Dashboard Strategy converted from your current logic
 # This strategy replicates the signals and logic from your SignalGenerator component
 # --------------------------------
 
+class _TalibIndicators:
+    """TA-Lib computed directly, behind the CachedIndicators accessors (used without ticklet_ai)."""
+
+    def __init__(self, dataframe: DataFrame):
+        self.close = dataframe['close'].to_numpy(dtype=float)
+        self.high = dataframe['high'].to_numpy(dtype=float)
+        self.low = dataframe['low'].to_numpy(dtype=float)
+        self.volume = dataframe['volume'].to_numpy(dtype=float)
+
+    def ema(self, period: int) -> np.ndarray:
+        return talib.EMA(self.close, timeperiod=period)
+
+    def sma(self, period: int, source: str = 'close') -> np.ndarray:
+        return talib.SMA(getattr(self, source), timeperiod=period)
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        return talib.RSI(self.close, timeperiod=period)
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        return talib.MACD(self.close, fastperiod=fast, slowperiod=slow, signalperiod=signal)
+
+    def atr(self, period: int = 14) -> np.ndarray:
+        return talib.ATR(self.high, self.low, self.close, timeperiod=period)
+
+    def bbands(self, period: int = 20, nbdev: float = 2.0):
+        return talib.BBANDS(self.close, timeperiod=period, nbdevup=nbdev, nbdevdn=nbdev)
+
+
 class TradingDashboardStrategy(IStrategy):
     """
     Trading Dashboard Strategy - Converted from your existing React/TypeScript trading logic
@@ -90,30 +124,32 @@ class TradingDashboardStrategy(IStrategy):
         Mirrors the technical analysis from your EnhancedBinanceApi and SignalGenerator
         """
         
+        if CachedIndicators is None:
+            indicators = _TalibIndicators(dataframe)
+        else:
+            indicators = CachedIndicators.from_dataframe(dataframe, metadata.get('pair'), self.timeframe)
+        
         # RSI - Relative Strength Index (matching your signal generation logic)
-        dataframe['rsi'] = ta.RSI(dataframe['close'], timeperiod=self.rsi_period.value)
+        dataframe['rsi'] = indicators.rsi(self.rsi_period.value)
         
         # MACD - Moving Average Convergence Divergence
-        macd = ta.MACD(dataframe['close'])
-        dataframe['macd'] = macd['macd']
-        dataframe['macdsignal'] = macd['macdsignal']
-        dataframe['macdhist'] = macd['macdhist']
+        dataframe['macd'], dataframe['macdsignal'], dataframe['macdhist'] = indicators.macd()
         
         # EMA - Exponential Moving Averages
-        dataframe['ema_9'] = ta.EMA(dataframe['close'], timeperiod=9)
-        dataframe['ema_21'] = ta.EMA(dataframe['close'], timeperiod=21)
-        dataframe['ema_50'] = ta.EMA(dataframe['close'], timeperiod=50)
+        dataframe['ema_9'] = indicators.ema(9)
+        dataframe['ema_21'] = indicators.ema(21)
+        dataframe['ema_50'] = indicators.ema(50)
         
         # SMA - Simple Moving Averages for trend confirmation
-        dataframe['sma_20'] = ta.SMA(dataframe['close'], timeperiod=20)
-        dataframe['sma_50'] = ta.SMA(dataframe['close'], timeperiod=50)
+        dataframe['sma_20'] = indicators.sma(20)
+        dataframe['sma_50'] = indicators.sma(50)
         
         # ATR - Average True Range for volatility calculation (matching your volatility logic)
-        dataframe['atr'] = ta.ATR(dataframe, timeperiod=14)
+        dataframe['atr'] = indicators.atr(14)
         dataframe['volatility'] = (dataframe['atr'] / dataframe['close']) * 100
         
         # Volume analysis (matching your volume filter logic)
-        dataframe['volume_sma'] = ta.SMA(dataframe['volume'], timeperiod=20)
+        dataframe['volume_sma'] = indicators.sma(20, source='volume')
         dataframe['volume_ratio'] = dataframe['volume'] / dataframe['volume_sma']
         
         # Price change calculation (matching your price change logic)
@@ -124,10 +160,7 @@ class TradingDashboardStrategy(IStrategy):
         dataframe['usdt_volume'] = dataframe['volume'] * dataframe['close']
         
         # Bollinger Bands for support/resistance
-        bollinger = ta.BBANDS(dataframe['close'], timeperiod=20, nbdevup=2, nbdevdn=2)
-        dataframe['bb_lower'] = bollinger['lowerband']
-        dataframe['bb_middle'] = bollinger['middleband']
-        dataframe['bb_upper'] = bollinger['upperband']
+        dataframe['bb_upper'], dataframe['bb_middle'], dataframe['bb_lower'] = indicators.bbands(20, 2)
         
         # Calculate confidence score (matching your confidence calculation logic)
         dataframe['base_confidence'] = np.where(dataframe['volatility'] > 0, 
@@ -391,6 +424,9 @@ class TradingDashboardStrategy(IStrategy):
         return "1.0"
 
 
-# Required import at the end for technical analysis functions
-import talib.abstract as ta
+# Required import at the end for technical analysis functions (only used without ticklet_ai)
+try:
+    import talib
+except ImportError:
+    talib = None
 from functools import reduce
\ No newline at end of file
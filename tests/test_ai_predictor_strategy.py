@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from ticklet_ai.strategies.ai_predictor_strategy import AIPredictorStrategy
+
+
+def test_batched_patterns_match_per_window_checks():
+    strategy = AIPredictorStrategy()
+    rng = np.random.default_rng(7)
+    prices = pd.Series(100 + np.cumsum(rng.normal(0, 0.3, 400)))
+    prices.iloc[50] = np.nan
+
+    patterns = strategy._detect_patterns(prices)
+
+    for i in range(10, len(prices)):
+        window = prices.iloc[i - 10:i]
+        if strategy._is_ascending_triangle(window):
+            expected = 0.8
+        elif strategy._is_double_bottom(window):
+            expected = 0.7
+        elif strategy._is_cup_handle(window):
+            expected = 0.6
+        else:
+            expected = 0.0
+        assert patterns.iloc[i] == expected, i
+    assert (patterns.iloc[:10] == 0).all()
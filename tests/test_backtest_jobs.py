@@ -0,0 +1,105 @@
+import threading
+
+import numpy as np
+import pytest
+
+from ticklet_ai.services import backtest_jobs, batch_backtest
+from ticklet_ai.services.backtest import BacktestParams
+from ticklet_ai.services.backtest_jobs import BacktestJobQueue, QueueFull
+from ticklet_ai.services.batch_backtest import expand_jobs
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.walk_forward import WalkForwardParams
+
+
+def _candles(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = close * (1 + rng.normal(0, 0.008, n))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return Candles(time=np.arange(n) * 3_600_000, open=open_, close=close,
+                   high=np.maximum(open_, close) + spread, low=np.minimum(open_, close) - spread,
+                   volume=np.full(n, 1e4), quote_volume=np.full(n, 1e6))
+
+
+def _wait(job, timeout=10):
+    for _ in range(int(timeout / 0.01)):
+        if job.finished:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job still {job.status}")
+
+
+def test_jobs_complete_and_cancel(monkeypatch):
+    release = threading.Event()
+
+    def load(params):
+        if params.symbol == "SLOWUSDT":
+            release.wait(10)
+        return _candles()
+
+    monkeypatch.setattr(backtest_jobs, "load_backtest_candles", load)
+    saved = []
+    jobs = BacktestJobQueue(max_workers=1, on_result=saved.append)
+    slow = jobs.submit(BacktestParams("Mock", "SLOWUSDT", "1h", max_signals=500))
+    queued = jobs.submit(BacktestParams("Mock", "BTCUSDT", "1h", max_signals=500))
+    done = jobs.submit(BacktestParams("Mock", "ETHUSDT", "1h", max_signals=500))
+
+    assert jobs.cancel(queued.id).status == "cancelled"
+    jobs.cancel(slow.id)  # running: stops at its first progress callback
+    release.set()
+    for job in (slow, queued, done):
+        _wait(job)
+
+    assert slow.status == "cancelled" and queued.status == "cancelled"
+    snap = done.snapshot()
+    assert snap["status"] == "completed" and snap["progress"] == 1.0
+    assert [r["id"] for r in saved] == [snap["result_id"]]
+    assert snap["metrics"]["executed"] == saved[0]["executed"] > 0
+
+
+def test_cancelled_queued_job_frees_its_slot(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(backtest_jobs, "load_backtest_candles", lambda params: release.wait(10) and _candles())
+    jobs = BacktestJobQueue(max_workers=1, max_queued=1)
+    running = jobs.submit(BacktestParams("Mock", "SLOWUSDT", "1h"))
+    queued = jobs.submit(BacktestParams("Mock", "BTCUSDT", "1h"))
+    with pytest.raises(QueueFull):
+        jobs.submit(BacktestParams("Mock", "ETHUSDT", "1h"))
+
+    jobs.cancel(queued.id)
+    again = jobs.submit(BacktestParams("Mock", "ETHUSDT", "1h"))
+    for job in (running, again):
+        jobs.cancel(job.id)
+    release.set()
+    for job in (running, queued, again):
+        _wait(job)
+    assert again.status == "cancelled"
+
+
+def test_walk_forward_runs_as_a_job(monkeypatch):
+    monkeypatch.setattr(backtest_jobs, "load_backtest_candles", lambda params: _candles(1500))
+    saved = []
+    jobs = BacktestJobQueue(max_workers=1, on_result=saved.append)
+    job = jobs.submit(BacktestParams("Mock", "BTCUSDT", "15m"),
+                      walk_forward=WalkForwardParams(train_candles=600, test_candles=300, min_train_trades=20))
+    _wait(job, timeout=60)
+
+    snap = job.snapshot()
+    assert snap["kind"] == "walk_forward" and snap["status"] == "completed"
+    assert [f["fold"] for f in snap["metrics"]["folds"]] == [0, 1, 2]
+    assert saved == []  # reports are not backtest runs
+
+
+def test_batch_runs_as_one_job(monkeypatch):
+    data = {"AAAUSDT": _candles(seed=1), "BBBUSDT": _candles(seed=2)}
+    monkeypatch.setattr(batch_backtest, "load_backtest_candles", lambda p: data.get(p.symbol, Candles.empty()))
+    saved = []
+    jobs = BacktestJobQueue(max_workers=2, on_result=saved.append)
+    job = jobs.submit_batch(expand_jobs(["AAAUSDT", "BBBUSDT", "CCCUSDT"], ["1h"], ["Mock"], max_signals=50))
+    _wait(job, timeout=60)
+
+    snap = job.snapshot()
+    assert snap["kind"] == "batch" and snap["jobs"] == 3 and snap["status"] == "completed"
+    report = snap["metrics"]
+    assert report["completed"] == 2 and report["failed"] == 1
+    assert sorted(r["id"] for r in saved) == sorted(r["id"] for r in report["results"] if "id" in r)
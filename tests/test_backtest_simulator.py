@@ -0,0 +1,36 @@
+import numpy as np
+
+from ticklet_ai.services.backtest import _simulate_trade_outcomes
+from ticklet_ai.services.candles import Candles
+
+
+def _candles(highs, lows, closes):
+    return Candles(time=np.arange(len(closes)) * 60_000, high=highs, low=lows, close=closes)
+
+
+def test_first_touch_and_priority():
+    candles = _candles(highs=[100, 101, 103, 106, 100, 99],
+                       lows=[99, 97, 100, 101, 95, 94],
+                       closes=[100, 100, 102, 104, 96, 95])
+    long_sig = {"side": "long", "entry_low": 100, "stop_loss": 98, "tp1": 102, "tp2": 105, "tp3": 110}
+    short_sig = {"side": "short", "entry_low": 100, "stop_loss": 107, "tp1": 98, "tp2": 96, "tp3": 90}
+    out = _simulate_trade_outcomes([long_sig, dict(long_sig, stop_loss=96), short_sig,
+                                    dict(long_sig, stop_loss=0)], [0, 0, 2, 0], candles, leverage=10)
+
+    # candle 1 touches the stop and nothing else
+    assert out[0]["exit_reason"] == "stop_loss" and out[0]["hold_candles"] == 1 and not out[0]["win"]
+    assert np.isclose(out[0]["pnl_pct"], -20.0)
+    # wider stop: candle 2 reaches tp1, before tp2 is reached on candle 3
+    assert out[1]["exit_reason"] == "tp1" and out[1]["hold_candles"] == 2 and out[1]["exit_price"] == 102
+    assert out[2]["exit_reason"] == "tp2" and out[2]["hold_candles"] == 2
+    assert np.isclose(out[2]["pnl_pct"], 40.0) and np.isclose(out[2]["pnl_abs"], 400.0)
+    assert out[3] is None
+
+
+def test_time_exit_on_short_window():
+    candles = _candles(highs=[100, 101, 101], lows=[99, 99.5, 99.5], closes=[100, 100.5, 100.8])
+    sig = {"side": "long", "entry_low": 100, "stop_loss": 95, "tp1": 110, "tp2": 120, "tp3": 130}
+    (out,) = _simulate_trade_outcomes([sig], [0], candles, leverage=1, horizon=20)
+    assert out["exit_reason"] == "time_exit" and out["hold_candles"] == 2 and out["win"]
+    assert out["exit_price"] == 100.8
+    assert _simulate_trade_outcomes([sig], [2], candles, leverage=1) == [None]
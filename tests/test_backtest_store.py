@@ -0,0 +1,56 @@
+import json
+
+from ticklet_ai.services.backtest_store import BacktestStore
+
+
+def _result(rid, strategy, symbol, ts, n=3):
+    trades = [{"id": f"{rid}-{k}", "side": "long", "pnl_abs": 10.0 * k - 5, "win": k > 0, "hold_candles": k + 1,
+               "timestamp": ts + k, "signal_data": {"tp1": 1.5, "meta": {"regime": k}}} for k in range(n)]
+    return {"id": rid, "strategy": strategy, "symbol": symbol, "interval": "1h", "executed": n, "wins": n - 1,
+            "win_rate": 0.5, "pnl_abs": 25.0, "pnl_pct": 0.25, "timestamp": ts, "ts": ts, "trades": trades}
+
+
+def test_save_list_and_get(tmp_path):
+    store = BacktestStore(tmp_path)
+    runs = [_result("a", "Alpha", "BTCUSDT", 100), _result("b", "Alpha", "ETHUSDT", 200),
+            _result("c", "Golden", "BTCUSDT", 300, n=0)]
+    for r in runs:
+        store.save(r)
+
+    assert [r["id"] for r in store.list()] == ["c", "b", "a"]
+    assert [r["id"] for r in store.list(strategy="Alpha", since=150)] == ["b"]
+    assert [r["id"] for r in store.list(symbol="BTCUSDT", limit=1, offset=1)] == ["a"]
+    assert "trades" not in store.list()[0] and store.list()[1]["trade_count"] == 3
+
+    assert store.get("a") == runs[0]
+    assert store.get("c")["trades"] == []
+    assert "trades" not in store.get("a", include_trades=False)
+    assert store.get("missing") is None
+
+
+def test_imports_legacy_json_once(tmp_path):
+    legacy = _result("old", "Alpha", "BTCUSDT", 50)
+    (tmp_path / "old.json").write_text(json.dumps(legacy))
+    (tmp_path / "broken.json").write_text("{")
+    assert BacktestStore(tmp_path).get("old") == legacy
+    assert len(BacktestStore(tmp_path).list()) == 1
+
+
+def test_backtest_router_opens_store_on_first_use(tmp_path):
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    import pytest
+
+    pytest.importorskip("fastapi")
+    root = Path(__file__).resolve().parents[1]
+    env = {k: v for k, v in os.environ.items() if k != "TICKLET_DATA_DIR"}
+    env["PYTHONPATH"] = str(root)
+    script = ("import os, ticklet_ai.app.routes.backtest as b\n"
+              "assert not os.path.exists('data')\n"
+              "b._save_result({'id': 'r1', 'strategy': 'A', 'symbol': 'X', 'interval': '1h', 'trades': []})\n"
+              "assert b._store() is b._store() and b._store().get('r1')['id'] == 'r1'\n")
+    subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, check=True)
+    assert (tmp_path / "data" / "backtests" / "results.sqlite3").exists()
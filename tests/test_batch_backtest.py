@@ -0,0 +1,77 @@
+import numpy as np
+
+from ticklet_ai.services import batch_backtest
+from ticklet_ai.services.backtest import BacktestParams, run_backtest
+from ticklet_ai.services.batch_backtest import SharedCandles, expand_jobs, run_batch
+from ticklet_ai.services.candles import Candles
+
+
+def _candles(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = close * (1 + rng.normal(0, 0.008, n))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return Candles(time=np.arange(n) * 3_600_000, open=open_, close=close,
+                   high=np.maximum(open_, close) + spread, low=np.minimum(open_, close) - spread,
+                   volume=np.full(n, 1e4), quote_volume=np.full(n, 1e6))
+
+
+def test_shared_candles_round_trip():
+    candles = _candles(50)
+    handle, shm = SharedCandles.publish(candles)
+    try:
+        loaded = handle.load()
+    finally:
+        shm.close()
+        shm.unlink()
+    assert (loaded.to_records() == candles.to_records()).all()
+
+
+def test_shared_candles_load_unregisters_without_track_flag(monkeypatch):
+    attach = batch_backtest.shared_memory.SharedMemory
+
+    def shared_memory_312(name=None, create=False, size=0, **kw):  # Python < 3.13 signature
+        if kw:
+            raise TypeError(f"unexpected keyword arguments {sorted(kw)}")
+        return attach(name=name, create=create, size=size)
+
+    unregistered = []
+    monkeypatch.setattr(batch_backtest.shared_memory, "SharedMemory", shared_memory_312)
+    monkeypatch.setattr(batch_backtest.resource_tracker, "unregister", lambda *a: unregistered.append(a))
+    candles = _candles(20)
+    handle, shm = SharedCandles.publish(candles)
+    try:
+        loaded = handle.load()
+    finally:
+        monkeypatch.undo()  # the parent's unlink unregisters the block for real
+        shm.close()
+        shm.unlink()
+    assert (loaded.to_records() == candles.to_records()).all()
+    assert unregistered[0] == ("/" + handle.name, "shared_memory")
+
+
+def test_run_batch_matches_single_runs(monkeypatch):
+    data = {"AAAUSDT": _candles(seed=1), "BBBUSDT": _candles(seed=2)}
+    monkeypatch.setattr(batch_backtest, "load_backtest_candles", lambda p: data.get(p.symbol, Candles.empty()))
+    jobs = expand_jobs(["AAAUSDT", "BBBUSDT", "CCCUSDT"], ["1h"], ["Mock"], max_signals=50)
+    seen = []
+    report = run_batch(jobs, max_workers=2, on_result=lambda job, result: seen.append(job.symbol))
+
+    assert sorted(seen) == ["AAAUSDT", "BBBUSDT", "CCCUSDT"]
+    assert report["jobs"] == 3 and report["completed"] == 2 and report["failed"] == 1
+    for row, symbol in zip(report["results"][:2], ["AAAUSDT", "BBBUSDT"]):
+        single = run_backtest(BacktestParams("Mock", symbol, "1h", max_signals=50), data[symbol])
+        assert row["symbol"] == symbol and "trades" not in row
+        assert (row["executed"], row["wins"], row["pnl_abs"]) == (single["executed"], single["wins"], single["pnl_abs"])
+    assert report["executed"] == sum(r["executed"] for r in report["results"][:2])
+    assert report["results"][2]["error"] == "No historical data available"
+
+
+def test_run_batch_caps_workers(monkeypatch):
+    sizes = []
+    pool = batch_backtest.process_pool
+    monkeypatch.setattr(batch_backtest, "DEFAULT_WORKERS", 2)
+    monkeypatch.setattr(batch_backtest, "process_pool", lambda n: sizes.append(n) or pool(n))
+    monkeypatch.setattr(batch_backtest, "load_backtest_candles", lambda p: Candles.empty())
+    run_batch(expand_jobs(["AAAUSDT", "BBBUSDT", "CCCUSDT"], ["1h"], ["Mock"]), max_workers=500)
+    assert sizes == [2]
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from ticklet_ai.services.binance_scheduler import (
+    PRIORITY_HIGH, PRIORITY_LOW, WeightScheduler, endpoint_weight,
+)
+
+
+def test_endpoint_weights():
+    assert endpoint_weight("/klines", {"symbol": "BTCUSDT"}) == 2
+    assert endpoint_weight("/ticker/24hr") == 80
+    assert endpoint_weight("/ticker/24hr", {"symbol": "BTCUSDT"}) == 2
+    assert endpoint_weight("https://api.binance.com/api/v3/exchangeInfo") == 20
+
+
+def test_used_weight_header_drains_bucket_and_priority_wins():
+    sched = WeightScheduler(weight_limit=100, window_sec=1.0, safety=1.0)
+    sched.observe({"X-MBX-USED-WEIGHT-1M": "100"})
+    order = []
+
+    def worker(priority, name):
+        sched.acquire(10, priority)
+        order.append(name)
+
+    low = threading.Thread(target=worker, args=(PRIORITY_LOW, "low"))
+    low.start()
+    time.sleep(0.02)
+    high = threading.Thread(target=worker, args=(PRIORITY_HIGH, "high"))
+    high.start()
+    low.join(2)
+    high.join(2)
+
+    assert order == ["high", "low"]
+
+
+def test_ban_response_pauses_requests():
+    sched = WeightScheduler(weight_limit=1000)
+    sched.observe({"Retry-After": "0.2"}, status=429)
+    started = time.monotonic()
+    sched.acquire(1)
+    assert time.monotonic() - started >= 0.15
+
+
+def test_sync_waiter_on_loop_thread_does_not_wait_for_async_waiter():
+    import asyncio
+
+    sched = WeightScheduler(weight_limit=100, window_sec=1.0, safety=1.0)
+    sched.observe({"X-MBX-USED-WEIGHT-1M": "90"})  # 10 tokens left, refilling at 100/s
+    order = []
+
+    async def async_waiter():
+        await sched.acquire_async(20, PRIORITY_HIGH)
+        order.append("async")
+
+    async def main():
+        task = asyncio.create_task(async_waiter())
+        await asyncio.sleep(0)  # the coroutine is now queued and waiting on the loop
+        started = time.monotonic()
+        sched.acquire(5, PRIORITY_LOW)  # blocking call on the loop thread, like a sync analyzer
+        order.append("sync")
+        assert time.monotonic() - started < 1.0
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(main())
+    assert order == ["sync", "async"]
@@ -0,0 +1,171 @@
+import time
+
+from ticklet_ai.services.candle_store import CandleStore, load_klines
+
+STEP = 60_000
+
+
+def _fake_exchange(calls):
+    now = int(time.time() * 1000)
+    newest = (now // STEP) * STEP  # currently open candle
+
+    def fetch(symbol, interval, limit, start_time=None, end_time=None):
+        calls.append((limit, start_time, end_time))
+        if start_time is not None:
+            first = -(-start_time // STEP) * STEP
+            last = min(first + (limit - 1) * STEP, newest)
+        else:
+            last = newest if end_time is None else min((end_time // STEP) * STEP, newest)
+            first = last - (limit - 1) * STEP
+        if end_time is not None:
+            last = min(last, (end_time // STEP) * STEP)
+        return [[t, "1", "2", "0.5", "1.5", "10", t + STEP - 1, "15", 3]
+                for t in range(first, last + 1, STEP)]
+
+    return fetch, newest
+
+
+def test_latest_candles_only_fetch_missing_tail(tmp_path):
+    calls = []
+    fetch, newest = _fake_exchange(calls)
+    store = CandleStore(tmp_path)
+
+    first = load_klines(fetch, "BTCUSDT", "1m", 100, store=store)
+    assert len(first) == 100
+    assert int(first["time"][-1]) == newest
+    assert len(store.read("BTCUSDT", "1m")) == 99  # open candle is never persisted
+
+    second = load_klines(fetch, "BTCUSDT", "1m", 100, store=store)
+    assert len(second) == 100
+    assert calls[-1][1] == newest  # only the tail after the stored history was requested
+    assert list(second["time"]) == list(first["time"])
+
+
+def test_closed_range_is_served_from_store(tmp_path):
+    calls = []
+    fetch, newest = _fake_exchange(calls)
+    store = CandleStore(tmp_path)
+    start = newest - 500 * STEP
+
+    fetched = load_klines(fetch, "ETHUSDT", "1m", 200, start_time=start, store=store)
+    cached = load_klines(fetch, "ETHUSDT", "1m", 200, start_time=start, store=store)
+
+    assert len(calls) == 1
+    assert list(cached["time"]) == list(fetched["time"])
+
+
+def test_gap_fill_keeps_store_sorted_and_unique(tmp_path):
+    calls = []
+    fetch, newest = _fake_exchange(calls)
+    store = CandleStore(tmp_path)
+
+    load_klines(fetch, "XRPUSDT", "1m", 10, start_time=newest - 100 * STEP, store=store)
+    load_klines(fetch, "XRPUSDT", "1m", 10, start_time=newest - 300 * STEP, store=store)
+    load_klines(fetch, "XRPUSDT", "1m", 20, start_time=newest - 105 * STEP, store=store)
+
+    times = store.read("XRPUSDT", "1m")["time"]
+    assert len(times) == 30
+    assert all(b > a for a, b in zip(times[:-1], times[1:]))
+
+
+def test_history_loader_stitches_pages(tmp_path, monkeypatch):
+    from ticklet_ai.services import candle_store
+    from ticklet_ai.services.history_loader import load_history
+
+    monkeypatch.setattr(candle_store, "_default_store", CandleStore(tmp_path))
+    calls = []
+    fetch, newest = _fake_exchange(calls)
+    start = newest - 2500 * STEP
+
+    rows = load_history(fetch, "SOLUSDT", "1m", start, newest - STEP, max_workers=3)
+
+    assert len(calls) == 3
+    assert len(rows) == 2500
+    assert int(rows["time"][0]) == start
+    assert all(d == STEP for d in (rows["time"][1:] - rows["time"][:-1]))
+
+
+def _records(times):
+    from ticklet_ai.services.candle_store import raw_to_records
+    return raw_to_records([[t, "1", "2", "0.5", "1.5", "10", t + STEP - 1, "15", 3] for t in times])
+
+
+def test_overlapping_append_does_not_rewrite_file(tmp_path):
+    store = CandleStore(tmp_path)
+    assert store.write("BTCUSDT", "1m", _records(range(0, 100 * STEP, STEP))) == 100
+    path = store._path("BTCUSDT", "1m")
+    inode = path.stat().st_ino
+
+    assert store.write("BTCUSDT", "1m", _records(range(95 * STEP, 103 * STEP, STEP))) == 3
+    assert store.write("BTCUSDT", "1m", _records(range(10 * STEP, 20 * STEP, STEP))) == 0
+    assert path.stat().st_ino == inode  # appended in place, never rewritten
+
+    # A candle missing before the tail still forces a merge
+    store.write("BTCUSDT", "1m", _records([200 * STEP]))
+    assert store.write("BTCUSDT", "1m", _records([150 * STEP, 201 * STEP])) == 2
+    assert list(store.read("BTCUSDT", "1m")["time"][-3:]) == [150 * STEP, 200 * STEP, 201 * STEP]
+
+
+def test_history_loader_retries_then_reports_missing_pages(tmp_path, monkeypatch):
+    import pytest
+    from ticklet_ai.services import candle_store, history_loader
+
+    monkeypatch.setattr(candle_store, "_default_store", CandleStore(tmp_path))
+    monkeypatch.setattr(history_loader, "RETRY_BACKOFF", 0)
+    calls = []
+    fetch, newest = _fake_exchange(calls)
+    start = newest - 2500 * STEP
+    failures = {"flaky": 2}
+
+    def flaky(symbol, interval, limit, start_time=None, end_time=None):
+        if start_time == start and failures["flaky"]:
+            failures["flaky"] -= 1
+            raise ConnectionError("reset")
+        return fetch(symbol, interval, limit, start_time, end_time)
+
+    rows = history_loader.load_history(flaky, "ADAUSDT", "1m", start, newest - STEP, max_workers=3)
+    assert len(rows) == 2500
+    assert len(candle_store.get_store().read("ADAUSDT", "1m")) == 2500
+
+    def broken(symbol, interval, limit, start_time=None, end_time=None):
+        if start_time == start + 1000 * STEP:
+            raise ConnectionError("reset")
+        return fetch(symbol, interval, limit, start_time, end_time)
+
+    with pytest.raises(history_loader.HistoryGapError) as err:
+        history_loader.load_history(broken, "DOTUSDT", "1m", start, newest - STEP, max_workers=3)
+    assert err.value.missing == [(start + 1000 * STEP, start + 2000 * STEP - 1)]
+
+
+def _write_stripe(root, worker, workers, batches):
+    from ticklet_ai.services.kline_decoder import rows_to_records
+
+    store = CandleStore(root)
+    for b in range(batches):
+        # Each batch interleaves with the other workers' candles, so most writes merge behind the tail
+        times = [((b * 4 + k) * workers + worker) * STEP for k in range(4)]
+        store.write("BTCUSDT", "1m", rows_to_records([[t, "1", "2", "0.5", "1.5", "10", t + STEP - 1, "15", 3]
+                                                      for t in times]))
+
+
+def test_concurrent_writer_processes_keep_file_sorted(tmp_path):
+    import multiprocessing
+
+    import numpy as np
+    import pytest
+
+    from ticklet_ai.services import candle_store
+
+    if candle_store.fcntl is None:
+        pytest.skip("no cross-process file lock on this platform")
+    workers, batches = 4, 25
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_write_stripe, args=(tmp_path, w, workers, batches)) for w in range(workers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert all(p.exitcode == 0 for p in procs)
+
+    times = CandleStore(tmp_path).read("BTCUSDT", "1m")["time"]
+    assert np.array_equal(times, np.arange(workers * batches * 4) * STEP)
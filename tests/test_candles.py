@@ -0,0 +1,29 @@
+import numpy as np
+
+from ticklet_ai.services.candles import Candles
+
+RAW = [
+    [1000, "1.0", "2.0", "0.5", "1.5", "10", 1999, "15", 3],
+    [2000, "1.5", "2.5", "1.0", "2.0", "20", 2999, "40", 4],
+    [3000, "2.0", "3.0", "1.5", "2.5", "30", 3999, "75", 5],
+]
+
+
+def test_columns_are_contiguous_typed_views():
+    c = Candles.from_raw(RAW)
+    assert c.close.dtype == np.float64 and c.close.flags["C_CONTIGUOUS"]
+    assert c.time.dtype == np.int64
+    tail = c[1:]
+    assert np.shares_memory(tail.close, c.close)
+    assert list(tail.close) == [2.0, 2.5]
+
+
+def test_dict_adapter_matches_legacy_kline_format():
+    c = Candles.from_raw(RAW)
+    assert c[-1] == {
+        "time": 3000, "open": 2.0, "high": 3.0, "low": 1.5, "close": 2.5,
+        "volume": 30.0, "close_time": 3999, "quote_volume": 75.0, "trades_count": 5,
+    }
+    assert [k["close"] for k in c] == [1.5, 2.0, 2.5]
+    assert Candles.from_dicts(list(c)).to_dicts() == c.to_dicts()
+    assert not Candles.empty()
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from ticklet_ai.strategies.condition_strategy import ConditionStrategy
+
+
+def test_regime_matches_previous_window_means():
+    rng = np.random.default_rng(3)
+    strategy = ConditionStrategy({**ConditionStrategy()._default_config(), 'trend_period': 20})
+    df = pd.DataFrame({'trend_strength': rng.uniform(0, 0.04, 300), 'volatility': rng.uniform(0, 0.02, 300)})
+    df.loc[5:30, 'volatility'] = np.nan
+
+    regime = strategy._detect_market_regime(df)
+
+    cfg = strategy.config
+    for i in range(len(df)):
+        if i < 20:
+            assert regime.iloc[i] == "neutral"
+            continue
+        window = df.iloc[i - 20:i]
+        trending = window['trend_strength'].mean() > cfg['regime_threshold']
+        calm = window['volatility'].mean() < cfg['consolidation_threshold']
+        expected = ("trending" if calm else "volatile_trend") if trending else ("consolidating" if calm else "volatile")
+        assert regime.iloc[i] == expected, i
@@ -1,3 +1,45 @@
 def test_imports():
     from ticklet_ai.strategies.golden_hook_x import GoldenHookXController
-    assert callable(GoldenHookXController)
\ No newline at end of file
+    assert callable(GoldenHookXController)
+
+def _hook_confluence_reference(df):
+    """Per-row nearest-fib-level proximity, as computed before vectorizing (using each row's own close)."""
+    import numpy as np
+
+    swing_high = df['high'].rolling(48, min_periods=2).max()
+    swing_low = df['low'].rolling(48, min_periods=2).min()
+    out = []
+    for hi, lo, close in zip(swing_high, swing_low, df['close']):
+        rng = hi - lo
+        if not np.isfinite(rng) or rng == 0:
+            out.append(0.0)
+            continue
+        levels = [hi - 0.382 * rng, hi - 0.5 * rng, hi - 0.618 * rng]
+        nearest = min(levels, key=lambda level: abs(level - close))
+        out.append(min(max(100 - 100 * abs(close - nearest) / (0.5 * rng), 0.0), 100.0))
+    return np.array(out)
+
+
+def test_golden_hook_x_hook_confluence_matches_row_loop():
+    import importlib.util
+    from pathlib import Path
+
+    import numpy as np
+    import pandas as pd
+
+    path = Path(__file__).resolve().parents[1] / "freqtrade" / "user_data" / "strategies" / "golden_hook_x_features.py"
+    spec = importlib.util.spec_from_file_location("golden_hook_x_features", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, 300))
+    df = pd.DataFrame({'high': close + rng.uniform(0, 2, 300), 'low': close - rng.uniform(0, 2, 300), 'close': close})
+    df.loc[:60, ['high', 'low']] = df.loc[0, 'close']  # flat start: zero swing range gives hc 0
+
+    swing_high = df['high'].rolling(48, min_periods=2).max()
+    swing_low = df['low'].rolling(48, min_periods=2).min()
+    hc = module.fib_proximity(swing_high, swing_low, df['close'])
+
+    assert (hc.iloc[:61] == 0).all()
+    assert np.allclose(hc.to_numpy(), _hook_confluence_reference(df))
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from ticklet_ai.services.indicator_cache import CachedIndicators, IndicatorCache, window_key
+
+
+def _window(last_close=1.0, n=50):
+    t = np.arange(n, dtype=np.int64) * 60_000
+    c = np.full(n, 1.0)
+    c[-1] = last_close
+    return window_key(t, c + 1, c - 1, c)
+
+
+def test_hit_miss_and_live_candle_invalidation():
+    cache, calls = IndicatorCache(max_bytes=1 << 20), []
+
+    def compute():
+        calls.append(1)
+        return np.zeros(50)
+
+    a = cache.get_or_compute("btcusdt", "5m", "rsi", (14,), _window(), compute)
+    b = cache.get_or_compute("BTCUSDT", "5m", "rsi", (14,), _window(), compute)
+    assert a is b and len(calls) == 1
+    assert not a.flags.writeable
+    # same open time, but the in-progress candle ticked
+    cache.get_or_compute("BTCUSDT", "5m", "rsi", (14,), _window(last_close=1.5), compute)
+    assert len(calls) == 2
+
+
+def test_lru_eviction_by_bytes():
+    cache = IndicatorCache(max_bytes=3 * 800)
+    for period in (7, 14, 21):
+        cache.get_or_compute("X", "1h", "ema", (period,), _window(), lambda: np.zeros(100))
+    cache.get_or_compute("X", "1h", "ema", (7,), _window(), lambda: np.ones(100))  # touch: 14 is now oldest
+    cache.get_or_compute("X", "1h", "ema", (50,), _window(), lambda: np.zeros(100))
+    assert cache.stats()["entries"] == 3 and cache.stats()["bytes"] <= cache.max_bytes
+    hit = cache.get_or_compute("X", "1h", "ema", (7,), _window(), lambda: np.ones(100))
+    assert hit[0] == 0.0  # still cached
+    recomputed = cache.get_or_compute("X", "1h", "ema", (14,), _window(), lambda: np.ones(100))
+    assert recomputed[0] == 1.0  # evicted
+
+
+def test_bbands_match_rolling_population_std():
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(size=120))
+    t = np.arange(120, dtype=np.int64) * 60_000
+    ind = CachedIndicators("BTCUSDT", "1m", t, close + 1, close - 1, close, cache=IndicatorCache())
+    upper, middle, lower = ind.bbands(20, 2)
+    roll = pd.Series(close).rolling(20)
+    np.testing.assert_allclose(middle[19:], roll.mean().to_numpy()[19:])
+    np.testing.assert_allclose(upper[19:] - middle[19:], 2 * roll.std(ddof=0).to_numpy()[19:])
+    assert np.isnan(lower[:19]).all() and ind.bbands(20, 2)[0] is upper
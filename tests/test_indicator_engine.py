@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.indicator_engine import IndicatorEngine
+
+HOUR = 3_600_000
+
+
+def _candles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    time = np.arange(n, dtype=np.int64) * HOUR
+    return Candles(time=time, open=close, high=close + 1, low=close - 1, close=close,
+                   volume=rng.uniform(1, 10, n), close_time=time + HOUR - 1)
+
+
+def _wilder_rsi(close, period=14):
+    delta = np.diff(close)
+    gain, loss = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+    ag, al = gain[:period].mean(), loss[:period].mean()
+    for g, l in zip(gain[period:], loss[period:]):
+        ag, al = (ag * (period - 1) + g) / period, (al * (period - 1) + l) / period
+    return 100 - 100 / (1 + ag / al)
+
+
+def test_values_match_batch_reference():
+    c = _candles(200)
+    v = IndicatorEngine().sync("X", "1h", c, now_ms=10**15)
+    s = pd.Series(c.close)
+    assert np.isclose(v["sma_20"], s.tail(20).mean())
+    assert np.isclose(v["std_20"], s.tail(20).std(ddof=0))
+    assert np.isclose(v["rsi"], _wilder_rsi(c.close))
+    # the RSI window is the latest candles, not the first 15
+    assert not np.isclose(v["rsi"], _wilder_rsi(c.close[:15]))
+    macd = s.ewm(span=12, adjust=False).mean() - s.ewm(span=26, adjust=False).mean()
+    assert abs(v["macd"] - macd.iloc[-1]) < 1e-6 * abs(c.close[-1])
+
+
+def test_incremental_sync_equals_warm_start():
+    c = _candles(300, seed=1)
+    engine = IndicatorEngine()
+    engine.sync("X", "1h", c[:150], now_ms=int(c.close_time[148]) + 1)  # last candle still open
+    for end in range(151, 301, 7):
+        live = engine.sync("X", "1h", c[max(0, end - 100):end], now_ms=int(c.close_time[end - 2]) + 1)
+    fresh = IndicatorEngine().sync("X", "1h", c[:end], now_ms=int(c.close_time[end - 2]) + 1)
+    for key, value in fresh.items():
+        assert np.isclose(live[key], value), key
+
+
+def test_concurrent_stream_updates_and_syncs_fold_each_candle_once():
+    import sys
+    import threading
+
+    c = _candles(400, seed=3)
+    engine = IndicatorEngine()
+    engine.warm_start("X", "1h", c[:100])
+    records = c.to_records()
+    errors = []
+
+    def stream():
+        for row in records[100:]:
+            engine.update("X", "1h", row)
+
+    def request():
+        try:
+            for end in range(120, 401, 5):
+                engine.sync("X", "1h", c[:end], now_ms=int(c.close_time[end - 1]) + 1)
+        except Exception as e:  # pragma: no cover - surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=stream)] + [threading.Thread(target=request) for _ in range(3)]
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # interleave the threads as finely as possible
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(switch)
+
+    assert not errors
+    state = engine.state("X", "1h")
+    fresh = IndicatorEngine().warm_start("X", "1h", c)
+    assert state.last_time == fresh.last_time
+    for key, value in fresh.values().items():
+        assert np.isclose(state.values()[key], value), key
@@ -0,0 +1,41 @@
+import numpy as np
+
+from ticklet_ai.services import indicator_kernels as kernels
+from ticklet_ai.services import indicator_panel as panel
+
+
+def _ohlc(n=400, drift=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(drift, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.005, n)) * close
+    return close + spread, close - spread, close
+
+
+def test_atr_and_rsi_match_panel_seeding():
+    high, low, close = _ohlc()
+    assert np.allclose(kernels.atr(high, low, close), panel.atr(high[None], low[None], close[None])[0], equal_nan=True)
+    assert np.allclose(kernels.rsi(close), panel.rsi(close[None])[0], equal_nan=True)
+
+
+def test_directional_index_and_adx():
+    high, low, close = _ohlc(drift=0.01, seed=1)
+    plus_di, minus_di = kernels.directional_index(high, low, close, 14)
+    adx = kernels.adx(high, low, close, 14)
+    assert np.isnan(plus_di[:14]).all() and not np.isnan(plus_di[14:]).any()
+    assert np.isnan(adx[:27]).all() and not np.isnan(adx[27:]).any()
+    assert plus_di[-1] > minus_di[-1] and adx[-1] > 40
+    assert ((adx[27:] >= 0) & (adx[27:] <= 100)).all()
+    assert np.isnan(kernels.adx(high[:20], low[:20], close[:20])).all()
+
+
+def test_ewm_fallback_matches_wilder_loops():
+    high, low, close = _ohlc(n=300, seed=2)
+    tr = kernels.true_range(high, low, close)
+    assert np.allclose(kernels._wilder_mean_ewm(tr, 14), kernels._wilder_mean_loop(tr, 14), equal_nan=True)
+    assert np.allclose(kernels._wilder_sum_ewm(tr, 14), kernels._wilder_sum_loop(tr, 14), equal_nan=True)
+
+    dx = np.abs(np.random.default_rng(3).normal(20, 10, 300))
+    valid = np.ones(300, dtype=bool)
+    valid[[30, 31, 100]] = False  # +DI + -DI == 0: ADX carries over
+    assert np.allclose(kernels._adx_smooth_ewm(dx, valid, 14), kernels._adx_smooth_loop(dx, valid, 14),
+                       equal_nan=True)
@@ -0,0 +1,36 @@
+import numpy as np
+
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.indicator_engine import IndicatorState
+from ticklet_ai.services.indicator_panel import IndicatorPanel
+
+
+def _candles(rng, n):
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return Candles(time=np.arange(n) * 60_000, open=close, high=close + rng.uniform(0, 1, n),
+                   low=close - rng.uniform(0, 1, n), close=close, volume=np.ones(n))
+
+
+def test_panel_matches_per_symbol_indicators():
+    rng = np.random.default_rng(0)
+    universe = {f"S{i}USDT": _candles(rng, 60) for i in range(20)}
+    universe["SHORTUSDT"] = _candles(rng, 30)
+    panel = IndicatorPanel.from_candles(universe, 50)
+
+    assert "SHORTUSDT" not in panel.index and panel.close.shape == (20, 50)
+    upper, middle, _ = panel.bbands(20, 2.0)
+    for symbol in ("S0USDT", "S19USDT"):
+        i, candles = panel.row(symbol), universe[symbol].tail(50)
+        state = IndicatorState()
+        state.extend(candles)
+        expected = state.values()
+        assert np.isclose(panel.rsi(14)[i, -1], expected["rsi"])
+        assert np.isclose(panel.atr(14)[i, -1], expected["atr"])
+        assert np.isclose(panel.ema(20)[i, -1], expected["ema_20"])
+        assert np.isclose(middle[i, -1], expected["sma_20"]) and np.isclose(upper[i, -1], expected["bb_upper"])
+        assert np.isnan(panel.ema(21)[i, 19]) and not np.isnan(panel.ema(21)[i, 20])
+
+    # MACD signal starts once slow EMA (26) + signal (9) bars are available, as in TA-Lib
+    line, signal, hist = panel.macd()
+    assert np.isnan(line[:, 32]).all() and not np.isnan(hist[:, 33:]).any()
+    assert np.allclose(hist, line - signal, equal_nan=True)
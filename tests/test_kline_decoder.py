@@ -0,0 +1,22 @@
+import json
+
+from ticklet_ai.services.kline_decoder import KLINE_DTYPE, decode_klines
+
+BODY = json.dumps([
+    [1499040000000, "0.01634790", "0.80000000", "0.01575800", "0.01577100",
+     "148976.11427815", 1499644799999, "2434.19055334", 308, "1756.87402397", "28.46694368", "0"],
+    [1499040060000, "0.01577100", "0.01600000", "0.01570000", "0.01590000",
+     "10.5", 1499040119999, "0.167", 2, "5.0", "0.08", "0"],
+]).encode()
+
+
+def test_decode_matches_per_field_conversion():
+    rows = decode_klines(BODY)
+    assert rows.dtype == KLINE_DTYPE
+    for row, k in zip(rows.tolist(), json.loads(BODY)):
+        assert row == (int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]),
+                       float(k[5]), int(k[6]), float(k[7]), int(k[8]))
+
+
+def test_decode_empty_payload():
+    assert len(decode_klines(b"[]")) == 0
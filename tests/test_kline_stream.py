@@ -0,0 +1,121 @@
+import asyncio
+import json
+
+import websockets
+
+from ticklet_ai.services.kline_stream import KlineStreamService
+
+STEP = 60_000
+
+
+def _frame(t, close, closed):
+    return json.dumps({
+        "stream": "btcusdt@kline_1m",
+        "data": {"e": "kline", "s": "BTCUSDT", "k": {
+            "t": t, "T": t + STEP - 1, "s": "BTCUSDT", "i": "1m",
+            "o": "100", "h": "110", "l": "90", "c": str(close),
+            "v": "5", "q": "500", "n": 7, "x": closed,
+        }},
+    })
+
+
+RECORDED = [
+    _frame(0, 101, False),
+    _frame(0, 102, True),
+    _frame(STEP, 103, False),
+    _frame(STEP, 104, True),
+    _frame(2 * STEP, 105, False),
+]
+
+
+def test_stream_replay_fills_ring_buffer():
+    svc = KlineStreamService(capacity=2)
+    closes = []
+    svc.on_candle_close(lambda s, i, row: closes.append((s, i, float(row["close"]))))
+
+    async def replay(ws, *args):
+        for frame in RECORDED:
+            await ws.send(frame)
+        await asyncio.sleep(1)
+
+    async def main():
+        async with websockets.serve(replay, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            svc.ws_base = f"ws://127.0.0.1:{port}"
+            task = asyncio.create_task(svc.run([("BTCUSDT", "1m")]))
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if len(closes) == 2 and svc.get_records("BTCUSDT", "1m", 2) is not None \
+                        and svc.get_records("BTCUSDT", "1m", 2)["close"][-1] == 105:
+                    break
+            rows = svc.get_records("BTCUSDT", "1m", 2)
+            task.cancel()
+            return rows
+
+    rows = asyncio.run(main())
+
+    assert closes == [("BTCUSDT", "1m", 102.0), ("BTCUSDT", "1m", 104.0)]
+    assert list(rows["time"]) == [STEP, 2 * STEP]  # capacity 2 keeps the newest candles
+    assert list(rows["close"]) == [104.0, 105.0]
+    assert svc.get_raw_klines("BTCUSDT", "1m", 3) is None
+
+
+def _rows(times):
+    from ticklet_ai.services.candle_store import raw_to_records
+    return raw_to_records([[t, "100", "110", "90", "105", "5", t + STEP - 1, "500", 7] for t in times])
+
+
+def test_reconnect_gap_is_backfilled_and_closes_published_in_order():
+    svc = KlineStreamService(capacity=50)
+    svc.warm_start([("BTCUSDT", "1m")], lambda s, i, n: _rows(range(0, 10 * STEP, STEP)))
+    svc.connected = True
+    closes = []
+    svc.on_candle_close(lambda s, i, row: closes.append(int(row["time"]) // STEP))
+
+    svc.mark_stale([("BTCUSDT", "1m")])
+    assert svc.get_records("BTCUSDT", "1m", 5) is None  # readers fall back to REST until checked
+
+    svc._fetch = lambda s, i, n: _rows(range(0, 16 * STEP, STEP))
+    svc.handle_message(_frame(15 * STEP, 104, False))
+
+    rows = svc.get_records("BTCUSDT", "1m", 16)
+    assert list(rows["time"]) == [k * STEP for k in range(16)]
+    assert closes == [10, 11, 12, 13, 14]
+
+    # Contiguous after a reconnect: ready on the first frame, nothing refetched
+    svc.mark_stale([("BTCUSDT", "1m")])
+    svc._fetch = None
+    svc.handle_message(_frame(15 * STEP, 106, True))
+    assert svc.get_records("BTCUSDT", "1m", 16)["close"][-1] == 106
+    assert closes[-1] == 15
+
+
+def test_gap_without_backfill_restarts_buffer():
+    svc = KlineStreamService(capacity=50)
+    svc.warm_start([("BTCUSDT", "1m")], lambda s, i, n: _rows(range(0, 10 * STEP, STEP)))
+    svc.connected = True
+    svc._fetch = None
+    svc.mark_stale([("BTCUSDT", "1m")])
+    svc.handle_message(_frame(20 * STEP, 104, False))
+
+    assert svc.get_records("BTCUSDT", "1m", 2) is None  # only one candle since the gap
+    assert list(svc.get_records("BTCUSDT", "1m", 1)["time"]) == [20 * STEP]
+
+
+def test_candle_open_at_disconnect_is_refetched_and_closed():
+    svc = KlineStreamService(capacity=50)
+    svc.connected = True
+    closes = []
+    svc.on_candle_close(lambda s, i, row: closes.append((int(row["time"]) // STEP, float(row["close"]))))
+    svc.handle_message(_frame(0, 101, True))
+    svc.handle_message(_frame(STEP, 102, False))  # socket drops before candle 1 closes
+
+    svc.mark_stale([("BTCUSDT", "1m")])
+    fetched = _rows(range(0, 2 * STEP, STEP))
+    fetched["close"][1] = 109
+    svc._fetch = lambda s, i, n: fetched
+    svc.handle_message(_frame(2 * STEP, 103, False))
+
+    assert closes == [(0, 101), (1, 109)]
+    rows = svc.get_records("BTCUSDT", "1m", 3)
+    assert list(rows["time"]) == [0, STEP, 2 * STEP] and rows["close"][1] == 109
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from ticklet_ai.strategies.market_regime_core import RegimeLabeller, RegimeState, label_regime
+
+
+def _frame(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n) + 0.002 * np.sin(np.arange(n) / 60)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return pd.DataFrame({"time": np.arange(n, dtype=np.int64) * 60_000,
+                         "high": close + spread, "low": close - spread, "close": close})
+
+
+def test_streaming_labels_match_batch():
+    df = _frame()
+    batch = label_regime(df, vol_thr=0.005)
+    assert batch is df  # labels are added to the caller's frame, not a copy
+    st = RegimeState(vol_thr=0.005)
+    labels = [st.update(h, l, c) for h, l, c in zip(df["high"], df["low"], df["close"])]
+    assert labels == batch["regime"].tolist()
+    assert set(labels) >= {"bull", "bear", "chop"}
+    assert np.isclose(st.adx, batch["adx"].iloc[-1])
+
+
+def test_sync_extends_and_rebuilds():
+    df = _frame(300, seed=1)
+    t, h, l, c = (df[k].to_numpy() for k in ("time", "high", "low", "close"))
+    labeller = RegimeLabeller(vol_thr=0.005)
+    assert labeller.current("btcusdt", "1m") is None
+    labeller.sync("BTCUSDT", "1m", t[:200], h[:200], l[:200], c[:200])
+    state = labeller.states[("BTCUSDT", "1m")]
+    label = labeller.sync("BTCUSDT", "1m", t[150:], h[150:], l[150:], c[150:])
+    assert labeller.states[("BTCUSDT", "1m")] is state
+    assert label == label_regime(df, vol_thr=0.005)["regime"].iloc[-1]
+    # a window that does not contain the last candle seen rebuilds the state
+    labeller.sync("BTCUSDT", "1m", t[150:] + 30_000, h[150:], l[150:], c[150:])
+    assert labeller.states[("BTCUSDT", "1m")] is not state
@@ -0,0 +1,23 @@
+import numpy as np
+
+from ticklet_ai.services.ml_infer import FEATURE_COLS, predict_win_probs
+
+
+class _RsiModel:
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, x):
+        self.calls += 1
+        assert list(x.columns) == FEATURE_COLS
+        p = x["rsi"].to_numpy() / 100
+        return np.column_stack([1 - p, p])
+
+
+def test_batch_scores_rows_in_one_call():
+    model = _RsiModel()
+    rows = [{"rsi": 30}, None, {"rsi": "n/a"}, {"rsi": 80, "macd": 1.5}]
+    probs = predict_win_probs(rows, model)
+    assert model.calls == 1
+    assert np.allclose(probs, [0.3, 0.5, 0.5, 0.8])
+    assert len(predict_win_probs([], model)) == 0 and model.calls == 1
@@ -0,0 +1,64 @@
+import numpy as np
+
+from ticklet_ai.services.candle_store import KLINE_DTYPE
+from ticklet_ai.services.resampler import TimeframeResampler, resample
+
+MIN = 60_000
+
+
+def _base(n, start=0):
+    rows = np.zeros(n, dtype=KLINE_DTYPE)
+    rows["time"] = start + np.arange(n) * 5 * MIN
+    rows["close_time"] = rows["time"] + 5 * MIN - 1
+    rows["open"] = np.arange(n) + 100.0
+    rows["close"] = rows["open"] + 0.5
+    rows["high"] = rows["open"] + 2
+    rows["low"] = rows["open"] - 1
+    rows["volume"] = 1.0
+    rows["quote_volume"] = 10.0
+    rows["trades_count"] = 3
+    return rows
+
+
+def test_resample_ohlcv_and_partial_head():
+    # starts at 00:10, so the first 15m bucket is partial and dropped
+    out = resample(_base(8, start=10 * MIN), "5m", "15m")
+    assert out["time"].tolist() == [15 * MIN, 30 * MIN, 45 * MIN]  # trailing bucket is the in-progress candle
+    first = out[0]
+    assert (first["open"], first["high"], first["low"], first["close"]) == (101.0, 105.0, 100.0, 103.5)
+    assert (first["volume"], first["quote_volume"], first["trades_count"]) == (3.0, 30.0, 9)
+    assert first["close_time"] == 30 * MIN - 1
+
+
+def test_streaming_matches_batch_and_emits_closes():
+    rows = _base(12)
+    resampler = TimeframeResampler("5m", ["15m", "1h"])
+    closed = []
+    resampler.on_candle_close(lambda s, i, r: closed.append((i, r)))
+    for r in rows:
+        resampler.add("btcusdt", r)
+    batch15 = resample(rows, "5m", "15m")
+    assert [i for i, _ in closed] == ["15m"] * 4 + ["1h"]
+    streamed15 = np.array([r for i, r in closed if i == "15m"], dtype=KLINE_DTYPE)
+    assert np.array_equal(streamed15, batch15)
+    assert resampler.partial("BTCUSDT", "15m") is None
+
+
+def test_attached_resampler_closes_advance_indicator_engine():
+    from ticklet_ai.services.indicator_engine import IndicatorEngine
+    from ticklet_ai.services.kline_stream import KlineStreamService
+
+    stream = KlineStreamService(capacity=50)
+    engine = IndicatorEngine()
+    TimeframeResampler("5m", ["15m"]).attach(stream)
+    engine.attach(stream)
+
+    for r in _base(12):
+        stream.publish_close("BTCUSDT", "5m", r)
+
+    state = engine.state("BTCUSDT", "15m")
+    batch = resample(_base(12), "5m", "15m")
+    assert state.count == len(batch)
+    assert state.last_time == int(batch["time"][-1])
+    assert state.last_close == float(batch["close"][-1])
+    assert len(stream.buffer("BTCUSDT", "15m")) == len(batch)
@@ -0,0 +1,27 @@
+import numpy as np
+
+from ticklet_ai.services.rolling_quantile import RollingQuantile, rolling_quantiles, tercile_regime
+
+
+def test_streaming_matches_batch_with_nans_and_ties():
+    rng = np.random.default_rng(0)
+    values = np.round(rng.normal(size=600), 1)  # rounded: many equal values to evict
+    values[[3, 120, 121, 300]] = np.nan
+    batch = rolling_quantiles(values, 50, (0.1, 0.33, 0.5, 0.67), min_periods=40)
+    rq = RollingQuantile(50, (0.1, 0.33, 0.5, 0.67), min_periods=40)
+    for i, v in enumerate(values):
+        out = rq.update(v)
+        if out is None:
+            assert np.isnan(batch[i]).all()
+        else:
+            assert np.allclose(out, batch[i])
+
+
+def test_tercile_regime_is_causal():
+    rng = np.random.default_rng(1)
+    values = rng.uniform(size=400)
+    regime = tercile_regime(values, window=100)
+    changed = values.copy()
+    changed[300:] *= 10
+    assert (tercile_regime(changed, window=100)[:300] == regime[:300]).all()
+    assert (regime[:99] == 1).all() and set(np.unique(regime[99:])) == {0, 1, 2}
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import time
+
+from ticklet_ai.services.single_flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    sf, calls, results = SingleFlight(), [], []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return "body"
+
+    threads = [threading.Thread(target=lambda: results.append(sf.do(("klines", "BTCUSDT"), fetch))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and results == ["body"] * 5
+    assert sf.in_flight() == 0
+    # completed calls are not cached
+    sf.do(("klines", "BTCUSDT"), fetch)
+    assert len(calls) == 2
+
+
+def test_async_callers_share_result_and_errors():
+    sf, calls = SingleFlight(), []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream 500")
+
+    async def main():
+        return await asyncio.gather(*(sf.do_async("exchangeInfo", fetch) for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(e, RuntimeError) for e in errors)
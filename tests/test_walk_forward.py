@@ -0,0 +1,61 @@
+import numpy as np
+
+from ticklet_ai.services import walk_forward
+from ticklet_ai.services.backtest import BacktestParams
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.indicator_cache import IndicatorCache
+from ticklet_ai.services.walk_forward import WalkForwardParams, build_candidates, fold_ranges, run_walk_forward
+
+
+def _candles(n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = close * (1 + rng.normal(0, 0.008, n))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return Candles(time=np.arange(n) * 900_000, open=open_, close=close,
+                   high=np.maximum(open_, close) + spread, low=np.minimum(open_, close) - spread,
+                   volume=np.full(n, 1e4), quote_volume=np.full(n, 1e6))
+
+
+def test_fold_ranges():
+    assert fold_ranges(1000, 500, 200) == [(0, 500, 500, 700), (200, 700, 700, 900)]
+    assert fold_ranges(1000, 500, 200, step=100)[-1] == (300, 800, 800, 1000)
+    assert fold_ranges(600, 500, 200) == []
+
+
+def test_candidates_are_cached_per_chunk(monkeypatch):
+    calls = []
+    scan = walk_forward._scan_candidates
+    monkeypatch.setattr(walk_forward, "_scan_candidates", lambda *a, **kw: calls.append(1) or scan(*a, **kw))
+    monkeypatch.setattr(walk_forward, "CHUNK_CANDLES", 100)
+    cache, candles = IndicatorCache(), _candles(401)
+    params = BacktestParams("Mock", "BTCUSDT", "15m")
+
+    def check(klines, scans):
+        calls.clear()
+        got = build_candidates(params, klines, cache)
+        assert len(calls) == scans
+        monkeypatch.setattr(walk_forward, "CHUNK_CANDLES", 10**6)
+        whole = build_candidates(params, klines, IndicatorCache())
+        monkeypatch.setattr(walk_forward, "CHUNK_CANDLES", 100)
+        for a, b in zip(got, whole):
+            np.testing.assert_array_equal(a, b)
+        return got
+
+    index, X, pnl, win = check(candles[:400], 4)
+    assert len(index) == len(X) == len(pnl) == len(win) > 0 and (np.diff(index) > 0).all()
+    check(candles[:400], 0)
+    check(candles, 2)  # one more candle: the last block and the new one
+    check(candles[50:], 1)  # rolled start: only the first, partial block
+
+
+def test_walk_forward_folds_are_out_of_sample():
+    report = run_walk_forward(BacktestParams("Mock", "BTCUSDT", "15m"),
+                              WalkForwardParams(train_candles=600, test_candles=300, min_train_trades=20),
+                              klines=_candles(), max_workers=1)
+    assert [f["fold"] for f in report["folds"]] == [0, 1, 2]
+    for fold in report["folds"]:
+        assert fold["train_end"] < fold["test_start"]
+        assert "skipped" not in fold and 0 <= fold["accuracy"] <= 1
+        assert fold["filtered"]["trades"] <= fold["baseline"]["trades"]
+    assert report["baseline"]["trades"] == sum(f["baseline"]["trades"] for f in report["folds"])
@@ -12,14 +12,52 @@ import numpy as np
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Union
-import talib
 
 from .base_strategy import BaseStrategy
 
+try:
+    # Indicators shared with the other strategies through the ticklet_ai indicator cache
+    from ticklet_ai.services.indicator_cache import CachedIndicators
+except ImportError:  # the standalone ticklet image ships without ticklet_ai
+    CachedIndicators = None
+
+try:
+    import talib
+except ImportError:  # only needed without ticklet_ai
+    talib = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class _TalibIndicators:
+    """TA-Lib computed directly, behind the CachedIndicators accessors (used without ticklet_ai)."""
+
+    def __init__(self, dataframe: pd.DataFrame):
+        self.close = dataframe['close'].to_numpy(dtype=float)
+        self.high = dataframe['high'].to_numpy(dtype=float)
+        self.low = dataframe['low'].to_numpy(dtype=float)
+        self.volume = dataframe['volume'].to_numpy(dtype=float)
+
+    def ema(self, period: int) -> np.ndarray:
+        return talib.EMA(self.close, timeperiod=period)
+
+    def sma(self, period: int, source: str = 'close') -> np.ndarray:
+        return talib.SMA(getattr(self, source), timeperiod=period)
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        return talib.RSI(self.close, timeperiod=period)
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return talib.MACD(self.close, fastperiod=fast, slowperiod=slow, signalperiod=signal)
+
+    def atr(self, period: int = 14) -> np.ndarray:
+        return talib.ATR(self.high, self.low, self.close, timeperiod=period)
+
+    def bbands(self, period: int = 20, nbdev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return talib.BBANDS(self.close, timeperiod=period, nbdevup=nbdev, nbdevdn=nbdev)
+
+
 class EnhancedTradingDashboardStrategy(BaseStrategy):
     """
     Enhanced Trading Dashboard Strategy implementing all best practices
@@ -94,24 +132,24 @@ class EnhancedTradingDashboardStrategy(BaseStrategy):
             
             # Precompute common values for performance
             close_prices = dataframe['close'].values
-            high_prices = dataframe['high'].values
-            low_prices = dataframe['low'].values
-            volume_data = dataframe['volume'].values
+            if CachedIndicators is None:
+                indicators = _TalibIndicators(dataframe)
+            else:
+                indicators = CachedIndicators.from_dataframe(dataframe, metadata.get('pair'), self.timeframe)
             
             # RSI with error handling
             try:
-                dataframe['rsi'] = talib.RSI(close_prices, timeperiod=self.rsi_period)
+                dataframe['rsi'] = indicators.rsi(self.rsi_period)
             except Exception as e:
                 logger.warning(f"RSI calculation failed: {e}. Using fallback.")
                 dataframe['rsi'] = 50.0  # Neutral fallback
             
             # MACD with error handling
             try:
-                macd, macd_signal, macd_hist = talib.MACD(
-                    close_prices, 
-                    fastperiod=self.DEFAULT_MACD_FAST,
-                    slowperiod=self.DEFAULT_MACD_SLOW, 
-                    signalperiod=self.DEFAULT_MACD_SIGNAL
+                macd, macd_signal, macd_hist = indicators.macd(
+                    self.DEFAULT_MACD_FAST,
+                    self.DEFAULT_MACD_SLOW,
+                    self.DEFAULT_MACD_SIGNAL
                 )
                 dataframe['macd'] = macd
                 dataframe['macd_signal'] = macd_signal
@@ -124,28 +162,23 @@ class EnhancedTradingDashboardStrategy(BaseStrategy):
             
             # EMAs with vectorized operations
             try:
-                dataframe['ema_9'] = talib.EMA(close_prices, timeperiod=self.DEFAULT_EMA_SHORT)
-                dataframe['ema_21'] = talib.EMA(close_prices, timeperiod=self.DEFAULT_EMA_LONG)
+                dataframe['ema_9'] = indicators.ema(self.DEFAULT_EMA_SHORT)
+                dataframe['ema_21'] = indicators.ema(self.DEFAULT_EMA_LONG)
             except Exception as e:
                 logger.warning(f"EMA calculation failed: {e}. Using SMA fallback.")
-                dataframe['ema_9'] = talib.SMA(close_prices, timeperiod=self.DEFAULT_EMA_SHORT)
-                dataframe['ema_21'] = talib.SMA(close_prices, timeperiod=self.DEFAULT_EMA_LONG)
+                dataframe['ema_9'] = indicators.sma(self.DEFAULT_EMA_SHORT)
+                dataframe['ema_21'] = indicators.sma(self.DEFAULT_EMA_LONG)
             
             # Simple Moving Averages
-            dataframe['sma_50'] = talib.SMA(close_prices, timeperiod=50)
-            dataframe['sma_200'] = talib.SMA(close_prices, timeperiod=200)
+            dataframe['sma_50'] = indicators.sma(50)
+            dataframe['sma_200'] = indicators.sma(200)
             
             # ATR for stop loss calculations
-            dataframe['atr'] = talib.ATR(high_prices, low_prices, close_prices, timeperiod=14)
+            dataframe['atr'] = indicators.atr(14)
             
             # Bollinger Bands
             try:
-                bb_upper, bb_middle, bb_lower = talib.BBANDS(
-                    close_prices, 
-                    timeperiod=self.DEFAULT_BB_PERIOD,
-                    nbdevup=self.DEFAULT_BB_STD, 
-                    nbdevdn=self.DEFAULT_BB_STD
-                )
+                bb_upper, bb_middle, bb_lower = indicators.bbands(self.DEFAULT_BB_PERIOD, self.DEFAULT_BB_STD)
                 dataframe['bb_lower'] = bb_lower
                 dataframe['bb_middle'] = bb_middle
                 dataframe['bb_upper'] = bb_upper
@@ -157,7 +190,7 @@ class EnhancedTradingDashboardStrategy(BaseStrategy):
                 dataframe['bb_percent'] = 0.5
             
             # Volume indicators (optimized)
-            dataframe['volume_sma'] = talib.SMA(volume_data, timeperiod=self.DEFAULT_SMA_VOLUME)
+            dataframe['volume_sma'] = indicators.sma(self.DEFAULT_SMA_VOLUME, source='volume')
             dataframe['volume_ratio'] = dataframe['volume'] / dataframe['volume_sma']
             
             # Price and volume calculations (vectorized)
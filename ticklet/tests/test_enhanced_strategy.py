@@ -151,6 +151,7 @@ class TestEnhancedTradingDashboardStrategy(unittest.TestCase):
         short_sl = self.strategy.calculate_atr_stoploss(current_rate, atr, 'short')
         self.assertGreater(short_sl, current_rate)  # SL should be above entry for short
     
+    @patch('ticklet.strategies.enhanced_trading_dashboard_strategy.CachedIndicators', None)
     @patch('ticklet.strategies.enhanced_trading_dashboard_strategy.talib')
     def test_populate_indicators_with_errors(self, mock_talib):
         """Test indicator population with simulated errors."""
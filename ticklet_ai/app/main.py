@@ -78,6 +78,19 @@ async def lifespan(app: FastAPI):
     
     yield
     logger.info("🛑 Ticklet API shutting down")
+    try:
+        # Only close the pooled session if signal generation ever ran in this process
+        generator = sys.modules.get("ticklet_ai.services.live_signal_generator")
+        if generator is not None:
+            await generator.live_signal_generator.close()
+    except Exception as e:
+        logger.warning("HTTP session shutdown failed: %s", e)
+    try:
+        routes = sys.modules.get("ticklet_ai.app.routes.backtest")
+        if routes is not None:
+            routes.backtest_jobs.shutdown()
+    except Exception as e:
+        logger.warning("Backtest job pool shutdown failed: %s", e)
 
 app = FastAPI(lifespan=lifespan)
 
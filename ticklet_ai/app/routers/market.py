@@ -1,23 +1,41 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 import aiohttp
 from typing import List, Any
+from ticklet_ai.services.binance_scheduler import PRIORITY_NORMAL, endpoint_weight, scheduler
+from ticklet_ai.services.single_flight import flights
 
 BINANCE_BASE = "https://api.binance.com"
 
 router = APIRouter(prefix="/market", tags=["market"])
 
-@router.get("/symbols")
-async def get_symbols(quote: str = "USDT") -> List[str]:
-  """
-  Returns a simple list of tradable symbols filtered by quote (default USDT).
-  """
+async def _fetch_exchange_info() -> Any:
   url = f"{BINANCE_BASE}/api/v3/exchangeInfo"
   timeout = aiohttp.ClientTimeout(total=10)
+  await scheduler.acquire_async(endpoint_weight("/exchangeInfo"), PRIORITY_NORMAL)
   async with aiohttp.ClientSession(timeout=timeout) as session:
     async with session.get(url) as resp:
+      scheduler.observe(resp.headers, resp.status)
       if resp.status != 200:
         raise HTTPException(status_code=resp.status, detail=await resp.text())
-      data = await resp.json()
+      return await resp.json()
+
+async def _fetch_klines_body(params: dict) -> bytes:
+  url = f"{BINANCE_BASE}/api/v3/klines"
+  timeout = aiohttp.ClientTimeout(total=10)
+  await scheduler.acquire_async(endpoint_weight("/klines"), PRIORITY_NORMAL)
+  async with aiohttp.ClientSession(timeout=timeout) as session:
+    async with session.get(url, params=params) as resp:
+      scheduler.observe(resp.headers, resp.status)
+      if resp.status != 200:
+        raise HTTPException(status_code=resp.status, detail=await resp.text())
+      return await resp.read()
+
+@router.get("/symbols")
+async def get_symbols(quote: str = "USDT") -> List[str]:
+  """
+  Returns a simple list of tradable symbols filtered by quote (default USDT).
+  """
+  data = await flights.do_async(("exchangeInfo",), _fetch_exchange_info)
   symbols = []
   for s in data.get("symbols", []):
     if s.get("status") == "TRADING" and s.get("quoteAsset") == quote:
@@ -33,15 +51,13 @@ async def get_klines(
 ) -> Any:
   """
   Proxy klines from Binance; returns raw array (ts, open, high, low, close, volume, ...).
+  The upstream body is passed through as-is, never decoded and re-encoded.
+  Identical concurrent requests share one upstream call.
   """
-  url = f"{BINANCE_BASE}/api/v3/klines"
   params = {"symbol": symbol.upper(), "interval": interval, "limit": limit}
-  timeout = aiohttp.ClientTimeout(total=10)
   try:
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-      async with session.get(url, params=params) as resp:
-        if resp.status != 200:
-          raise HTTPException(status_code=resp.status, detail=await resp.text())
-        return await resp.json()
+    body = await flights.do_async(("klines", params["symbol"], interval, limit),
+                                  lambda: _fetch_klines_body(params))
+    return Response(content=body, media_type="application/json")
   except Exception as e:
     raise HTTPException(status_code=502, detail=f"Upstream error: {e}")
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, Query, HTTPException
 from typing import Literal, Any, Dict, List
 from datetime import datetime, timedelta
@@ -75,17 +76,18 @@ async def signals(type: T = Query(...), limit: int = 50, interval: str = "1h", l
         normalized = [normalize_db_signal(s) for s in raw_data]
         return {"title": titles[type], "items": normalized}
 
-    # For analysis-based types, use live Binance data
+    # For analysis-based types, use live Binance data; the analyzers make blocking
+    # scheduled requests, so they run in a worker thread instead of on the event loop
     symbols = get_target_symbols()
     
     if type == "missed":
         # Fetch missed opportunities using live data
-        items = get_missed_opportunities(symbols, interval="5m", lookback=30)
+        items = await asyncio.to_thread(get_missed_opportunities, symbols, interval="5m", lookback=30)
         return {"title": titles["missed"], "items": items}
     
     elif type == "low_entry":
         # Fetch low entry watchlist using live data
-        items = get_low_entry_watchlist(symbols, interval="5m", lookback=50)
+        items = await asyncio.to_thread(get_low_entry_watchlist, symbols, interval="5m", lookback=50)
         return {"title": titles["low_entry"], "items": items}
     
     elif type == "lowest":
@@ -93,13 +95,15 @@ async def signals(type: T = Query(...), limit: int = 50, interval: str = "1h", l
         from ...services.data_sources import get_klines_from_exchange
         
         # Build candles dict for analyzer
-        all_candles = {}
-        for symbol in symbols:
-            candles = get_klines_from_exchange(symbol, interval="1h", limit=168)
-            if candles:
-                all_candles[symbol] = candles
+        def near_lows():
+            all_candles = {}
+            for symbol in symbols:
+                candles = get_klines_from_exchange(symbol, interval="1h", limit=168)
+                if candles:
+                    all_candles[symbol] = candles
+            return get_near_lows(all_candles, threshold=0.03)
         
-        items = get_near_lows(all_candles, threshold=0.03)
+        items = await asyncio.to_thread(near_lows)
         return {"title": titles["lowest"], "items": items}
 
     raise HTTPException(status_code=400, detail="Bad type")
\ No newline at end of file
@@ -1,45 +1,68 @@
-import os, json, uuid, time
-from typing import Dict, Any
+import os, json, uuid, time, asyncio, threading
+from dataclasses import astuple
+from typing import Dict, Any, Optional
 from fastapi import APIRouter, Body, Query, HTTPException
+from fastapi.responses import StreamingResponse
 try:
     from ticklet_ai.utils.paths import DATA_DIR
 except Exception:
     DATA_DIR = os.environ.get("TICKLET_DATA_DIR", "./data")
 
-os.makedirs(DATA_DIR, exist_ok=True)
 BT_DIR = os.path.join(DATA_DIR, "backtests")
-os.makedirs(BT_DIR, exist_ok=True)
 
 from ticklet_ai.services.backtest import BacktestParams, run_backtest
+from ticklet_ai.services.backtest_jobs import BacktestJobQueue, QueueFull
+from ticklet_ai.services.backtest_store import BacktestStore
+from ticklet_ai.services.single_flight import flights
+from ticklet_ai.services.walk_forward import WalkForwardParams
 
 router = APIRouter(prefix="/api/backtest", tags=["backtest"])
 
+# Summaries in an indexed SQLite table, trades columnar per run (imports old per-run JSON files once).
+# Opened on first use so importing the router creates nothing on disk.
+_backtest_store: Optional[BacktestStore] = None
+_backtest_store_lock = threading.Lock()
+
+def _store() -> BacktestStore:
+    global _backtest_store
+    with _backtest_store_lock:
+        if _backtest_store is None:
+            _backtest_store = BacktestStore(BT_DIR)
+        return _backtest_store
+
+def _params_from_payload(payload: Dict[str, Any]) -> BacktestParams:
+    return BacktestParams(
+        strategy_name=payload.get("strategy", "TickletAlpha"),
+        symbol=payload.get("symbol", "BTCUSDT"),
+        interval=payload.get("interval", "1h"),
+        min_volume=float(payload.get("min_volume", 50000)),
+        min_price_change_pct=float(payload.get("min_price_change_pct", 1)),
+        max_signals=int(payload.get("max_signals", 100)),
+        min_confidence_pct=float(payload.get("min_confidence", 30)),
+        start_time=payload.get("start_time"),
+        end_time=payload.get("end_time")
+    )
+
+def _save_result(result: Dict[str, Any]) -> None:
+    result["ts"] = int(time.time())
+    _store().save(result)
+
+backtest_jobs = BacktestJobQueue(on_result=_save_result)
+
 @router.post("/run")
 def run_backtest_endpoint(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
     """Run comprehensive backtest with real strategy evaluation"""
     try:
         # Parse parameters
-        params = BacktestParams(
-            strategy_name=payload.get("strategy", "TickletAlpha"),
-            symbol=payload.get("symbol", "BTCUSDT"),
-            interval=payload.get("interval", "1h"),
-            min_volume=float(payload.get("min_volume", 50000)),
-            min_price_change_pct=float(payload.get("min_price_change_pct", 1)),
-            max_signals=int(payload.get("max_signals", 100)),
-            min_confidence_pct=float(payload.get("min_confidence", 30)),
-            start_time=payload.get("start_time"),
-            end_time=payload.get("end_time")
-        )
+        params = _params_from_payload(payload)
         
-        # Run backtest
-        result = run_backtest(params)
+        # Run backtest; identical concurrent submissions share one run
+        key = ("backtest",) + astuple(params)
+        result = flights.do(key, lambda: run_backtest(params))
         
         # Save result
         result_id = result["id"]
-        result["ts"] = int(time.time())
-        
-        with open(os.path.join(BT_DIR, f"{result_id}.json"), "w") as f:
-            json.dump(result, f, indent=2)
+        _save_result(result)
         
         # Return summary (without full trade list)
         summary = {k: v for k, v in result.items() if k != "trades"}
@@ -58,50 +81,132 @@ def run_backtest_endpoint(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]
             "status": "failed"
         }
 
+@router.post("/batch")
+def submit_batch_job(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+    """
+    Queue many backtests as one job. Jobs are given explicitly as "jobs"
+    (each like a /run payload) or as "symbols" x "intervals" x "strategies";
+    other keys are shared run parameters. The backtests share the job
+    queue's worker processes. Each job's result is saved like a /run result;
+    the finished job's metrics hold the combined report (see /jobs/{job_id}).
+    """
+    shared = {k: v for k, v in payload.items()
+              if k not in ("jobs", "symbols", "intervals", "strategies", "max_workers", "include_trades")}
+    if payload.get("jobs"):
+        jobs = [_params_from_payload({**shared, **job}) for job in payload["jobs"]]
+    else:
+        jobs = [_params_from_payload({**shared, "strategy": strategy, "symbol": symbol, "interval": interval})
+                for strategy in payload.get("strategies", ["TickletAlpha"])
+                for symbol in payload.get("symbols", [])
+                for interval in payload.get("intervals", ["1h"])]
+    if not jobs:
+        raise HTTPException(status_code=400, detail="No backtest jobs given")
+    try:
+        job = backtest_jobs.submit_batch(jobs, include_trades=bool(payload.get("include_trades", False)))
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"job_id": job.id, "status": job.status, "jobs": len(jobs)}
+
+@router.post("/walk-forward")
+def submit_walk_forward_job(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+    """
+    Queue a walk-forward backtest: the ML model is retrained per fold on a
+    rolling train window and evaluated on the following test window. Window
+    sizes are in candles ("train_candles", "test_candles", optional
+    "step_candles"); "threshold" is the win probability needed to take a test
+    trade. Returns its job id immediately; the finished job's metrics hold the
+    report (see /jobs/{job_id}).
+    """
+    wf = WalkForwardParams(
+        train_candles=int(payload.get("train_candles", 2000)),
+        test_candles=int(payload.get("test_candles", 500)),
+        step_candles=int(payload["step_candles"]) if payload.get("step_candles") else None,
+        min_train_trades=int(payload.get("min_train_trades", 50)),
+        threshold=float(payload.get("threshold", 0.5))
+    )
+    try:
+        job = backtest_jobs.submit(_params_from_payload(payload), walk_forward=wf)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"job_id": job.id, "status": job.status}
+
+@router.post("/jobs")
+def submit_backtest_job(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+    """Queue a backtest (same payload as /run); returns its job id immediately"""
+    try:
+        job = backtest_jobs.submit(_params_from_payload(payload))
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"job_id": job.id, "status": job.status}
+
+@router.get("/jobs")
+def list_backtest_jobs() -> Dict[str, Any]:
+    """Queued, running and recently finished jobs, newest first"""
+    jobs = [job.snapshot() for job in backtest_jobs.jobs()]
+    jobs.sort(key=lambda j: j["created_at"], reverse=True)
+    return {"jobs": jobs}
+
+@router.get("/jobs/{job_id}")
+def get_backtest_job(job_id: str) -> Dict[str, Any]:
+    """Job status, progress and partial metrics (for polling)"""
+    job = backtest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    return job.snapshot()
+
+@router.get("/jobs/{job_id}/events")
+async def stream_backtest_job(job_id: str, interval: float = Query(0.5, ge=0.1, le=10)):
+    """Server-sent events with the job snapshot on every change, ending when the job finishes"""
+    job = backtest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    
+    async def events():
+        version = -1
+        while True:
+            snapshot = job.snapshot()
+            if snapshot["version"] != version:
+                version = snapshot["version"]
+                yield f"event: progress\ndata: {json.dumps(snapshot)}\n\n"
+            if job.finished:
+                yield f"event: done\ndata: {json.dumps(snapshot)}\n\n"
+                return
+            await asyncio.sleep(interval)
+    
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.delete("/jobs/{job_id}")
+def cancel_backtest_job(job_id: str) -> Dict[str, Any]:
+    """Cancel a queued or running job"""
+    job = backtest_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    return job.snapshot()
+
 @router.get("/result/{result_id}")
 def get_backtest_result(result_id: str) -> Dict[str, Any]:
     """Get full backtest result including all trades"""
-    result_path = os.path.join(BT_DIR, f"{result_id}.json")
-    
-    if not os.path.exists(result_path):
-        raise HTTPException(status_code=404, detail="Backtest result not found")
-    
     try:
-        with open(result_path, "r") as f:
-            return json.load(f)
+        result = _store().get(result_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading result: {e}")
+    
+    if result is None:
+        raise HTTPException(status_code=404, detail="Backtest result not found")
+    return result
 
 @router.get("/results")
-def list_backtest_results() -> Dict[str, Any]:
-    """List all available backtest results"""
+def list_backtest_results(strategy: Optional[str] = Query(None), symbol: Optional[str] = Query(None),
+                          interval: Optional[str] = Query(None), since: Optional[int] = Query(None),
+                          until: Optional[int] = Query(None), limit: int = Query(100, ge=1, le=1000),
+                          offset: int = Query(0, ge=0)) -> Dict[str, Any]:
+    """List stored backtest summaries, newest first (never reads trades)"""
     try:
-        results = []
-        for filename in os.listdir(BT_DIR):
-            if filename.endswith(".json"):
-                result_path = os.path.join(BT_DIR, filename)
-                try:
-                    with open(result_path, "r") as f:
-                        result = json.load(f)
-                        # Include only summary info
-                        summary = {
-                            "id": result.get("id"),
-                            "strategy": result.get("strategy"),
-                            "symbol": result.get("symbol"),
-                            "interval": result.get("interval"),
-                            "executed": result.get("executed", 0),
-                            "win_rate": result.get("win_rate", 0),
-                            "pnl_pct": result.get("pnl_pct", 0),
-                            "timestamp": result.get("timestamp", 0)
-                        }
-                        results.append(summary)
-                except Exception as e:
-                    print(f"Error reading result {filename}: {e}")
-                    continue
-        
-        # Sort by timestamp, newest first
-        results.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
-        
+        results = _store().list(strategy=strategy, symbol=symbol, interval=interval,
+                                since=since, until=until, limit=limit, offset=offset)
+        for r in results:
+            r["timestamp"] = r["created_at"]
         return {"results": results}
         
     except Exception as e:
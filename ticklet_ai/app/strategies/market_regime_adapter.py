@@ -1,8 +1,10 @@
+import os
 from typing import List
 from .base import Strategy, SignalProposal
-from ticklet_ai.strategies.market_regime_core import label_regime
+from ticklet_ai.strategies.market_regime_core import regime_labeller
 from ticklet_ai.services.scanner import get_candidates
-import pandas as pd
+
+REGIME_INTERVAL = os.getenv("TICKLET_REGIME_INTERVAL", "1h")
 
 class MarketRegime(Strategy):
     name = "MarketRegime"
@@ -15,6 +17,7 @@ class MarketRegime(Strategy):
         for c in candidates:
             # Market Regime strategy adapts to market conditions
             symbol = c["symbol"]
+            regime = regime_labeller.current(symbol, REGIME_INTERVAL) or "unknown"
             
             # Create regime-based proposal
             entry_price = (c["entry_low"] + c["entry_high"]) / 2
@@ -39,7 +42,7 @@ class MarketRegime(Strategy):
                 side=c.get("side", "BUY"),
                 meta={
                     "strategy": "MarketRegime",
-                    "regime": "unknown",  # Would be calculated from actual market data
+                    "regime": regime,  # streaming label, kept current from closed candles
                     "confidence": c.get("confidence", 0.0),
                     "volatility_factor": volatility_factor,
                     "market_condition": "neutral"
@@ -25,9 +25,44 @@ def _resolve_tfs_for_strategy(sname: str) -> list[str]:
     st_tfs = get_strategy_timeframes(sname)
     return st_tfs or _env_timeframes()
 
+def _start_kline_stream():
+    """Subscribe every strategy's (symbol, timeframe) to the live kline stream."""
+    from ..services.kline_stream import kline_stream, stream_enabled
+    from ..services.candle_store import load_klines
+    from ..services.market_data import fetch_raw_klines
+    from ..services.resampler import TimeframeResampler, can_derive, resample_base
+    from ..services.indicator_engine import indicator_engine
+    from ..strategies.market_regime_core import regime_labeller
+    if not stream_enabled():
+        return None
+    pairs = sorted({(sym, tf) for sname in list_strategies()
+                    for sym in _resolve_symbols_for_strategy(sname)
+                    for tf in _resolve_tfs_for_strategy(sname)})
+    kline_stream.warm_start(pairs, lambda sym, tf, n: load_klines(fetch_raw_klines, sym, tf, n))
+    base = resample_base()
+    if base:
+        # One base subscription per symbol; derivable timeframes are resampled locally
+        derived = {tf for _, tf in pairs if can_derive(base, tf)}
+        TimeframeResampler(base, sorted(derived)).attach(kline_stream)
+        subscribed = sorted({(sym, base) for sym, _ in pairs} | {p for p in pairs if p[1] not in derived})
+        kline_stream.warm_start([p for p in subscribed if p not in pairs],
+                                lambda sym, tf, n: load_klines(fetch_raw_klines, sym, tf, n))
+        pairs = subscribed
+    # Seed streaming indicator/regime state from the warmed buffers (closed candles only)
+    now_ms = int(time.time() * 1000)
+    for (sym, tf), buf in list(kline_stream.buffers.items()):
+        rows = buf.snapshot()
+        rows = rows[rows["close_time"] < now_ms]
+        indicator_engine.warm_start(sym, tf, rows)
+        regime_labeller.sync(sym, tf, rows["time"], rows["high"], rows["low"], rows["close"])
+    indicator_engine.attach(kline_stream)
+    regime_labeller.attach(kline_stream)
+    return kline_stream.start_in_thread(pairs)
+
 def start():
     if os.getenv("TICKLET_BG_ENABLED","true").lower() not in ("1","true","yes","on"):
         return None
+    _start_kline_stream()
     interval = int(os.getenv("TICKLET_BG_INTERVAL_SEC","60"))
     sched = BackgroundScheduler(timezone="UTC")
 
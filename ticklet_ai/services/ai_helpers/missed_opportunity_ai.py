@@ -1,6 +1,6 @@
-from talib import RSI
 import numpy as np
 from ticklet_ai.services.data_sources import get_klines_from_exchange
+from ticklet_ai.services.indicator_panel import load_panel
 
 def get_missed_opportunities(symbols: list[str], interval: str = "5m", lookback: int = 30) -> list[dict]:
     """
@@ -16,34 +16,28 @@ def get_missed_opportunities(symbols: list[str], interval: str = "5m", lookback:
     """
     missed_opportunities = []
 
-    for symbol in symbols:
-        # Pull live candle data from the exchange
-        candles = get_klines_from_exchange(symbol, interval, lookback)
-        if not candles or len(candles) < lookback:
-            # Skip if insufficient data is retrieved
-            continue
-
-        # Extract closing prices
-        closing_prices = np.array([candle['close'] for candle in candles])
-
-        # Calculate percentage price change over the lookback period
-        start_price = closing_prices[0]
-        end_price = closing_prices[-1]
-        pct_gain = ((end_price - start_price) / start_price) * 100
-
-        # Calculate RSI using TA-Lib
-        rsi_values = RSI(closing_prices, timeperiod=14)
-        current_rsi = rsi_values[-1]
-
-        # Mark as missed opportunity if conditions are met
-        if pct_gain > 5 and current_rsi > 75:
-            missed_opportunities.append({
-                "symbol": symbol,
-                "pct_gain": round(pct_gain, 2),
-                "rsi": round(current_rsi, 2),
-                "price": round(end_price, 6),
-                "note": "Overbought" if current_rsi > 80 else "Wait for dip"
-            })
+    # Pull live candle data for the whole list; symbols with insufficient data are left out
+    panel = load_panel(symbols, interval, lookback, fetch=get_klines_from_exchange)
+    if not len(panel):
+        return missed_opportunities
+
+    # Calculate percentage price change over the lookback period
+    start_price = panel.close[:, 0]
+    end_price = panel.close[:, -1]
+    pct_gain = ((end_price - start_price) / start_price) * 100
+
+    # RSI for every symbol in one vectorized pass (TA-Lib compatible)
+    current_rsi = panel.rsi(14)[:, -1]
+
+    # Mark as missed opportunity if conditions are met
+    for i in np.flatnonzero((pct_gain > 5) & (current_rsi > 75)):
+        missed_opportunities.append({
+            "symbol": panel.symbols[i],
+            "pct_gain": round(float(pct_gain[i]), 2),
+            "rsi": round(float(current_rsi[i]), 2),
+            "price": round(float(end_price[i]), 6),
+            "note": "Overbought" if current_rsi[i] > 80 else "Wait for dip"
+        })
 
     return missed_opportunities
 
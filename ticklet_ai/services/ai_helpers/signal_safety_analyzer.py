@@ -1,7 +1,7 @@
-import talib
 import numpy as np
+from ticklet_ai.services.indicator_cache import CachedIndicators
 
-def evaluate_signal_safety(df, entry_price, direction):
+def evaluate_signal_safety(df, entry_price, direction, symbol=None, interval=None):
     """
     Analyze the safety of a trade signal using AI/ML models.
 
@@ -9,15 +9,18 @@ def evaluate_signal_safety(df, entry_price, direction):
         df (DataFrame): Price chart data with OHLCV and additional columns (e.g., bid, ask).
         entry_price (float): The intended entry price for the signal.
         direction (str): Trade direction, either "long" or "short".
+        symbol (str, optional): Trading pair; with interval, lets indicators be shared via the indicator cache.
+        interval (str, optional): Candle interval of `df`.
 
     Returns:
         dict: Analysis report containing confidence score, projected gain, risk/reward ratio, stop-loss suggestion, and notes.
     """
     # Calculate technical indicators
-    atr = talib.ATR(df['high'], df['low'], df['close'], timeperiod=14).iloc[-1]
-    rsi = talib.RSI(df['close'], timeperiod=14).iloc[-1]
-    macd, macdsignal, macdhist = talib.MACD(df['close'], fastperiod=12, slowperiod=26, signalperiod=9)
-    ema_21 = talib.EMA(df['close'], timeperiod=21).iloc[-1]
+    indicators = CachedIndicators.from_dataframe(df, symbol if interval else None, interval or "")
+    atr = indicators.atr(14)[-1]
+    rsi = indicators.rsi(14)[-1]
+    macd, macdsignal, macdhist = indicators.macd(12, 26, 9)
+    ema_21 = indicators.ema(21)[-1]
     
     current_price = df['close'].iloc[-1]
     
@@ -51,8 +54,8 @@ def evaluate_signal_safety(df, entry_price, direction):
         confidence_factors.append(-0.1)
     
     # MACD histogram momentum
-    current_macdhist = macdhist.iloc[-1]
-    prev_macdhist = macdhist.iloc[-2]
+    current_macdhist = macdhist[-1]
+    prev_macdhist = macdhist[-2]
     
     if direction == "long" and current_macdhist > prev_macdhist:
         confidence_factors.append(0.15)
@@ -78,7 +81,7 @@ def evaluate_signal_safety(df, entry_price, direction):
         confidence_factors.append(-0.1)
     
     # Volume confirmation (simplified)
-    avg_volume = df['volume'].rolling(20).mean().iloc[-1]
+    avg_volume = indicators.sma(20, "volume")[-1]
     current_volume = df['volume'].iloc[-1]
     
     if current_volume > avg_volume * 1.2:
@@ -1,8 +1,12 @@
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Sequence
 from dataclasses import dataclass
 import time
 import uuid
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from ticklet_ai.services.market_data import get_klines
+from ticklet_ai.services.history_loader import get_history
+from ticklet_ai.services.candles import Candles
 from ticklet_ai.services.leverage import resolve_leverage
 
 # Strategy imports - adapt to actual strategy locations in repo
@@ -17,9 +21,17 @@ except ImportError:
     golden_hook_eval = None
 
 try:
-    from ticklet_ai.services.ml_infer import predict_win_prob
+    from ticklet_ai.services.ml_infer import predict_win_probs
 except ImportError:
-    def predict_win_prob(features): return 0.5
+    def predict_win_probs(rows, model=None): return [0.5] * len(rows)
+
+PROGRESS_EVERY = 50  # candles between progress callbacks
+
+# on_progress(candles processed, total candles, partial metrics); it may raise BacktestCancelled
+ProgressCallback = Callable[[int, int, Dict[str, Any]], None]
+
+class BacktestCancelled(Exception):
+    """Raised from a progress callback to stop a running backtest"""
 
 @dataclass
 class BacktestParams:
@@ -93,174 +105,118 @@ def _mock_evaluator(symbol: str, timeframe: str, candle: Dict[str, Any] = None):
         }
     }
 
-def _simulate_trade_outcome(signal: Dict[str, Any], next_candles: List[Dict[str, Any]], leverage: int) -> Dict[str, Any]:
-    """Simulate trade outcome based on signal and subsequent price action"""
-    entry_price = signal.get("entry_low", 0)
-    stop_loss = signal.get("stop_loss", 0)
-    tp1 = signal.get("tp1", 0)
-    tp2 = signal.get("tp2", 0)
-    tp3 = signal.get("tp3", 0)
-    side = signal.get("side", "long")
-    
-    if not entry_price or not stop_loss:
-        return None
-        
-    # Look at next few candles to determine outcome
-    for i, candle in enumerate(next_candles[:20]):  # Check up to 20 candles ahead
-        high = candle.get("high", 0)
-        low = candle.get("low", 0)
-        close = candle.get("close", 0)
-        
-        if side == "long":
-            # Check if stop loss hit
-            if low <= stop_loss:
-                pnl_pct = ((stop_loss - entry_price) / entry_price) * 100 * leverage
-                return {
-                    "exit_price": stop_loss,
-                    "exit_reason": "stop_loss",
-                    "pnl_pct": pnl_pct,
-                    "pnl_abs": 1000 * (pnl_pct / 100),  # Assuming $1000 position size
-                    "win": False,
-                    "hold_candles": i + 1
-                }
-            # Check profit targets
-            elif high >= tp3:
-                pnl_pct = ((tp3 - entry_price) / entry_price) * 100 * leverage
-                return {
-                    "exit_price": tp3,
-                    "exit_reason": "tp3",
-                    "pnl_pct": pnl_pct,
-                    "pnl_abs": 1000 * (pnl_pct / 100),
-                    "win": True,
-                    "hold_candles": i + 1
-                }
-            elif high >= tp2:
-                pnl_pct = ((tp2 - entry_price) / entry_price) * 100 * leverage
-                return {
-                    "exit_price": tp2,
-                    "exit_reason": "tp2",
-                    "pnl_pct": pnl_pct,
-                    "pnl_abs": 1000 * (pnl_pct / 100),
-                    "win": True,
-                    "hold_candles": i + 1
-                }
-            elif high >= tp1:
-                pnl_pct = ((tp1 - entry_price) / entry_price) * 100 * leverage
-                return {
-                    "exit_price": tp1,
-                    "exit_reason": "tp1", 
-                    "pnl_pct": pnl_pct,
-                    "pnl_abs": 1000 * (pnl_pct / 100),
-                    "win": True,
-                    "hold_candles": i + 1
-                }
-        else:  # short
-            # Check if stop loss hit
-            if high >= stop_loss:
-                pnl_pct = ((entry_price - stop_loss) / entry_price) * 100 * leverage
-                return {
-                    "exit_price": stop_loss,
-                    "exit_reason": "stop_loss",
-                    "pnl_pct": pnl_pct,
-                    "pnl_abs": 1000 * (pnl_pct / 100),
-                    "win": False,
-                    "hold_candles": i + 1
-                }
-            # Check profit targets  
-            elif low <= tp3:
-                pnl_pct = ((entry_price - tp3) / entry_price) * 100 * leverage
-                return {
-                    "exit_price": tp3,
-                    "exit_reason": "tp3",
-                    "pnl_pct": pnl_pct,
-                    "pnl_abs": 1000 * (pnl_pct / 100),
-                    "win": True,
-                    "hold_candles": i + 1
-                }
-            elif low <= tp2:
-                pnl_pct = ((entry_price - tp2) / entry_price) * 100 * leverage
-                return {
-                    "exit_price": tp2,
-                    "exit_reason": "tp2",
-                    "pnl_pct": pnl_pct,
-                    "pnl_abs": 1000 * (pnl_pct / 100),
-                    "win": True,
-                    "hold_candles": i + 1
-                }
-            elif low <= tp1:
-                pnl_pct = ((entry_price - tp1) / entry_price) * 100 * leverage
-                return {
-                    "exit_price": tp1,
-                    "exit_reason": "tp1",
-                    "pnl_pct": pnl_pct,
-                    "pnl_abs": 1000 * (pnl_pct / 100),
-                    "win": True,
-                    "hold_candles": i + 1
-                }
-    
-    # If no exit condition met, close at last available price
-    if next_candles:
-        last_close = next_candles[-1].get("close", entry_price)
-        if side == "long":
-            pnl_pct = ((last_close - entry_price) / entry_price) * 100 * leverage
-        else:
-            pnl_pct = ((entry_price - last_close) / entry_price) * 100 * leverage
-            
-        return {
-            "exit_price": last_close,
-            "exit_reason": "time_exit",
-            "pnl_pct": pnl_pct,
-            "pnl_abs": 1000 * (pnl_pct / 100),
-            "win": pnl_pct > 0,
-            "hold_candles": len(next_candles)
-        }
-    
-    return None
+def _ml_features(signal: Dict[str, Any], candle: Dict[str, Any], quote_volume: float) -> Dict[str, Any]:
+    """ml_infer feature dict for one candidate signal"""
+    indicators = signal.get("indicators", {})
+    meta = signal.get("meta", {})
+    return {
+        "rsi": indicators.get("rsi", 50),
+        "macd": indicators.get("macd", 0),
+        "vol": quote_volume,
+        "atr": indicators.get("atr", 0),
+        "ema_fast": indicators.get("ema_fast", candle.get("close", 0)),
+        "ema_slow": indicators.get("ema_slow", candle.get("close", 0)),
+        "bb_upper": indicators.get("bb_upper", 0),
+        "bb_lower": indicators.get("bb_lower", 0),
+        "funding_rate": indicators.get("funding_rate", 0),
+        "spread": indicators.get("spread", 0),
+        "bid_ask_imbalance": indicators.get("bid_ask_imbalance", 0),
+        "volatility": indicators.get("volatility", 0),
+        "regime": meta.get("regime", 0),
+        "trending_score": meta.get("trending", 0),
+        "anomaly_score": meta.get("anomaly", 0),
+    }
+
+EXIT_REASONS = ("stop_loss", "tp3", "tp2", "tp1")  # checked in this order within a candle
 
-def run_backtest(params: BacktestParams) -> Dict[str, Any]:
+def _simulate_trade_outcomes(signals: List[Dict[str, Any]], entry_index: Sequence[int], candles: Candles,
+                             leverage: int, horizon: int = 20) -> List[Optional[Dict[str, Any]]]:
     """
-    Run comprehensive backtest with real strategy evaluation and ML integration
+    Simulate the outcomes of many signals over one candle series at once.
+
+    Signal k enters at candle entry_index[k] and is followed over the next
+    `horizon` candles. The first candle that touches the stop or a target
+    decides the exit (stop before tp3, tp2 and tp1 within a candle); if none
+    is touched the trade closes at the last close of the window. Signals
+    without an entry or stop, or without candles after them, give None.
     """
-    print(f"Starting backtest: {params.strategy_name} on {params.symbol} {params.interval}")
-    
-    # Get strategy evaluator
-    evaluator = _get_strategy_evaluator(params.strategy_name)
-    
-    # Fetch historical data
-    klines = get_klines(
+    if not signals:
+        return []
+    rows = np.arange(len(signals))
+    entry_index = np.asarray(entry_index, dtype=np.int64)
+    levels = np.array([[s.get("entry_low", 0), s.get("stop_loss", 0), s.get("tp1", 0), s.get("tp2", 0),
+                        s.get("tp3", 0)] for s in signals], dtype=float)
+    entry, stop, tp1, tp2, tp3 = levels.T
+    is_long = np.array([s.get("side", "long") == "long" for s in signals])[:, None]
+    direction = np.where(is_long[:, 0], 1.0, -1.0)
+
+    # (signals x horizon) forward windows; candles past the end are NaN and never touch
+    pad = np.full(horizon, np.nan)
+    highs = sliding_window_view(np.concatenate([candles.high, pad]), horizon)[entry_index + 1]
+    lows = sliding_window_view(np.concatenate([candles.low, pad]), horizon)[entry_index + 1]
+
+    exits = np.stack([stop, tp3, tp2, tp1])
+    touched = np.stack([np.where(is_long, lows <= stop[:, None], highs >= stop[:, None])] +
+                       [np.where(is_long, highs >= tp[:, None], lows <= tp[:, None]) for tp in exits[1:]])
+    any_touch = touched.any(axis=0)
+    hit = any_touch.any(axis=1)
+    first = any_touch.argmax(axis=1)
+    level = touched[:, rows, first].argmax(axis=0)
+
+    held = np.clip(len(candles) - entry_index - 1, 0, horizon)
+    last_close = candles.close[np.minimum(entry_index + held, len(candles) - 1)]
+    exit_price = np.where(hit, exits[level, rows], last_close)
+    pnl_pct = (direction * (exit_price - entry)) / entry * 100 * leverage
+    win = np.where(hit, level > 0, pnl_pct > 0)
+    hold = np.where(hit, first + 1, held)
+    valid = (entry != 0) & (stop != 0) & (hit | (held > 0))
+
+    outcomes: List[Optional[Dict[str, Any]]] = []
+    for k in range(len(signals)):
+        if not valid[k]:
+            outcomes.append(None)
+            continue
+        outcomes.append({
+            "exit_price": float(exit_price[k]),
+            "exit_reason": EXIT_REASONS[level[k]] if hit[k] else "time_exit",
+            "pnl_pct": float(pnl_pct[k]),
+            "pnl_abs": 1000 * (float(pnl_pct[k]) / 100),  # Assuming $1000 position size
+            "win": bool(win[k]),
+            "hold_candles": int(hold[k]),
+        })
+    return outcomes
+
+def load_backtest_candles(params: BacktestParams) -> Candles:
+    """Historical data for a run: full paged range when a start is given, else the latest 1000 candles"""
+    if params.start_time:
+        return get_history(
+            symbol=params.symbol,
+            interval=params.interval,
+            start_time=int(params.start_time),
+            end_time=int(params.end_time) if params.end_time else None
+        )
+    return get_klines(
         symbol=params.symbol,
         interval=params.interval,
         limit=1000,
-        start_time=params.start_time,
         end_time=params.end_time
     )
-    
-    if not klines:
-        return {
-            "error": "No historical data available",
-            "executed": 0,
-            "wins": 0,
-            "win_rate": 0.0,
-            "pnl_abs": 0.0,
-            "pnl_pct": 0.0,
-            "trades": []
-        }
-    
-    print(f"Loaded {len(klines)} candles for backtest")
-    
-    # Get leverage setting
-    default_strategy_leverage = 10
-    leverage = resolve_leverage(default_strategy_leverage)
-    
-    trades = []
-    executed = 0
-    wins = 0
-    total_pnl_abs = 0.0
-    
-    # Process each candle
+
+def _scan_candidates(params: BacktestParams, klines: Candles, evaluator, limit: Optional[int] = None,
+                     on_progress: Optional[ProgressCallback] = None) -> List[tuple]:
+    """
+    Candidate trades that pass the volume, confidence and entry/stop filters,
+    as (candle index, candle, signal, confidence, quote volume, ML features),
+    stopping after `limit` candidates. The last 20 candles are kept back for
+    trade simulation.
+    """
+    pending = []
+    total_candles = max(len(klines) - 20, 0)
     for i, candle in enumerate(klines[:-20]):  # Leave some candles for trade simulation
-        if executed >= params.max_signals:
+        if limit is not None and len(pending) >= limit:
             break
+        if on_progress is not None and i % PROGRESS_EVERY == 0:
+            on_progress(i, total_candles, {"signals": len(pending)})
             
         # Apply volume filter
         quote_volume = candle.get("quote_volume", candle.get("volume", 0) * candle.get("close", 0))
@@ -286,36 +242,77 @@ def run_backtest(params: BacktestParams) -> Dict[str, Any]:
         confidence = signal.get("confidence", signal.get("ai_confidence", 0))
         if confidence * 100 < params.min_confidence_pct:
             continue
+
+        # Signals without entry or stop cannot be simulated
+        if not signal.get("entry_low", 0) or not signal.get("stop_loss", 0):
+            continue
             
-        # Enhance signal with ML prediction if available
+        # Collect ML features; the caller scores all candidates together
         try:
-            features = {
-                "rsi": signal.get("indicators", {}).get("rsi", 50),
-                "macd": signal.get("indicators", {}).get("macd", 0),
-                "vol": quote_volume,
-                "atr": signal.get("indicators", {}).get("atr", 0),
-                "ema_fast": signal.get("indicators", {}).get("ema_fast", candle.get("close", 0)),
-                "ema_slow": signal.get("indicators", {}).get("ema_slow", candle.get("close", 0)),
-                "bb_upper": signal.get("indicators", {}).get("bb_upper", 0),
-                "bb_lower": signal.get("indicators", {}).get("bb_lower", 0),
-                "funding_rate": signal.get("indicators", {}).get("funding_rate", 0),
-                "spread": signal.get("indicators", {}).get("spread", 0),
-                "bid_ask_imbalance": signal.get("indicators", {}).get("bid_ask_imbalance", 0),
-                "volatility": signal.get("indicators", {}).get("volatility", 0),
-                "regime": signal.get("meta", {}).get("regime", 0),
-                "trending_score": signal.get("meta", {}).get("trending", 0),
-                "anomaly_score": signal.get("meta", {}).get("anomaly", 0),
-            }
-            ml_win_prob = predict_win_prob(features)
-            signal["ml_win_probability"] = ml_win_prob
+            features = _ml_features(signal, candle, quote_volume)
         except Exception as e:
-            print(f"ML prediction error: {e}")
-            signal["ml_win_probability"] = 0.5
-        
-        # Simulate trade outcome
-        next_candles = klines[i+1:i+21]  # Next 20 candles
-        outcome = _simulate_trade_outcome(signal, next_candles, leverage)
+            print(f"ML feature error: {e}")
+            features = None
         
+        pending.append((i, candle, signal, confidence, quote_volume, features))
+    
+    return pending
+
+def run_backtest(params: BacktestParams, klines: Optional[Candles] = None,
+                 on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """
+    Run comprehensive backtest with real strategy evaluation and ML integration
+    (on `klines` when the caller already has the candles). `on_progress` is
+    called every PROGRESS_EVERY candles and once more with the final metrics.
+    """
+    print(f"Starting backtest: {params.strategy_name} on {params.symbol} {params.interval}")
+    
+    # Get strategy evaluator
+    evaluator = _get_strategy_evaluator(params.strategy_name)
+    
+    if klines is None:
+        klines = load_backtest_candles(params)
+    
+    if not klines:
+        return {
+            "error": "No historical data available",
+            "executed": 0,
+            "wins": 0,
+            "win_rate": 0.0,
+            "pnl_abs": 0.0,
+            "pnl_pct": 0.0,
+            "trades": []
+        }
+    
+    print(f"Loaded {len(klines)} candles for backtest")
+    
+    # Get leverage setting
+    default_strategy_leverage = 10
+    leverage = resolve_leverage(default_strategy_leverage)
+    
+    trades = []
+    executed = 0
+    wins = 0
+    total_pnl_abs = 0.0
+    
+    # Process each candle
+    total_candles = max(len(klines) - 20, 0)
+    pending = _scan_candidates(params, klines, evaluator, params.max_signals, on_progress)
+    
+    # Enhance signals with ML predictions: one model load and one predict_proba call
+    try:
+        win_probs = predict_win_probs([p[5] for p in pending])
+    except Exception as e:
+        print(f"ML prediction error: {e}")
+        win_probs = [0.5] * len(pending)
+    for p, win_prob in zip(pending, win_probs):
+        p[2]["ml_win_probability"] = float(win_prob)
+    
+    # Simulate all trade outcomes over the next 20 candles at once
+    outcomes = _simulate_trade_outcomes([p[2] for p in pending], [p[0] for p in pending],
+                                        Candles.coerce(klines), leverage)
+    
+    for (_, candle, signal, confidence, quote_volume, _), outcome in zip(pending, outcomes):
         if outcome:
             trade = {
                 "id": str(uuid.uuid4()),
@@ -345,6 +342,10 @@ def run_backtest(params: BacktestParams) -> Dict[str, Any]:
                 
             total_pnl_abs += trade["pnl_abs"]
     
+    if on_progress is not None:
+        on_progress(total_candles, total_candles, {"signals": len(pending), "executed": executed,
+                                                   "wins": wins, "pnl_abs": round(total_pnl_abs, 2)})
+    
     # Calculate metrics
     win_rate = (wins / executed) if executed > 0 else 0.0
     starting_balance = 10000.0
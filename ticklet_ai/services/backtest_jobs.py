@@ -0,0 +1,354 @@
+"""
+Backtest job queue.
+
+In-process replacement for running a backtest, a batch of backtests or a
+walk-forward run inside the HTTP request: ``submit`` (``submit_batch``)
+queues a job and returns it immediately, and each job exposes its status,
+progress and partial metrics for polling or streaming. Only that tracking
+lives in the API process. Candles are loaded on a thread (I/O) and
+published to shared memory; the CPU-bound backtest runs in the batch
+runner's process pool, so it never holds the API process's GIL. Workers
+report progress over a manager queue and poll a per-job cancel event, so
+jobs can be cancelled while queued or running (a running backtest stops at
+its next progress callback). No external broker is involved; jobs live only
+as long as the process.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ticklet_ai.services.backtest import BacktestCancelled, BacktestParams, load_backtest_candles, run_backtest
+from ticklet_ai.services.batch_backtest import (
+    START_METHOD, SharedCandles, batch_report, process_pool, publish_candles, release, shared_data,
+)
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.walk_forward import WalkForwardParams, run_walk_forward
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv("TICKLET_BACKTEST_JOB_WORKERS", "2"))
+MAX_QUEUED = int(os.getenv("TICKLET_BACKTEST_MAX_QUEUED", "50"))
+KEEP_FINISHED = int(os.getenv("TICKLET_BACKTEST_KEEP_JOBS", "200"))
+
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = "queued", "running", "completed", "failed", "cancelled"
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+class QueueFull(Exception):
+    """Raised by submit when MAX_QUEUED jobs are already waiting"""
+
+
+class BacktestJob:
+    """
+    One submitted backtest, walk-forward run (`walk_forward` set) or batch of
+    backtests (`batch` set, `params` None); `version` increases on every
+    state change.
+    """
+
+    def __init__(self, params: Optional[BacktestParams], walk_forward: Optional[WalkForwardParams] = None,
+                 batch: Optional[List[BacktestParams]] = None, include_trades: bool = False):
+        self.id = str(uuid.uuid4())
+        self.params = params
+        self.walk_forward = walk_forward
+        self.batch = batch
+        self.include_trades = include_trades  # batch: keep each job's trades in the report
+        self.kind = "batch" if batch is not None else "backtest" if walk_forward is None else "walk_forward"
+        self.status = QUEUED
+        self.stage = "queued"
+        self.progress = 0.0
+        self.metrics: Dict[str, Any] = {}
+        self.result_id: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.version = 0
+        self.cancel_requested = threading.Event()
+        self._lock = threading.Lock()
+
+    def _set(self, **fields: Any) -> None:
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "stage": self.stage,
+                "progress": round(self.progress, 4),
+                "metrics": dict(self.metrics),
+                "result_id": self.result_id,
+                "error": self.error,
+                "strategy": self.params.strategy_name if self.params else None,
+                "symbol": self.params.symbol if self.params else None,
+                "interval": self.params.interval if self.params else None,
+                "jobs": len(self.batch) if self.batch is not None else 1,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "version": self.version,
+            }
+
+
+def _run_job(job_id: str, params: BacktestParams, walk_forward: Optional[WalkForwardParams],
+             data: Optional[SharedCandles], events, cancel) -> Dict[str, Any]:
+    """
+    Worker process: run one job, reporting progress (unless `events` is None,
+    as for the parts of a batch) and honouring cancellation.
+    """
+    def on_progress(done: int, total: int, metrics: Dict[str, Any]) -> None:
+        if cancel.is_set():
+            raise BacktestCancelled()
+        if events is not None:
+            events.put((job_id, done, total, metrics))
+
+    klines = data.load() if data is not None else Candles.empty()
+    if walk_forward is not None:
+        # folds run in this worker; the job pool already bounds how many jobs use the CPU
+        return run_walk_forward(params, walk_forward, klines, max_workers=1, on_progress=on_progress)
+    return run_backtest(params, klines, on_progress=on_progress)
+
+
+class BacktestJobQueue:
+    """
+    Bounded queue of backtest jobs run in a process pool (started on first
+    submit). Only jobs still waiting count toward `max_queued`; cancelling a
+    queued job frees its slot at once. `on_result` receives completed
+    backtest results, including each result of a batch; batch and
+    walk-forward reports are kept in their job's metrics. A batch takes one
+    job slot and spreads its backtests over the same pool.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, max_queued: int = MAX_QUEUED,
+                 keep_finished: int = KEEP_FINISHED,
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+        self.on_result = on_result
+        self._pending: Deque[BacktestJob] = deque()
+        self._running: Dict[str, Any] = {}  # job id -> manager cancel event
+        self._jobs: "OrderedDict[str, BacktestJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._manager = None
+        self._events = None
+
+    def _start(self) -> None:
+        # caller holds the lock
+        if self._manager is None:
+            self._manager = multiprocessing.get_context(START_METHOD).Manager()
+            self._events = self._manager.Queue()
+            threading.Thread(target=self._listen, name="backtest-job-progress", daemon=True).start()
+        if self._pool is None:
+            self._pool = process_pool(self.max_workers)
+
+    def submit(self, params: BacktestParams, walk_forward: Optional[WalkForwardParams] = None) -> BacktestJob:
+        return self._enqueue(BacktestJob(params, walk_forward))
+
+    def submit_batch(self, jobs: List[BacktestParams], include_trades: bool = False) -> BacktestJob:
+        """Queue many backtests as one job whose report is the batch_backtest report."""
+        return self._enqueue(BacktestJob(None, batch=list(jobs), include_trades=include_trades))
+
+    def _enqueue(self, job: BacktestJob) -> BacktestJob:
+        with self._lock:
+            if len(self._pending) >= self.max_queued:
+                raise QueueFull(f"{self.max_queued} backtest jobs already queued")
+            self._pending.append(job)
+            self._jobs[job.id] = job
+            self._prune()
+            self._start()
+            self._dispatch()
+        return job
+
+    def get(self, job_id: str) -> Optional[BacktestJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[BacktestJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[BacktestJob]:
+        """Request cancellation; queued jobs are removed from the queue immediately."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job.cancel_requested.set()
+            if job in self._pending:
+                self._pending.remove(job)
+                job._set(status=CANCELLED, stage="cancelled", finished_at=time.time())
+            elif job.id in self._running:
+                self._running[job.id].set()
+        return job
+
+    def shutdown(self) -> None:
+        """Cancel every job and stop the worker processes."""
+        for job in self.jobs():
+            self.cancel(job.id)
+        with self._lock:
+            pool, manager = self._pool, self._manager
+            self._pool = self._manager = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
+
+    def _prune(self) -> None:
+        finished = [j.id for j in self._jobs.values() if j.finished]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def _dispatch(self) -> None:
+        # caller holds the lock
+        while self._pending and len(self._running) < self.max_workers:
+            job = self._pending.popleft()
+            self._running[job.id] = self._manager.Event()
+            job._set(status=RUNNING, stage="loading", started_at=time.time())
+            threading.Thread(target=self._load_and_submit, args=(job,), name=f"backtest-job-load-{job.id[:8]}",
+                             daemon=True).start()
+
+    def _load_and_submit(self, job: BacktestJob) -> None:
+        """Load candles on a thread (I/O bound), then hand the backtest to the process pool."""
+        try:
+            if job.batch is not None:
+                self._submit_batch(job)
+                return
+            klines = load_backtest_candles(job.params)
+            if job.cancel_requested.is_set():
+                raise BacktestCancelled()
+            handle, shm = SharedCandles.publish(klines) if len(klines) else (None, None)
+            try:
+                with self._lock:
+                    future = self._pool.submit(_run_job, job.id, job.params, job.walk_forward, handle, self._events,
+                                               self._running[job.id])
+            except BaseException:
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+                raise
+            future.add_done_callback(lambda f: self._complete(job, f, shm))
+        except BaseException as e:
+            self._fail(job, e)
+
+    def _submit_batch(self, job: BacktestJob) -> None:
+        started = time.time()
+        handles, blocks = publish_candles(job.batch)
+        results: List[Dict[str, Any]] = [{} for _ in job.batch]
+        errors: List[BaseException] = []
+        remaining, cancelling = [len(job.batch)], [False]
+        counter = threading.Lock()
+        try:
+            if job.cancel_requested.is_set():
+                raise BacktestCancelled()
+            with self._lock:
+                futures = [self._pool.submit(_run_job, job.id, params, None, shared_data(handles, params), None,
+                                             self._running[job.id]) for params in job.batch]
+        except BaseException:
+            release(blocks)
+            raise
+
+        def part_done(k: int, future: Future) -> None:
+            try:
+                results[k] = future.result()
+            except BaseException as e:
+                results[k] = {"error": str(e) or type(e).__name__}
+                errors.append(e)
+            if job.cancel_requested.is_set():
+                with counter:
+                    first, cancelling[0] = not cancelling[0], True
+                if first:
+                    for f in futures:
+                        f.cancel()  # parts not started yet; running ones stop at their next progress callback
+            elif "id" in results[k] and self.on_result is not None:
+                try:
+                    self.on_result(results[k])
+                except Exception as e:
+                    logger.error(f"Saving batch result of job {job.id} failed: {e}")
+            with counter:
+                remaining[0] -= 1
+                left = remaining[0]
+            if left:
+                done = len(results) - left
+                job._set(stage="running", progress=done / len(results),
+                         metrics={"done": done, "jobs": len(results)})
+                return
+            release(blocks)
+            broken = next((e for e in errors if isinstance(e, BrokenProcessPool)), None)
+            if job.cancel_requested.is_set() or broken is not None:
+                self._fail(job, broken or BacktestCancelled())
+                return
+            report = batch_report(job.batch, results, started, job.include_trades)
+            job._set(status=COMPLETED, stage="completed", progress=1.0, result_id=report["id"],
+                     metrics={k: v for k, v in report.items() if k != "id"}, finished_at=time.time())
+            self._release(job)
+
+        for k, future in enumerate(futures):
+            future.add_done_callback(lambda f, k=k: part_done(k, f))
+
+    def _complete(self, job: BacktestJob, future: Future, shm) -> None:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+        try:
+            result = future.result()
+        except BaseException as e:
+            self._fail(job, e)
+            return
+        try:
+            if "error" in result:
+                job._set(status=FAILED, stage="failed", error=result["error"], finished_at=time.time())
+            else:
+                if self.on_result is not None and job.walk_forward is None:
+                    self.on_result(result)
+                job._set(status=COMPLETED, stage="completed", progress=1.0, result_id=result["id"],
+                         metrics={k: v for k, v in result.items() if k not in ("trades", "id")},
+                         finished_at=time.time())
+        except Exception as e:
+            self._fail(job, e)
+            return
+        self._release(job)
+
+    def _fail(self, job: BacktestJob, error: BaseException) -> None:
+        if isinstance(error, BacktestCancelled):
+            job._set(status=CANCELLED, stage="cancelled", finished_at=time.time())
+        else:
+            logger.error(f"Backtest job {job.id} failed: {error}")
+            job._set(status=FAILED, stage="failed", error=str(error), finished_at=time.time())
+        self._release(job, broken=isinstance(error, BrokenProcessPool))
+
+    def _release(self, job: BacktestJob, broken: bool = False) -> None:
+        with self._lock:
+            self._running.pop(job.id, None)
+            if broken:
+                self._pool = None  # a worker died; start a fresh pool for the next job
+            if self._pending:
+                self._start()
+                self._dispatch()
+
+    def _listen(self) -> None:
+        """Apply progress reported by worker processes to the tracked jobs."""
+        while True:
+            try:
+                job_id, done, total, metrics = self._events.get()
+            except Exception:
+                return  # manager shut down
+            job = self.get(job_id)
+            if job is not None and job.status == RUNNING and not job.cancel_requested.is_set():
+                job._set(stage="running", progress=done / total if total else 1.0, metrics=metrics)
@@ -0,0 +1,179 @@
+"""
+Backtest result store.
+
+Run summaries are appended to an SQLite table indexed by strategy, symbol,
+interval and created_at, so listing and filtering are index scans that
+never read trades. Each run's trades are written once, column by column,
+to ``trades/<id>.npz`` next to the database and only loaded when a full
+result is requested. Scalar columns keep their numpy dtype; columns holding
+dicts, lists or missing values are stored as JSON strings.
+
+Per-run JSON files from the previous layout are imported the first time the
+database is created.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "results.sqlite3"
+
+SUMMARY_COLUMNS = ("id", "strategy", "symbol", "interval", "created_at", "executed", "wins",
+                   "win_rate", "pnl_abs", "pnl_pct")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    strategy TEXT,
+    symbol TEXT,
+    interval TEXT,
+    created_at INTEGER NOT NULL,
+    executed INTEGER,
+    wins INTEGER,
+    win_rate REAL,
+    pnl_abs REAL,
+    pnl_pct REAL,
+    trade_count INTEGER,
+    summary TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_strategy ON runs (strategy, created_at);
+CREATE INDEX IF NOT EXISTS runs_symbol ON runs (symbol, created_at);
+CREATE INDEX IF NOT EXISTS runs_interval ON runs (interval, created_at);
+CREATE INDEX IF NOT EXISTS runs_created_at ON runs (created_at);
+"""
+
+
+def _kind(value: Any) -> type:
+    if isinstance(value, bool):
+        return bool
+    if isinstance(value, (int, float)):
+        return float
+    return str if isinstance(value, str) else object
+
+
+def _trade_columns(trades: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    names: List[str] = []
+    for trade in trades:
+        names.extend(k for k in trade if k not in names)
+    columns, json_columns = {}, []
+    for name in names:
+        values = [trade.get(name) for trade in trades]
+        kinds = {_kind(v) for v in values}
+        arr = np.asarray(values) if len(kinds) == 1 and object not in kinds else None
+        if arr is None or arr.dtype == object:
+            arr = np.asarray([json.dumps(v, default=str) for v in values])
+            json_columns.append(name)
+        columns[name] = arr
+    columns["__columns__"] = np.asarray(names, dtype=str)
+    columns["__json__"] = np.asarray(json_columns, dtype=str)
+    return columns
+
+
+def _trades_from_columns(data: Any) -> List[Dict[str, Any]]:
+    names = data["__columns__"].tolist()
+    as_json = set(data["__json__"].tolist())
+    cols = [[json.loads(v) for v in data[n].tolist()] if n in as_json else data[n].tolist() for n in names]
+    return [dict(zip(names, row)) for row in zip(*cols)]
+
+
+class BacktestStore:
+    """Append-only run summaries in SQLite with columnar per-run trade files."""
+
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+        self.trades_dir = self.root / "trades"
+        self.trades_dir.mkdir(parents=True, exist_ok=True)
+        db_path = self.root / DB_NAME
+        created = not db_path.exists()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        if created:
+            self.import_json_dir(self.root)
+
+    def _trades_path(self, result_id: str) -> Path:
+        return self.trades_dir / f"{result_id}.npz"
+
+    def save(self, result: Dict[str, Any]) -> str:
+        """Append one run (a run_backtest result with an id); trades are written before the summary row."""
+        result_id = str(result["id"])
+        trades = result.get("trades") or []
+        summary = {k: v for k, v in result.items() if k != "trades"}
+        if trades:
+            tmp = self.trades_dir / f"{result_id}.tmp.npz"
+            np.savez(tmp, **_trade_columns(trades))
+            os.replace(tmp, self._trades_path(result_id))
+        created_at = int(result.get("ts") or result.get("timestamp") or time.time())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (result_id, result.get("strategy"), result.get("symbol"), result.get("interval"), created_at,
+                 int(result.get("executed", 0)), int(result.get("wins", 0)), float(result.get("win_rate", 0.0)),
+                 float(result.get("pnl_abs", 0.0)), float(result.get("pnl_pct", 0.0)), len(trades),
+                 json.dumps(summary, default=str)))
+        return result_id
+
+    def list(self, strategy: Optional[str] = None, symbol: Optional[str] = None,
+             interval: Optional[str] = None, since: Optional[int] = None, until: Optional[int] = None,
+             limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """Summaries newest first, filtered on the indexed columns only."""
+        where, args = [], []
+        for column, value in (("strategy", strategy), ("symbol", symbol), ("interval", interval)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        if since is not None:
+            where.append("created_at >= ?")
+            args.append(int(since))
+        if until is not None:
+            where.append("created_at <= ?")
+            args.append(int(until))
+        sql = f"SELECT {', '.join(SUMMARY_COLUMNS)}, trade_count FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._conn.execute(sql, (*args, int(limit), int(offset))).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, result_id: str, include_trades: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT summary FROM runs WHERE id = ?", (result_id,)).fetchone()
+        if row is None:
+            return None
+        result = json.loads(row["summary"])
+        if include_trades:
+            path = self._trades_path(result_id)
+            if path.exists():
+                with np.load(path, allow_pickle=False) as data:
+                    result["trades"] = _trades_from_columns(data)
+            else:
+                result["trades"] = []
+        return result
+
+    def import_json_dir(self, directory: Path | str) -> int:
+        """Import per-run <id>.json result files; returns the number imported."""
+        imported = 0
+        for path in sorted(Path(directory).glob("*.json")):
+            try:
+                with path.open("r") as f:
+                    result = json.load(f)
+                if result.get("id"):
+                    self.save(result)
+                    imported += 1
+            except Exception as e:
+                logger.warning(f"Skipping backtest result {path.name}: {e}")
+        if imported:
+            logger.info(f"Imported {imported} backtest results from {directory}")
+        return imported
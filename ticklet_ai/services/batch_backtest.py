@@ -0,0 +1,177 @@
+"""
+Batch backtests.
+
+Runs many (symbol, interval, strategy, params) jobs across a process pool.
+Candles are fetched once per (symbol, interval, range) in the parent and
+published as KLINE_DTYPE record arrays in shared memory; workers attach to
+the block by name instead of receiving pickled candles. Per-job results are
+gathered into one report.
+"""
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ticklet_ai.services.backtest import BacktestParams, load_backtest_candles, run_backtest
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.kline_decoder import KLINE_DTYPE
+
+DEFAULT_WORKERS = int(os.getenv("TICKLET_BACKTEST_WORKERS", str(os.cpu_count() or 2)))
+FETCH_WORKERS = int(os.getenv("TICKLET_BACKTEST_FETCH_WORKERS", "4"))
+# forkserver: workers are not forked from a server process running scheduler/stream threads
+START_METHOD = os.getenv("TICKLET_BACKTEST_START_METHOD", "forkserver")
+
+DataKey = Tuple[str, str, Optional[int], Optional[int]]
+
+
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Process pool for CPU-bound backtest work, started with START_METHOD."""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(START_METHOD))
+
+
+@dataclass(frozen=True)
+class SharedCandles:
+    """Picklable handle to a candle record array held in a shared memory block."""
+    name: str
+    length: int
+
+    @classmethod
+    def publish(cls, candles: Candles) -> Tuple["SharedCandles", shared_memory.SharedMemory]:
+        """Copy candles into a new block; the caller owns it and must close and unlink it."""
+        rows = candles.to_records()
+        shm = shared_memory.SharedMemory(create=True, size=max(rows.nbytes, 1))
+        np.ndarray(rows.shape, dtype=KLINE_DTYPE, buffer=shm.buf)[:] = rows
+        return cls(shm.name, len(rows)), shm
+
+    def load(self) -> Candles:
+        try:
+            shm = shared_memory.SharedMemory(name=self.name, track=False)
+        except TypeError:
+            # Python < 3.13 has no track flag: attaching registers the block with this
+            # process's resource tracker, which would unlink it again (and warn) at exit
+            shm = shared_memory.SharedMemory(name=self.name)
+            resource_tracker.unregister(shm._name, "shared_memory")
+        try:
+            rows = np.ndarray((self.length,), dtype=KLINE_DTYPE, buffer=shm.buf)
+            candles = Candles.from_records(rows)  # contiguous columns, detached from the block
+            del rows
+        finally:
+            shm.close()
+        return candles
+
+
+def expand_jobs(symbols: Iterable[str], intervals: Iterable[str], strategies: Iterable[str],
+                **params: Any) -> List[BacktestParams]:
+    """Every strategy x symbol x interval combination with the same run parameters."""
+    return [BacktestParams(strategy_name=strategy, symbol=symbol, interval=interval, **params)
+            for strategy in strategies for symbol in symbols for interval in intervals]
+
+
+def _data_key(job: BacktestParams) -> DataKey:
+    return (job.symbol.upper(), job.interval, job.start_time, job.end_time)
+
+
+def _run_job(job: BacktestParams, data: Optional[SharedCandles]) -> Dict[str, Any]:
+    klines = data.load() if data is not None else Candles.empty()
+    return run_backtest(job, klines)
+
+
+def publish_candles(jobs: List[BacktestParams]) -> Tuple[Dict[DataKey, SharedCandles],
+                                                          List[shared_memory.SharedMemory]]:
+    """
+    Fetch each distinct (symbol, interval, range) once and publish it to
+    shared memory. Returns the handle per data key (see `shared_data`) and
+    the blocks, which the caller must pass to `release`.
+    """
+    first_job: Dict[DataKey, BacktestParams] = {}
+    for job in jobs:
+        first_job.setdefault(_data_key(job), job)
+
+    # Candle fetching is I/O bound: threads here, CPU-bound backtests in processes
+    with ThreadPoolExecutor(max_workers=max(1, min(FETCH_WORKERS, len(first_job) or 1))) as pool:
+        loaded = dict(zip(first_job, pool.map(load_backtest_candles, first_job.values())))
+
+    handles: Dict[DataKey, SharedCandles] = {}
+    blocks: List[shared_memory.SharedMemory] = []
+    try:
+        for key, candles in loaded.items():
+            if len(candles):
+                handles[key], shm = SharedCandles.publish(candles)
+                blocks.append(shm)
+    except BaseException:
+        release(blocks)
+        raise
+    return handles, blocks
+
+
+def shared_data(handles: Dict[DataKey, SharedCandles], job: BacktestParams) -> Optional[SharedCandles]:
+    return handles.get(_data_key(job))
+
+
+def release(blocks: Iterable[shared_memory.SharedMemory]) -> None:
+    for shm in blocks:
+        shm.close()
+        shm.unlink()
+
+
+def _summary(job: BacktestParams, result: Dict[str, Any], include_trades: bool) -> Dict[str, Any]:
+    row = {"strategy": job.strategy_name, "symbol": job.symbol, "interval": job.interval}
+    row.update({k: v for k, v in result.items() if include_trades or k != "trades"})
+    row["trade_count"] = len(result.get("trades", []))
+    return row
+
+
+def batch_report(jobs: List[BacktestParams], results: List[Dict[str, Any]], started: float,
+                 include_trades: bool = False) -> Dict[str, Any]:
+    """One report over the per-job results (a result with an "error" counts as failed)."""
+    ok = [r for r in results if "error" not in r]
+    executed = sum(r.get("executed", 0) for r in ok)
+    wins = sum(r.get("wins", 0) for r in ok)
+    return {
+        "id": str(uuid.uuid4()),
+        "jobs": len(jobs),
+        "completed": len(ok),
+        "failed": len(jobs) - len(ok),
+        "executed": executed,
+        "wins": wins,
+        "win_rate": (wins / executed) if executed > 0 else 0.0,
+        "pnl_abs": round(sum(r.get("pnl_abs", 0.0) for r in ok), 2),
+        "duration_s": round(time.time() - started, 2),
+        "results": [_summary(job, result, include_trades) for job, result in zip(jobs, results)],
+        "timestamp": int(time.time()),
+    }
+
+
+def run_batch(jobs: Iterable[BacktestParams], max_workers: Optional[int] = None, include_trades: bool = False,
+              on_result: Optional[Callable[[BacktestParams, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Run backtest jobs in a process pool and return one report. `on_result` is
+    called in this process with each full result as its job finishes.
+    `max_workers` is capped at DEFAULT_WORKERS.
+    """
+    jobs = list(jobs)
+    started = time.time()
+    handles, blocks = publish_candles(jobs)
+    results: List[Dict[str, Any]] = [{} for _ in jobs]
+    try:
+        workers = max(1, min(max_workers or DEFAULT_WORKERS, DEFAULT_WORKERS, len(jobs) or 1))
+        with process_pool(workers) as pool:
+            futures = {pool.submit(_run_job, job, shared_data(handles, job)): k for k, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                k = futures[future]
+                try:
+                    results[k] = future.result()
+                except Exception as e:
+                    print(f"Batch backtest job failed ({jobs[k].strategy_name} {jobs[k].symbol} {jobs[k].interval}): {e}")
+                    results[k] = {"error": str(e)}
+                if on_result is not None:
+                    on_result(jobs[k], results[k])
+    finally:
+        release(blocks)
+    return batch_report(jobs, results, started, include_trades)
@@ -0,0 +1,184 @@
+"""
+Central request scheduler for Binance REST calls.
+
+Every Binance request is budgeted against a token bucket sized to the
+account's request-weight limit. Waiters are served in priority order, the
+bucket is re-synced from ``X-MBX-USED-WEIGHT-1M`` response headers, and
+429/418 responses pause all traffic until ``Retry-After`` has elapsed.
+
+Blocking (thread) and asyncio waiters queue in separate lines that share the
+bucket. A sync caller running on an event-loop thread must never wait behind
+a coroutine that needs that same loop to make progress.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Mapping, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+BINANCE_API_BASE = "https://api.binance.com/api/v3"
+
+PRIORITY_HIGH = 0     # live signal scans
+PRIORITY_NORMAL = 5   # API routes, analyzers
+PRIORITY_LOW = 10     # backtests and history backfills
+
+
+def endpoint_weight(path: str, params: Optional[Mapping[str, Any]] = None) -> int:
+    """Request weight of a Binance spot endpoint (see Binance API docs)."""
+    params = params or {}
+    path = path.rstrip("/").rsplit("/api/v3", 1)[-1]
+    if path == "/klines":
+        return 2
+    if path == "/ticker/24hr":
+        return 2 if params.get("symbol") else 80
+    if path == "/ticker/price":
+        return 2 if params.get("symbol") else 4
+    if path == "/exchangeInfo":
+        return 20
+    return 1
+
+
+class WeightScheduler:
+    """Priority-ordered token bucket over Binance request weight."""
+
+    def __init__(self, weight_limit: int = 6000, window_sec: float = 60.0, safety: float = 0.9):
+        self.capacity = float(weight_limit) * safety
+        self.weight_limit = weight_limit
+        self.refill_per_sec = self.capacity / window_sec
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._waiters: list = []        # blocking callers
+        self._async_waiters: list = []  # coroutines
+        self._seq = itertools.count()
+
+    # -- bucket bookkeeping (caller holds the lock) --
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+        self._updated = now
+
+    def _try_take(self, line: list, ticket: tuple, weight: int) -> float:
+        """Grant `weight` to `ticket` if it is at the head of its line; else return seconds to wait."""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self._paused_until:
+            return self._paused_until - now
+        if line[0] != ticket:
+            return 0.05
+        weight = min(weight, self.capacity)
+        if self._tokens >= weight:
+            self._tokens -= weight
+            heapq.heappop(line)
+            return 0.0
+        return (weight - self._tokens) / self.refill_per_sec
+
+    def _enqueue(self, line: list, priority: int) -> tuple:
+        ticket = (priority, next(self._seq))
+        heapq.heappush(line, ticket)
+        return ticket
+
+    def _abandon(self, line: list, ticket: tuple) -> None:
+        if ticket in line:
+            line.remove(ticket)
+            heapq.heapify(line)
+
+    # -- public API --
+    def acquire(self, weight: int, priority: int = PRIORITY_NORMAL) -> None:
+        """Block the calling thread until `weight` can be spent."""
+        with self._cond:
+            ticket = self._enqueue(self._waiters, priority)
+            try:
+                while True:
+                    wait = self._try_take(self._waiters, ticket, weight)
+                    if wait <= 0:
+                        self._cond.notify_all()
+                        return
+                    self._cond.wait(timeout=min(wait, 1.0))
+            except BaseException:
+                self._abandon(self._waiters, ticket)
+                self._cond.notify_all()
+                raise
+
+    async def acquire_async(self, weight: int, priority: int = PRIORITY_NORMAL) -> None:
+        """Await until `weight` can be spent without blocking the event loop."""
+        with self._lock:
+            ticket = self._enqueue(self._async_waiters, priority)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_take(self._async_waiters, ticket, weight)
+                    if wait <= 0:
+                        self._cond.notify_all()
+                        return
+                await asyncio.sleep(min(wait, 1.0))
+        except BaseException:
+            with self._cond:
+                self._abandon(self._async_waiters, ticket)
+                self._cond.notify_all()
+            raise
+
+    def observe(self, headers: Mapping[str, str], status: int = 200) -> None:
+        """Sync the bucket with the exchange's view of used weight and honour bans."""
+        used = headers.get("X-MBX-USED-WEIGHT-1M") or headers.get("X-MBX-USED-WEIGHT")
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            if used is not None:
+                try:
+                    remaining = self.capacity - float(used)
+                    self._tokens = min(self._tokens, remaining)
+                except ValueError:
+                    pass
+            if status in (418, 429):
+                try:
+                    retry_after = float(headers.get("Retry-After") or 60)
+                except ValueError:
+                    retry_after = 60.0
+                self._paused_until = max(self._paused_until, now + retry_after)
+                logger.warning(f"Binance returned {status}; pausing requests for {retry_after:.0f}s")
+            self._cond.notify_all()
+
+    @contextmanager
+    def throttle(self, weight: int, priority: int = PRIORITY_NORMAL):
+        self.acquire(weight, priority)
+        yield self
+
+    @asynccontextmanager
+    async def throttle_async(self, weight: int, priority: int = PRIORITY_NORMAL):
+        await self.acquire_async(weight, priority)
+        yield self
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "tokens": round(self._tokens, 1),
+                "capacity": self.capacity,
+                "queued": len(self._waiters) + len(self._async_waiters),
+                "paused_for_sec": max(0.0, round(self._paused_until - time.monotonic(), 1)),
+            }
+
+
+scheduler = WeightScheduler(
+    weight_limit=int(os.getenv("TICKLET_BINANCE_WEIGHT_LIMIT", "6000")),
+    safety=float(os.getenv("TICKLET_BINANCE_WEIGHT_SAFETY", "0.9")),
+)
+
+
+def binance_get(path: str, params: Optional[Dict[str, Any]] = None, priority: int = PRIORITY_NORMAL,
+                timeout: float = 10, base: str = BINANCE_API_BASE) -> requests.Response:
+    """Scheduled ``requests.get`` against ``{base}{path}``; the caller handles status codes."""
+    scheduler.acquire(endpoint_weight(path, params), priority)
+    response = requests.get(f"{base}{path}", params=params, timeout=timeout)
+    scheduler.observe(response.headers, response.status_code)
+    return response
@@ -0,0 +1,237 @@
+"""
+Local OHLCV candle store.
+
+One append-only binary file per (symbol, interval) holding closed candles as
+fixed-width numpy records, read back through ``np.memmap``. ``load_klines``
+serves requests from the store first and only asks the exchange for the
+missing tail or for ranges the store cannot cover.
+
+Writers in different processes (API workers, the scheduler, batch backtests)
+are serialised by an exclusive ``flock`` on a ``<file>.lock`` sidecar.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: only writers within one process are serialised
+    fcntl = None
+
+import numpy as np
+
+from ticklet_ai.services.kline_decoder import KLINE_DTYPE, rows_to_records
+from ticklet_ai.utils.paths import CANDLES_DIR
+
+logger = logging.getLogger(__name__)
+
+# Only epoch-aligned, fixed-length intervals are stored (3d/1w/1M bypass the store)
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000,
+    "8h": 28_800_000, "12h": 43_200_000, "1d": 86_400_000,
+}
+
+MAX_PAGE = 1000  # Binance klines page size
+
+# Returns raw kline arrays or an already-decoded KLINE_DTYPE record array
+RawFetcher = Callable[[str, str, int, Optional[int], Optional[int]], List[list] | np.ndarray]
+
+
+def store_enabled() -> bool:
+    return os.getenv("TICKLET_CANDLE_STORE_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+
+
+def raw_to_records(raw_klines) -> np.ndarray:
+    """Normalise a fetcher result (decoded records or raw kline arrays) to KLINE_DTYPE."""
+    return rows_to_records(raw_klines)
+
+
+class CandleStore:
+    """Append-only, memory-mapped per-(symbol, interval) candle files."""
+
+    def __init__(self, root: Path | str = CANDLES_DIR):
+        self.root = Path(root)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _path(self, symbol: str, interval: str) -> Path:
+        return self.root / f"{symbol.upper()}_{interval}.bin"
+
+    def _lock(self, path: Path) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(str(path), threading.Lock())
+
+    @contextmanager
+    def _write_lock(self, path: Path) -> Iterator[None]:
+        """Hold the per-file lock across threads and, where supported, across processes."""
+        with self._lock(path):
+            self.root.mkdir(parents=True, exist_ok=True)
+            if fcntl is None:
+                yield
+                return
+            with path.with_suffix(".lock").open("a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)  # released when the file is closed
+                yield
+
+    def read(self, symbol: str, interval: str,
+             start_time: Optional[int] = None, end_time: Optional[int] = None) -> np.ndarray:
+        """Return stored candles with start_time <= time <= end_time (memmap view)."""
+        path = self._path(symbol, interval)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        count = size // KLINE_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        rows = np.memmap(path, dtype=KLINE_DTYPE, mode="r", shape=(count,))
+        times = rows["time"]
+        lo = 0 if start_time is None else int(np.searchsorted(times, start_time, side="left"))
+        hi = count if end_time is None else int(np.searchsorted(times, end_time, side="right"))
+        return rows[lo:hi]
+
+    def last_time(self, symbol: str, interval: str) -> Optional[int]:
+        rows = self.read(symbol, interval)
+        return int(rows["time"][-1]) if len(rows) else None
+
+    def write(self, symbol: str, interval: str, rows: np.ndarray) -> int:
+        """
+        Persist candles. Rows newer than the stored tail are appended in place;
+        older rows are looked up by binary search on the memmap, and only
+        candles missing from the file trigger an atomic merge rewrite. The
+        read-merge-write runs under the file's write lock.
+        Returns the number of new candles stored.
+        """
+        if rows is None or len(rows) == 0:
+            return 0
+        rows = dedupe_records(np.asarray(rows, dtype=KLINE_DTYPE))
+        path = self._path(symbol, interval)
+        with self._write_lock(path):
+            stored = self.read(symbol, interval)
+            if len(stored):
+                tail = int(stored["time"][-1])
+                split = int(np.searchsorted(rows["time"], tail, side="right"))
+                older, rows = rows[:split], rows[split:]
+                if len(older):
+                    times = stored["time"]
+                    pos = np.minimum(np.searchsorted(times, older["time"]), len(times) - 1)
+                    missing = older[times[pos] != older["time"]]
+                    if len(missing):
+                        return self._merge(path, stored, np.concatenate([missing, rows]))
+            if len(rows):
+                with path.open("ab") as f:
+                    f.write(rows.tobytes())
+            return len(rows)
+
+    def _merge(self, path: Path, stored: np.ndarray, rows: np.ndarray) -> int:
+        """Rewrite the file with `rows` merged in; only needed to fill gaps before the tail."""
+        merged = dedupe_records(np.concatenate([np.array(stored), rows]))
+        added = len(merged) - len(stored)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            f.write(merged.tobytes())
+        os.replace(tmp, path)
+        return added
+
+def dedupe_records(rows: np.ndarray) -> np.ndarray:
+    """Sort by open time and keep the first occurrence of each candle."""
+    rows = np.sort(rows, order="time", kind="stable")
+    _, idx = np.unique(rows["time"], return_index=True)
+    return rows[idx]
+
+
+def _is_contiguous(rows: np.ndarray, step: int) -> bool:
+    return len(rows) < 2 or bool(np.all(np.diff(rows["time"]) == step))
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+_default_store: Optional[CandleStore] = None
+
+
+def get_store() -> CandleStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = CandleStore()
+    return _default_store
+
+
+def load_klines(fetch_raw: RawFetcher, symbol: str, interval: str, limit: int = 1000,
+                start_time: Optional[int] = None, end_time: Optional[int] = None,
+                store: Optional[CandleStore] = None, persist: bool = True) -> np.ndarray:
+    """
+    Store-first kline loader with Binance ``/klines`` semantics.
+
+    ``fetch_raw(symbol, interval, limit, start_time, end_time)`` must return the
+    raw exchange arrays; it is only called for what the store cannot serve.
+    Closed candles from every fetch are written back to the store unless
+    `persist` is false (callers writing many pages at once persist them together).
+    """
+    limit = max(1, min(int(limit), MAX_PAGE))
+    step = INTERVAL_MS.get(interval)
+    if step is None or not store_enabled():
+        return raw_to_records(fetch_raw(symbol, interval, limit, start_time, end_time))
+
+    store = store or get_store()
+    now = _now_ms()
+
+    if start_time is None and end_time is None:
+        return _load_latest(fetch_raw, store, symbol, interval, limit, step, now)
+
+    if start_time is not None:
+        first = -(-int(start_time) // step) * step
+        last = first + (limit - 1) * step
+        if end_time is not None:
+            last = min(last, (int(end_time) // step) * step)
+    else:
+        last = (int(end_time) // step) * step
+        first = last - (limit - 1) * step
+
+    # Only windows made entirely of closed candles can be served locally
+    if first <= last and last + step <= now:
+        cached = store.read(symbol, interval, first, last)
+        expected = (last - first) // step + 1
+        if len(cached) == expected and cached["time"][0] == first and _is_contiguous(cached, step):
+            return np.array(cached)
+
+    fetched = raw_to_records(fetch_raw(symbol, interval, limit, start_time, end_time))
+    if persist:
+        _persist_closed(store, symbol, interval, fetched, now)
+    return fetched
+
+
+def _load_latest(fetch_raw: RawFetcher, store: CandleStore, symbol: str, interval: str,
+                 limit: int, step: int, now: int) -> np.ndarray:
+    last_stored = store.last_time(symbol, interval)
+    if last_stored is not None and (now - last_stored) // step < MAX_PAGE:
+        tail = raw_to_records(fetch_raw(symbol, interval, MAX_PAGE, last_stored + step, None))
+        if len(tail):
+            _persist_closed(store, symbol, interval, tail, now)
+            newest = int(tail["time"][-1])
+            live = tail[tail["close_time"] >= now]
+            closed_end = int(live["time"][0]) - 1 if len(live) else newest
+            closed = store.read(symbol, interval, newest - (limit - 1) * step, closed_end)
+            result = np.concatenate([np.array(closed), live])
+            if len(result) == limit and _is_contiguous(result, step):
+                return result
+
+    fetched = raw_to_records(fetch_raw(symbol, interval, limit, None, None))
+    _persist_closed(store, symbol, interval, fetched, now)
+    return fetched
+
+
+def _persist_closed(store: CandleStore, symbol: str, interval: str, rows: np.ndarray, now: int) -> None:
+    closed = rows[rows["close_time"] < now] if len(rows) else rows
+    if not len(closed):
+        return
+    try:
+        store.write(symbol, interval, closed)
+    except Exception as e:
+        logger.warning(f"Candle store write failed for {symbol} {interval}: {e}")
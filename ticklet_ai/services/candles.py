@@ -0,0 +1,108 @@
+"""
+Array-backed candle container.
+
+``Candles`` holds OHLCV data as contiguous numpy columns (float64 prices and
+volumes, int64 times and counts). Column access and slicing are zero-copy
+views. Integer indexing and iteration still yield kline dicts, so callers
+written against the old list-of-dict ``get_klines`` result keep working.
+"""
+from typing import Any, Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from ticklet_ai.services.kline_decoder import KLINE_DTYPE, rows_to_records
+
+COLUMNS = KLINE_DTYPE.names
+INT_COLUMNS = ("time", "close_time", "trades_count")
+
+
+class Candles:
+    """Struct of contiguous numpy arrays, one per kline field."""
+
+    __slots__ = COLUMNS
+
+    def __init__(self, **columns: np.ndarray):
+        n = None
+        for name in COLUMNS:
+            dtype = np.int64 if name in INT_COLUMNS else np.float64
+            col = columns.get(name)
+            if col is None:
+                col = np.zeros(0 if n is None else n, dtype=dtype)
+            col = np.asarray(col, dtype=dtype)
+            if n is None:
+                n = len(col)
+            elif len(col) != n:
+                raise ValueError(f"column {name} has {len(col)} rows, expected {n}")
+            setattr(self, name, col)
+
+    # -- constructors --
+    @classmethod
+    def empty(cls) -> "Candles":
+        return cls()
+
+    @classmethod
+    def from_records(cls, rows: np.ndarray) -> "Candles":
+        """Copy a KLINE_DTYPE record array into contiguous columns."""
+        return cls(**{name: np.ascontiguousarray(rows[name]) for name in COLUMNS})
+
+    @classmethod
+    def from_raw(cls, raw_klines: Sequence[Sequence[Any]]) -> "Candles":
+        """Build from Binance REST arrays ([open_time, open, high, low, close, volume, close_time, ...])."""
+        return cls.from_records(rows_to_records(raw_klines))
+
+    @classmethod
+    def from_dicts(cls, klines: Sequence[Dict[str, Any]]) -> "Candles":
+        return cls(**{name: [k.get(name, 0) for k in klines] for name in COLUMNS})
+
+    @classmethod
+    def coerce(cls, candles: Any) -> "Candles":
+        """Accept a Candles, a record array, Binance kline arrays or a list of kline dicts."""
+        if isinstance(candles, Candles):
+            return candles
+        if isinstance(candles, np.ndarray) and candles.dtype.names:
+            return cls.from_records(candles)
+        candles = list(candles or [])
+        if candles and isinstance(candles[0], (list, tuple)):
+            return cls.from_raw(candles)
+        return cls.from_dicts(candles)
+
+    # -- array access --
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def column(self, name: str) -> np.ndarray:
+        return getattr(self, name)
+
+    def to_records(self) -> np.ndarray:
+        out = np.empty(len(self), dtype=KLINE_DTYPE)
+        for name in COLUMNS:
+            out[name] = getattr(self, name)
+        return out
+
+    # -- dict-compatible adapter --
+    def row(self, i: int) -> Dict[str, Any]:
+        return {name: getattr(self, name)[i].item() for name in COLUMNS}
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return Candles(**{name: getattr(self, name)[key] for name in COLUMNS})
+        if isinstance(key, str):
+            return getattr(self, key)
+        return self.row(int(key))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.to_dicts())
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        cols = [getattr(self, name).tolist() for name in COLUMNS]
+        return [dict(zip(COLUMNS, vals)) for vals in zip(*cols)]
+
+    def tail(self, n: int) -> "Candles":
+        return self[-n:] if n else self[0:0]
+
+    def __repr__(self) -> str:
+        span = f" {self.time[0]}..{self.time[-1]}" if len(self) else ""
+        return f"Candles({len(self)} rows{span})"
@@ -2,16 +2,23 @@
 Data sources for fetching live market data from exchanges
 """
 import logging
-import requests
+from ticklet_ai.services.binance_scheduler import binance_get
+import numpy as np
 from typing import List, Dict, Any
+from ticklet_ai.services.candle_store import load_klines
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.kline_stream import kline_stream
+from ticklet_ai.services.market_data import fetch_raw_klines
+from ticklet_ai.services.ticker_snapshot import ticker_snapshot
 
 logger = logging.getLogger(__name__)
 
 BINANCE_BASE = "https://api.binance.com/api/v3"
 
-def get_klines_from_exchange(symbol: str, interval: str = "1h", limit: int = 100) -> List[Dict[str, Any]]:
+def get_klines_from_exchange(symbol: str, interval: str = "1h", limit: int = 100) -> Candles:
     """
-    Fetch klines (candlestick data) from Binance API
+    Fetch klines (candlestick data), served from the live kline stream or the
+    local candle store where possible
     
     Args:
         symbol: Trading pair symbol (e.g., "BTCUSDT")
@@ -19,41 +26,18 @@ def get_klines_from_exchange(symbol: str, interval: str = "1h", limit: int = 100
         limit: Number of candles to fetch
         
     Returns:
-        List of candle dictionaries with OHLCV data
+        Array-backed Candles with OHLCV columns (iterates as candle dictionaries)
     """
+    streamed = kline_stream.get_klines(symbol, interval, limit)
+    if streamed is not None:
+        return streamed
     try:
-        url = f"{BINANCE_BASE}/klines"
-        params = {
-            "symbol": symbol,
-            "interval": interval,
-            "limit": min(limit, 1000)  # Binance max
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        raw_klines = response.json()
-        
-        # Convert to standardized format
-        klines = []
-        for k in raw_klines:
-            klines.append({
-                "time": int(k[0]),
-                "open": float(k[1]),
-                "high": float(k[2]),
-                "low": float(k[3]),
-                "close": float(k[4]),
-                "volume": float(k[5]),
-                "close_time": int(k[6]),
-                "quote_volume": float(k[7]),
-                "trades_count": int(k[8])
-            })
-            
-        return klines
+        rows = load_klines(fetch_raw_klines, symbol, interval, limit)
+        return Candles.from_records(rows)
         
     except Exception as e:
         logger.error(f"Error fetching klines for {symbol}: {e}")
-        return []
+        return Candles.empty()
 
 def get_ticker_24hr(symbol: str = None) -> Dict[str, Any] | List[Dict[str, Any]]:
     """
@@ -65,11 +49,15 @@ def get_ticker_24hr(symbol: str = None) -> Dict[str, Any] | List[Dict[str, Any]]
     Returns:
         Ticker data dictionary or list of ticker dictionaries
     """
+    if symbol is None:
+        return ticker_snapshot.get_all()
+    cached = ticker_snapshot.get(symbol)
+    if cached is not None:
+        return cached
     try:
-        url = f"{BINANCE_BASE}/ticker/24hr"
         params = {"symbol": symbol} if symbol else {}
         
-        response = requests.get(url, params=params, timeout=10)
+        response = binance_get("/ticker/24hr", params)
         response.raise_for_status()
         
         return response.json()
@@ -89,10 +77,9 @@ def get_current_price(symbol: str) -> float:
         Current price as float, or 0.0 on error
     """
     try:
-        url = f"{BINANCE_BASE}/ticker/price"
         params = {"symbol": symbol}
         
-        response = requests.get(url, params=params, timeout=10)
+        response = binance_get("/ticker/price", params)
         response.raise_for_status()
         
         data = response.json()
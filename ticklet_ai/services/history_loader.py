@@ -0,0 +1,117 @@
+"""
+Long-range kline history for backtests.
+
+Splits [start_time, end_time] into 1000-candle pages, fetches them through the
+candle store with a bounded thread pool, then stitches and de-duplicates the
+result into one time-ordered record array. Failed pages are retried with
+backoff; a page that still fails raises HistoryGapError instead of leaving a
+hole in the history. Closed candles are written to the store once, after
+stitching, rather than page by page.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional
+
+import numpy as np
+
+from ticklet_ai.services.candle_store import (
+    INTERVAL_MS, KLINE_DTYPE, MAX_PAGE, RawFetcher, _now_ms, _persist_closed, dedupe_records, get_store,
+    load_klines, store_enabled,
+)
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.binance_scheduler import PRIORITY_LOW
+from ticklet_ai.services.market_data import fetch_raw_klines
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv("TICKLET_HISTORY_WORKERS", "4"))
+PAGE_RETRIES = int(os.getenv("TICKLET_HISTORY_RETRIES", "3"))
+RETRY_BACKOFF = 0.5  # seconds, doubled per attempt
+
+
+class HistoryGapError(RuntimeError):
+    """Raised when history pages still fail after retries; `missing` lists their (start, end) ranges."""
+
+    def __init__(self, symbol: str, interval: str, missing: List[tuple]):
+        self.missing = missing
+        super().__init__(f"{len(missing)} history page(s) failed for {symbol} {interval}: {missing}")
+
+
+def page_ranges(start_time: int, end_time: int, step: int, page: int = MAX_PAGE) -> List[tuple]:
+    """Split [start_time, end_time] into (page_start, page_end) windows of at most `page` candles."""
+    first = -(-int(start_time) // step) * step
+    span = page * step
+    return [(t, min(t + span - 1, int(end_time))) for t in range(first, int(end_time) + 1, span)]
+
+
+def load_history(fetch_raw: RawFetcher, symbol: str, interval: str, start_time: int,
+                 end_time: Optional[int] = None, max_workers: int = DEFAULT_WORKERS) -> np.ndarray:
+    """Fetch every candle in [start_time, end_time] as a single de-duplicated record array."""
+    end_time = int(end_time) if end_time is not None else int(time.time() * 1000)
+    step = INTERVAL_MS.get(interval)
+    if step is None:
+        return _load_serial(fetch_raw, symbol, interval, int(start_time), end_time)
+
+    pages = page_ranges(start_time, end_time, step)
+    if not pages:
+        return np.empty(0, dtype=KLINE_DTYPE)
+
+    def fetch_page(rng):
+        for attempt in range(PAGE_RETRIES + 1):
+            try:
+                return load_klines(fetch_raw, symbol, interval, MAX_PAGE, rng[0], rng[1], persist=False)
+            except Exception as e:
+                logger.warning(f"History page {rng} failed for {symbol} {interval} "
+                               f"(attempt {attempt + 1}/{PAGE_RETRIES + 1}): {e}")
+                if attempt < PAGE_RETRIES:
+                    time.sleep(RETRY_BACKOFF * 2 ** attempt)
+        return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pages)))) as pool:
+        chunks = list(pool.map(fetch_page, pages))
+
+    missing = [rng for rng, chunk in zip(pages, chunks) if chunk is None]
+    if missing:
+        raise HistoryGapError(symbol, interval, missing)
+    chunks = [c for c in chunks if len(c)]
+    if not chunks:
+        return np.empty(0, dtype=KLINE_DTYPE)
+    rows = dedupe_records(np.concatenate(chunks))
+    if store_enabled():
+        # One write for the whole range: pages finish out of order, so per-page writes would each merge
+        _persist_closed(get_store(), symbol, interval, rows, _now_ms())
+    return rows[(rows["time"] >= start_time) & (rows["time"] <= end_time)]
+
+
+def _load_serial(fetch_raw: RawFetcher, symbol: str, interval: str,
+                 start_time: int, end_time: int) -> np.ndarray:
+    """Page forward one request at a time for intervals without a fixed length (3d/1w/1M)."""
+    chunks = []
+    cursor = start_time
+    while cursor <= end_time:
+        page = load_klines(fetch_raw, symbol, interval, MAX_PAGE, cursor, end_time)
+        if not len(page):
+            break
+        chunks.append(page)
+        cursor = int(page["time"][-1]) + 1
+        if len(page) < MAX_PAGE:
+            break
+    if not chunks:
+        return np.empty(0, dtype=KLINE_DTYPE)
+    return dedupe_records(np.concatenate(chunks))
+
+
+def get_history(symbol: str, interval: str, start_time: int, end_time: Optional[int] = None,
+                max_workers: int = DEFAULT_WORKERS) -> Candles:
+    """Binance history as Candles, like market_data.get_klines."""
+    try:
+        rows = load_history(partial(fetch_raw_klines, priority=PRIORITY_LOW), symbol, interval, start_time, end_time, max_workers)
+        return Candles.from_records(rows)
+    except HistoryGapError:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching history for {symbol}: {e}")
+        return Candles.empty()
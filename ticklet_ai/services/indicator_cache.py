@@ -0,0 +1,192 @@
+"""
+Shared indicator cache.
+
+Strategies and the signal safety analyzer compute the same RSI/EMA/MACD/ATR
+over the same candles independently. Results are cached here under
+(symbol, interval, indicator, params, window) where ``window`` identifies the
+candle window by its first/last open time, length and the last candle's
+high/low/close (so an in-progress candle that ticks invalidates the entry).
+Entries are evicted least-recently-used once the byte budget is exceeded.
+
+Cached arrays are returned read-only; assigning them to a DataFrame column
+is fine, mutating them in place is not.
+
+The multi-symbol scanners (low entry watchlist, missed opportunities) do not
+go through this cache; they compute every symbol at once with
+indicator_panel.
+
+TA-Lib is optional: without it the same indicators come from
+indicator_kernels (RSI, ATR, ADX) and indicator_panel (EMA, SMA, MACD,
+Bollinger bands), which follow TA-Lib's seeding.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from ticklet_ai.services import indicator_kernels, indicator_panel
+
+try:
+    import talib
+except ImportError:  # optional: numpy kernels are used instead
+    talib = None
+
+DEFAULT_MAX_BYTES = int(float(os.getenv("TICKLET_INDICATOR_CACHE_MB", "64")) * 1024 * 1024)
+
+WindowKey = Tuple[int, int, int, float, float, float]
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    return 64
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            _freeze(v)
+    return value
+
+
+def window_key(time: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> WindowKey:
+    return (int(time[0]), int(time[-1]), len(time), float(high[-1]), float(low[-1]), float(close[-1]))
+
+
+class IndicatorCache:
+    """Memory-bounded LRU of indicator results."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, symbol: str, interval: str, indicator: str, params: Tuple,
+                       window: WindowKey, compute: Callable[[], Any]) -> Any:
+        key = (symbol.upper(), interval, indicator, params, window)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value = _freeze(compute())
+        size = _nbytes(value)
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+
+indicator_cache = IndicatorCache()
+
+
+class CachedIndicators:
+    """
+    Indicator accessors over one candle window, served through the cache.
+    Without a symbol the window has no identity and results are computed directly.
+    """
+
+    def __init__(self, symbol: Optional[str], interval: str, time: np.ndarray, high: np.ndarray,
+                 low: np.ndarray, close: np.ndarray, volume: Optional[np.ndarray] = None,
+                 cache: Optional[IndicatorCache] = None):
+        self.symbol = symbol
+        self.interval = interval
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = None if volume is None else np.ascontiguousarray(volume, dtype=np.float64)
+        self.cache = cache or indicator_cache
+        self.window = window_key(time, self.high, self.low, self.close) if symbol and len(time) else None
+
+    @classmethod
+    def from_candles(cls, symbol: Optional[str], interval: str, candles, **kw) -> "CachedIndicators":
+        return cls(symbol, interval, candles.time, candles.high, candles.low, candles.close, candles.volume, **kw)
+
+    @classmethod
+    def from_dataframe(cls, df, symbol: Optional[str], interval: str, **kw) -> "CachedIndicators":
+        """DataFrame with high/low/close (and volume); the window is identified by its 'date' column or index."""
+        import pandas as pd
+        if "date" in df.columns:
+            times = pd.to_datetime(df["date"], utc=True)
+        elif isinstance(df.index, pd.DatetimeIndex):
+            times = df.index.tz_localize("UTC") if df.index.tz is None else df.index
+        else:
+            times, symbol = None, None  # no timestamps: the window has no identity, do not share results
+        if times is None:
+            time = np.arange(len(df), dtype=np.int64)
+        else:
+            time = np.asarray(pd.DatetimeIndex(times).as_unit("ms").asi8)
+        volume = df["volume"].to_numpy() if "volume" in df.columns else None
+        return cls(symbol, interval, time, df["high"].to_numpy(), df["low"].to_numpy(),
+                   df["close"].to_numpy(), volume, **kw)
+
+    def _get(self, indicator: str, params: Tuple, compute: Callable[[], Any]) -> Any:
+        if self.window is None:
+            return compute()
+        return self.cache.get_or_compute(self.symbol, self.interval, indicator, params, self.window, compute)
+
+    def ema(self, period: int) -> np.ndarray:
+        if talib is None:
+            return self._get("ema", (period,), lambda: indicator_panel.ema(self.close[None, :], period)[0])
+        return self._get("ema", (period,), lambda: talib.EMA(self.close, timeperiod=period))
+
+    def sma(self, period: int, source: str = "close") -> np.ndarray:
+        if talib is None:
+            return self._get("sma", (period, source),
+                             lambda: indicator_panel.sma(getattr(self, source)[None, :], period)[0])
+        return self._get("sma", (period, source), lambda: talib.SMA(getattr(self, source), timeperiod=period))
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        if talib is None:
+            return self._get("rsi", (period,), lambda: indicator_kernels.rsi(self.close, period))
+        return self._get("rsi", (period,), lambda: talib.RSI(self.close, timeperiod=period))
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if talib is None:
+            return self._get("macd", (fast, slow, signal), lambda: tuple(
+                v[0] for v in indicator_panel.macd(self.close[None, :], fast, slow, signal)))
+        return self._get("macd", (fast, slow, signal), lambda: tuple(
+            talib.MACD(self.close, fastperiod=fast, slowperiod=slow, signalperiod=signal)))
+
+    def bbands(self, period: int = 20, nbdev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(upper, middle, lower) Bollinger bands."""
+        if talib is None:
+            return self._get("bbands", (period, nbdev), lambda: tuple(
+                v[0] for v in indicator_panel.bbands(self.close[None, :], period, nbdev)))
+        return self._get("bbands", (period, nbdev), lambda: tuple(
+            talib.BBANDS(self.close, timeperiod=period, nbdevup=nbdev, nbdevdn=nbdev)))
+
+    def atr(self, period: int = 14) -> np.ndarray:
+        if talib is None:
+            return self._get("atr", (period,), lambda: indicator_kernels.atr(self.high, self.low, self.close, period))
+        return self._get("atr", (period,), lambda: talib.ATR(self.high, self.low, self.close, timeperiod=period))
+
+    def adx(self, period: int = 14) -> np.ndarray:
+        if talib is None:
+            return self._get("adx", (period,), lambda: indicator_kernels.adx(self.high, self.low, self.close, period))
+        return self._get("adx", (period,), lambda: talib.ADX(self.high, self.low, self.close, timeperiod=period))
@@ -0,0 +1,339 @@
+"""
+Incremental indicator engine.
+
+Keeps running indicator state per (symbol, interval) so that each closed
+candle costs O(1) instead of recomputing full windows every scan. State is
+warm-started from history the first time a series is seen (or after a gap),
+and the in-progress candle can be previewed without committing it.
+
+Indicators: SMA/Bollinger and rolling std (RollingStats), EMA, Wilder RSI,
+Wilder ATR, MACD and a volume SMA.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ticklet_ai.services.candles import Candles
+
+
+class EMA:
+    """Exponential average seeded with the SMA of the first `period` inputs."""
+
+    __slots__ = ("period", "alpha", "value", "_n", "_sum")
+
+    def __init__(self, period: int, alpha: Optional[float] = None):
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.value: Optional[float] = None
+        self._n = 0
+        self._sum = 0.0
+
+    def update(self, x: float) -> Optional[float]:
+        if self.value is None:
+            self._n += 1
+            self._sum += x
+            if self._n == self.period:
+                self.value = self._sum / self.period
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+    def peek(self, x: float) -> Optional[float]:
+        if self.value is None:
+            return (self._sum + x) / self.period if self._n + 1 == self.period else None
+        return self.value + self.alpha * (x - self.value)
+
+
+def wilder(period: int) -> EMA:
+    """Wilder smoothing is an EMA with alpha = 1/period."""
+    return EMA(period, alpha=1.0 / period)
+
+
+class RollingStats:
+    """Rolling mean and population std over the last `period` inputs."""
+
+    __slots__ = ("period", "_buf", "_sum", "_sumsq")
+
+    def __init__(self, period: int):
+        self.period = period
+        self._buf: deque = deque()
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def update(self, x: float) -> None:
+        self._buf.append(x)
+        self._sum += x
+        self._sumsq += x * x
+        if len(self._buf) > self.period:
+            old = self._buf.popleft()
+            self._sum -= old
+            self._sumsq -= old * old
+
+    def _stats(self, s: float, sq: float, n: int) -> Optional[Tuple[float, float]]:
+        if n < self.period:
+            return None
+        mean = s / n
+        return mean, max(sq / n - mean * mean, 0.0) ** 0.5
+
+    def value(self) -> Optional[Tuple[float, float]]:
+        return self._stats(self._sum, self._sumsq, len(self._buf))
+
+    def peek(self, x: float) -> Optional[Tuple[float, float]]:
+        s, sq, n = self._sum + x, self._sumsq + x * x, len(self._buf) + 1
+        if n > self.period:
+            old = self._buf[0]
+            s, sq, n = s - old, sq - old * old, n - 1
+        return self._stats(s, sq, n)
+
+
+class RSI:
+    """Wilder RSI."""
+
+    __slots__ = ("_prev", "_gain", "_loss")
+
+    def __init__(self, period: int = 14):
+        self._prev: Optional[float] = None
+        self._gain = wilder(period)
+        self._loss = wilder(period)
+
+    @staticmethod
+    def _rsi(gain: Optional[float], loss: Optional[float]) -> Optional[float]:
+        if gain is None or loss is None:
+            return None
+        if loss == 0:
+            return 100.0 if gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    def update(self, close: float) -> None:
+        if self._prev is not None:
+            change = close - self._prev
+            self._gain.update(max(change, 0.0))
+            self._loss.update(max(-change, 0.0))
+        self._prev = close
+
+    def value(self) -> Optional[float]:
+        return self._rsi(self._gain.value, self._loss.value)
+
+    def peek(self, close: float) -> Optional[float]:
+        if self._prev is None:
+            return None
+        change = close - self._prev
+        return self._rsi(self._gain.peek(max(change, 0.0)), self._loss.peek(max(-change, 0.0)))
+
+
+class ATR:
+    """Wilder average true range (the first candle has no previous close and is skipped)."""
+
+    __slots__ = ("_prev", "_avg")
+
+    def __init__(self, period: int = 14):
+        self._prev: Optional[float] = None
+        self._avg = wilder(period)
+
+    def _tr(self, high: float, low: float) -> float:
+        return max(high - low, abs(high - self._prev), abs(low - self._prev))
+
+    def update(self, high: float, low: float, close: float) -> None:
+        if self._prev is not None:
+            self._avg.update(self._tr(high, low))
+        self._prev = close
+
+    def value(self) -> Optional[float]:
+        return self._avg.value
+
+    def peek(self, high: float, low: float, close: float) -> Optional[float]:
+        return None if self._prev is None else self._avg.peek(self._tr(high, low))
+
+
+class MACD:
+    """MACD line, signal line and histogram."""
+
+    __slots__ = ("_fast", "_slow", "_signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast, self._slow, self._signal = EMA(fast), EMA(slow), EMA(signal)
+
+    @staticmethod
+    def _out(line: Optional[float], signal: Optional[float]) -> Optional[Tuple[float, float, float]]:
+        if line is None or signal is None:
+            return None
+        return line, signal, line - signal
+
+    def update(self, close: float) -> None:
+        fast, slow = self._fast.update(close), self._slow.update(close)
+        if fast is not None and slow is not None:
+            self._signal.update(fast - slow)
+
+    def value(self) -> Optional[Tuple[float, float, float]]:
+        fast, slow = self._fast.value, self._slow.value
+        line = None if fast is None or slow is None else fast - slow
+        return self._out(line, self._signal.value)
+
+    def peek(self, close: float) -> Optional[Tuple[float, float, float]]:
+        fast, slow = self._fast.peek(close), self._slow.peek(close)
+        if fast is None or slow is None:
+            return None
+        line = fast - slow
+        return self._out(line, self._signal.peek(line))
+
+
+class IndicatorState:
+    """Running indicators for one (symbol, interval) series."""
+
+    def __init__(self, bb_period: int = 20, bb_mult: float = 2.0):
+        self.bb_mult = bb_mult
+        self.last_time: Optional[int] = None
+        self.last_close: Optional[float] = None
+        self.last_volume: Optional[float] = None
+        self.count = 0
+        self.sma_20 = RollingStats(bb_period)
+        self.sma_50 = RollingStats(50)
+        self.ema_20 = EMA(20)
+        self.ema_50 = EMA(50)
+        self.rsi = RSI(14)
+        self.atr = ATR(14)
+        self.macd = MACD()
+        self.volume = RollingStats(20)
+
+    def update(self, time_ms: int, high: float, low: float, close: float, volume: float) -> None:
+        """Commit one closed candle."""
+        self.sma_20.update(close)
+        self.sma_50.update(close)
+        self.ema_20.update(close)
+        self.ema_50.update(close)
+        self.rsi.update(close)
+        self.atr.update(high, low, close)
+        self.macd.update(close)
+        self.volume.update(volume)
+        self.last_time = int(time_ms)
+        self.last_close = close
+        self.last_volume = volume
+        self.count += 1
+
+    def extend(self, candles: Candles) -> None:
+        for t, h, l, c, v in zip(candles.time.tolist(), candles.high.tolist(), candles.low.tolist(),
+                                 candles.close.tolist(), candles.volume.tolist()):
+            self.update(t, h, l, c, v)
+
+    def values(self, pending: Optional[Tuple[float, float, float, float]] = None) -> Dict[str, Any]:
+        """
+        Current indicator values. `pending` = (high, low, close, volume) of the
+        in-progress candle is included as if closed, without being committed.
+        """
+        if pending is None:
+            bb, sma_50, vol = self.sma_20.value(), self.sma_50.value(), self.volume.value()
+            ema_20, ema_50 = self.ema_20.value, self.ema_50.value
+            rsi, atr, macd = self.rsi.value(), self.atr.value(), self.macd.value()
+            close, volume = self.last_close, self.last_volume
+        else:
+            high, low, close, volume = pending
+            bb, sma_50, vol = self.sma_20.peek(close), self.sma_50.peek(close), self.volume.peek(volume)
+            ema_20, ema_50 = self.ema_20.peek(close), self.ema_50.peek(close)
+            rsi, atr, macd = self.rsi.peek(close), self.atr.peek(high, low, close), self.macd.peek(close)
+        return {
+            "current_price": close,
+            "volume": volume,
+            "sma_20": bb[0] if bb else None,
+            "std_20": bb[1] if bb else None,
+            "bb_upper": bb[0] + self.bb_mult * bb[1] if bb else None,
+            "bb_lower": bb[0] - self.bb_mult * bb[1] if bb else None,
+            "sma_50": sma_50[0] if sma_50 else None,
+            "ema_20": ema_20,
+            "ema_50": ema_50,
+            "rsi": rsi,
+            "atr": atr,
+            "macd": macd[0] if macd else None,
+            "macd_signal": macd[1] if macd else None,
+            "macd_hist": macd[2] if macd else None,
+            "volume_sma": vol[0] if vol else None,
+        }
+
+
+class IndicatorEngine:
+    """
+    Per-(symbol, interval) indicator states, fed by closed candles. The stream
+    thread (`update`) and request threads (`sync`, `warm_start`) serialize on
+    a per-series lock, so a candle is folded in exactly once and a state is
+    never swapped out mid-update.
+    """
+
+    def __init__(self):
+        self.states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._lock = threading.Lock()
+        self._series_locks: Dict[Tuple[str, str], threading.RLock] = {}
+
+    def series_lock(self, symbol: str, interval: str) -> threading.RLock:
+        key = (symbol.upper(), interval)
+        with self._lock:
+            lock = self._series_locks.get(key)
+            if lock is None:
+                lock = self._series_locks[key] = threading.RLock()
+            return lock
+
+    def state(self, symbol: str, interval: str) -> IndicatorState:
+        key = (symbol.upper(), interval)
+        with self._lock:
+            st = self.states.get(key)
+            if st is None:
+                st = self.states[key] = IndicatorState()
+            return st
+
+    def reset(self, symbol: str, interval: str) -> IndicatorState:
+        with self.series_lock(symbol, interval), self._lock:
+            st = self.states[(symbol.upper(), interval)] = IndicatorState()
+            return st
+
+    def update(self, symbol: str, interval: str, row) -> None:
+        """O(1) update from one closed candle (record or kline dict)."""
+        with self.series_lock(symbol, interval):
+            st = self.state(symbol, interval)
+            if st.last_time is not None and int(row["time"]) <= st.last_time:
+                return
+            st.update(int(row["time"]), float(row["high"]), float(row["low"]), float(row["close"]),
+                      float(row["volume"]))
+
+    def warm_start(self, symbol: str, interval: str, candles: Any) -> IndicatorState:
+        candles = Candles.coerce(candles)
+        with self.series_lock(symbol, interval):
+            st = self.reset(symbol, interval)
+            st.extend(candles)
+            return st
+
+    def sync(self, symbol: str, interval: str, candles: Any, now_ms: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Bring the state up to date with `candles` (oldest first) and return the
+        indicator values including the in-progress candle. Only closed candles
+        newer than the state are folded in; if the state does not line up with
+        the window it is rebuilt from it.
+        """
+        candles = Candles.coerce(candles)
+        if not len(candles):
+            with self.series_lock(symbol, interval):
+                return self.state(symbol, interval).values()
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        n_closed = int(np.searchsorted(candles.close_time, now_ms))
+        closed, live = candles[:n_closed], candles[n_closed:]
+
+        pending = None
+        if len(live):
+            pending = (float(live.high[-1]), float(live.low[-1]), float(live.close[-1]), float(live.volume[-1]))
+
+        with self.series_lock(symbol, interval):
+            st = self.state(symbol, interval)
+            if len(closed) and (st.last_time is None or st.last_time < int(closed.time[-1])):
+                k = int(np.searchsorted(closed.time, st.last_time)) if st.last_time is not None else -1
+                if 0 <= k < len(closed) and int(closed.time[k]) == st.last_time:
+                    st.extend(closed[k + 1:])
+                else:
+                    st = self.warm_start(symbol, interval, closed)
+            return st.values(pending)
+
+    def attach(self, stream) -> None:
+        """Keep states current from a KlineStreamService's candle-close events."""
+        stream.on_candle_close(self.update)
+
+
+indicator_engine = IndicatorEngine()
@@ -0,0 +1,196 @@
+"""
+Compiled indicator kernels.
+
+True range, ATR, +DI/-DI, ADX and Wilder RSI over plain float64 arrays,
+following TA-Lib's definitions (seeding, lookback NaNs, near-zero guards) so
+they can stand in for it when TA-Lib is not installed. Element-wise steps are
+numpy. The recursive Wilder smoothing runs as numba-compiled loops when numba
+is installed; otherwise each recursion is expressed as a pandas
+``ewm(alpha=1/period, adjust=False)`` over the seeded series, which runs in
+C. Both paths produce the same values.
+"""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:  # optional: the pandas ewm path is used instead
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+_EPSILON = 1e-8  # TA-Lib's TA_IS_ZERO threshold
+
+
+def _jit(fn):
+    return njit(cache=True, nogil=True)(fn)
+
+
+def _ewm(seeded: np.ndarray, period: int, ignore_na: bool = False) -> np.ndarray:
+    """y[t] = y[t-1] + (x[t] - y[t-1]) / period from the first non-NaN input on."""
+    return pd.Series(seeded).ewm(alpha=1.0 / period, adjust=False, ignore_na=ignore_na).mean().to_numpy(copy=True)
+
+
+def _wilder_mean_loop(values, period):
+    """Wilder average seeded with the mean of values[1:period+1]; first output at `period`."""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+    acc = 0.0
+    for t in range(1, period + 1):
+        acc += values[t]
+    prev = acc / period
+    out[period] = prev
+    for t in range(period + 1, n):
+        prev = (prev * (period - 1) + values[t]) / period
+        out[t] = prev
+    return out
+
+
+def _wilder_mean_ewm(values, period):
+    n = values.shape[0]
+    if n <= period:
+        return np.full(n, np.nan)
+    seeded = np.full(n, np.nan)
+    seeded[period] = values[1:period + 1].mean()
+    seeded[period + 1:] = values[period + 1:]
+    return _ewm(seeded, period)
+
+
+def _wilder_sum_loop(values, period):
+    """
+    Wilder running sum as TA-Lib smooths DM and TR: seeded with the sum of
+    values[1:period], then s - s/period + x from index `period` on.
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+    prev = 0.0
+    for t in range(1, period):
+        prev += values[t]
+    for t in range(period, n):
+        prev = prev - prev / period + values[t]
+        out[t] = prev
+    return out
+
+
+def _wilder_sum_ewm(values, period):
+    # s - s/period + x is period times a Wilder mean of x
+    n = values.shape[0]
+    if n <= period:
+        return np.full(n, np.nan)
+    seeded = np.full(n, np.nan)
+    seed = values[1:period].sum()
+    seeded[period] = (seed - seed / period + values[period]) / period
+    seeded[period + 1:] = values[period + 1:]
+    return _ewm(seeded, period) * period
+
+
+def _adx_smooth_loop(dx, valid, period):
+    """ADX from DX (defined from index `period`): mean of the first `period` values, then Wilder."""
+    n = dx.shape[0]
+    out = np.full(n, np.nan)
+    first = 2 * period - 1
+    if n <= first:
+        return out
+    acc = 0.0
+    for t in range(period, first + 1):
+        if valid[t]:
+            acc += dx[t]
+    prev = acc / period
+    out[first] = prev
+    for t in range(first + 1, n):
+        if valid[t]:  # TA-Lib carries the previous ADX when +DI + -DI is zero
+            prev = (prev * (period - 1) + dx[t]) / period
+        out[t] = prev
+    return out
+
+
+def _adx_smooth_ewm(dx, valid, period):
+    n = dx.shape[0]
+    first = 2 * period - 1
+    if n <= first:
+        return np.full(n, np.nan)
+    seeded = np.where(valid, dx, np.nan)  # invalid DX carries the previous ADX
+    seeded[:first] = np.nan
+    seeded[first] = np.where(valid[period:first + 1], dx[period:first + 1], 0.0).sum() / period
+    out = _ewm(seeded, period, ignore_na=True)
+    out[:first] = np.nan
+    return out
+
+
+if HAVE_NUMBA:
+    _wilder_mean, _wilder_sum, _adx_smooth = (
+        _jit(_wilder_mean_loop), _jit(_wilder_sum_loop), _jit(_adx_smooth_loop))
+else:
+    _wilder_mean, _wilder_sum, _adx_smooth = _wilder_mean_ewm, _wilder_sum_ewm, _adx_smooth_ewm
+
+
+def _as_float(*arrays: np.ndarray) -> Tuple[np.ndarray, ...]:
+    return tuple(np.ascontiguousarray(a, dtype=np.float64) for a in arrays)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range; the first candle has no previous close and uses high - low."""
+    high, low, close = _as_float(high, low, close)
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    # fmax skips the missing previous close on the first row
+    return np.fmax(np.abs(high - low), np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def directional_movement(high: np.ndarray, low: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """+DM and -DM per candle (0 on the first)."""
+    high, low = _as_float(high, low)
+    up = np.diff(high, prepend=high[:1])
+    down = -np.diff(low, prepend=low[:1])
+    plus_dm = np.where((up > 0) & (up > down), up, 0.0)
+    minus_dm = np.where((down > 0) & (down > up), down, 0.0)
+    return plus_dm, minus_dm
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    return _wilder_mean(true_range(high, low, close), period)
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    (close,) = _as_float(close)
+    change = np.diff(close, prepend=close[:1])
+    avg_gain = _wilder_mean(np.clip(change, 0.0, None), period)
+    avg_loss = _wilder_mean(np.clip(-change, 0.0, None), period)
+    total = avg_gain + avg_loss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = np.where(np.abs(total) < _EPSILON, 0.0, 100.0 * avg_gain / total)
+    return np.where(np.isnan(total), np.nan, out)
+
+
+def _directional_sums(high, low, close, period):
+    plus_dm, minus_dm = directional_movement(high, low)
+    tr_sum = _wilder_sum(true_range(high, low, close), period)
+    return _wilder_sum(plus_dm, period), _wilder_sum(minus_dm, period), tr_sum
+
+
+def _di(dm_sum: np.ndarray, tr_sum: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = np.where(np.abs(tr_sum) < _EPSILON, 0.0, 100.0 * dm_sum / tr_sum)
+    return np.where(np.isnan(tr_sum), np.nan, out)
+
+
+def directional_index(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                      period: int = 14) -> Tuple[np.ndarray, np.ndarray]:
+    """(+DI, -DI), first value at index `period`."""
+    plus_sum, minus_sum, tr_sum = _directional_sums(high, low, close, period)
+    return _di(plus_sum, tr_sum), _di(minus_sum, tr_sum)
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average directional index, first value at index 2 * period - 1."""
+    plus_di, minus_di = directional_index(high, low, close, period)
+    di_sum = plus_di + minus_di
+    valid = np.abs(di_sum) >= _EPSILON  # NaN compares False
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = np.where(valid, 100.0 * np.abs(plus_di - minus_di) / di_sum, 0.0)
+    return _adx_smooth(dx, valid, period)
@@ -0,0 +1,146 @@
+"""
+Universe-wide indicator panel.
+
+Stacks the latest `length` candles of every symbol into (symbols x time)
+arrays and computes EMA, RSI, ATR, MACD and Bollinger Bands for all symbols
+at once: recursive indicators step through time with one vector operation
+per candle instead of one TA-Lib call per symbol. Values follow TA-Lib's
+seeding (SMA-seeded EMA/Wilder averages, MACD's aligned fast EMA, population
+std in the bands), so analyzers can swap their per-symbol calls for a slice.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ticklet_ai.services.candles import Candles
+
+
+def _smooth(values: np.ndarray, period: int, alpha: float, first: int = 0) -> np.ndarray:
+    """
+    Exponential smoothing along axis 1, seeded with the mean of the first
+    `period` values from column `first`. Columns before the seed are NaN.
+    """
+    out = np.full(values.shape, np.nan)
+    seed = first + period - 1
+    if seed >= values.shape[1]:
+        return out
+    prev = values[:, first:seed + 1].mean(axis=1)
+    out[:, seed] = prev
+    for t in range(seed + 1, values.shape[1]):
+        prev = prev + alpha * (values[:, t] - prev)
+        out[:, t] = prev
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    return _smooth(values, period, 2.0 / (period + 1))
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    if period <= values.shape[1]:
+        out[:, period - 1:] = sliding_window_view(values, period, axis=1).mean(axis=2)
+    return out
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    change = np.zeros(close.shape)
+    change[:, 1:] = np.diff(close, axis=1)
+    avg_gain = _smooth(np.clip(change, 0, None), period, 1.0 / period, first=1)
+    avg_loss = _smooth(np.clip(-change, 0, None), period, 1.0 / period, first=1)
+    total = avg_gain + avg_loss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total != 0, 100.0 * avg_gain / total, np.where(np.isnan(total), np.nan, 0.0))
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    tr = np.full(close.shape, np.nan)
+    prev_close = close[:, :-1]
+    tr[:, 1:] = np.maximum.reduce([high[:, 1:] - low[:, 1:],
+                                   np.abs(high[:, 1:] - prev_close),
+                                   np.abs(low[:, 1:] - prev_close)])
+    return tr
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    return _smooth(true_range(high, low, close), period, 1.0 / period, first=1)
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26,
+         signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # As in TA-Lib, the fast EMA is seeded over the bars ending where the slow EMA starts
+    slow_ema = _smooth(close, slow, 2.0 / (slow + 1))
+    fast_ema = _smooth(close, fast, 2.0 / (fast + 1), first=max(slow - fast, 0))
+    line = fast_ema - slow_ema
+    signal_line = _smooth(line, signal, 2.0 / (signal + 1), first=slow - 1)
+    line = np.where(np.isnan(signal_line), np.nan, line)
+    return line, signal_line, line - signal_line
+
+
+def bbands(close: np.ndarray, period: int = 20, nbdev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    middle = sma(close, period)
+    std = np.full(close.shape, np.nan)
+    if period <= close.shape[1]:
+        std[:, period - 1:] = sliding_window_view(close, period, axis=1).std(axis=2)
+    return middle + nbdev * std, middle, middle - nbdev * std
+
+
+class IndicatorPanel:
+    """Aligned (symbols x time) OHLCV arrays with memoized panel indicators."""
+
+    def __init__(self, symbols: List[str], time: np.ndarray, open_: np.ndarray, high: np.ndarray,
+                 low: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        self.symbols = symbols
+        self.index = {s: i for i, s in enumerate(symbols)}
+        self.time, self.open, self.high, self.low, self.close, self.volume = time, open_, high, low, close, volume
+        self._memo: Dict[Tuple, object] = {}
+
+    @classmethod
+    def from_candles(cls, candles_by_symbol: Dict[str, Candles], length: int) -> "IndicatorPanel":
+        """Stack the latest `length` candles per symbol; symbols with less history are left out."""
+        rows = [(s, Candles.coerce(c)) for s, c in candles_by_symbol.items()]
+        rows = [(s, c.tail(length)) for s, c in rows if len(c) >= length]
+        symbols = [s for s, _ in rows]
+
+        def stack(name: str, dtype) -> np.ndarray:
+            if not rows:
+                return np.empty((0, length), dtype=dtype)
+            return np.vstack([getattr(c, name) for _, c in rows]).astype(dtype, copy=False)
+
+        return cls(symbols, stack("time", np.int64), stack("open", float), stack("high", float),
+                   stack("low", float), stack("close", float), stack("volume", float))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def row(self, symbol: str) -> int:
+        return self.index[symbol]
+
+    def _cached(self, key: Tuple, compute: Callable[[], object]):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def ema(self, period: int) -> np.ndarray:
+        return self._cached(("ema", period), lambda: ema(self.close, period))
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        return self._cached(("rsi", period), lambda: rsi(self.close, period))
+
+    def atr(self, period: int = 14) -> np.ndarray:
+        return self._cached(("atr", period), lambda: atr(self.high, self.low, self.close, period))
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._cached(("macd", fast, slow, signal), lambda: macd(self.close, fast, slow, signal))
+
+    def bbands(self, period: int = 20, nbdev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._cached(("bbands", period, nbdev), lambda: bbands(self.close, period, nbdev))
+
+
+def load_panel(symbols: Iterable[str], interval: str, length: int,
+               fetch: Optional[Callable[[str, str, int], Candles]] = None) -> IndicatorPanel:
+    """Fetch `length` candles per symbol (stream/store/REST via get_klines_from_exchange) into a panel."""
+    if fetch is None:
+        from ticklet_ai.services.data_sources import get_klines_from_exchange as fetch
+    return IndicatorPanel.from_candles({s: fetch(s, interval, length) for s in symbols}, length)
@@ -0,0 +1,339 @@
+"""
+Kline WebSocket ingestion.
+
+Subscribes to Binance combined kline streams and keeps a fixed-size numpy
+ring buffer per (symbol, interval). Readers get the latest candles with no
+network round trip; callbacks fire when a candle closes.
+
+After every (re)connect each streamed buffer is marked not ready until its
+first frame shows it is contiguous with the stored candles. A buffer with a
+gap, or whose newest candle was still open at the disconnect, is backfilled
+through the warm-start REST fetcher, and the missed closes are published in
+order. Until then readers get None and fall back to REST.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ticklet_ai.services.candle_store import INTERVAL_MS, KLINE_DTYPE
+from ticklet_ai.services.candles import Candles
+
+logger = logging.getLogger(__name__)
+
+BINANCE_WS_BASE = os.getenv("TICKLET_BINANCE_WS_BASE", "wss://stream.binance.com:9443")
+DEFAULT_CAPACITY = int(os.getenv("TICKLET_KLINE_BUFFER_SIZE", "1000"))
+
+CloseCallback = Callable[[str, str, np.void], None]
+Fetcher = Callable[[str, str, int], np.ndarray]
+
+
+def stream_enabled() -> bool:
+    return os.getenv("TICKLET_KLINE_STREAM_ENABLED", "false").lower() in ("1", "true", "yes", "on")
+
+
+class CandleRingBuffer:
+    """Fixed-capacity ring of KLINE_DTYPE records; the newest slot may be an open candle."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._rows = np.zeros(capacity, dtype=KLINE_DTYPE)
+        self._count = 0
+        self._head = 0  # index of the next write
+        self._lock = threading.Lock()
+        self.last_closed = False
+        self.ready = True          # False from a reconnect until the buffer is known to have no gap
+        self.backfilling = False
+        self.pending_closes: List[np.void] = []  # closes held back while a backfill is running
+
+    def __len__(self) -> int:
+        return self._count
+
+    def last_time(self) -> Optional[int]:
+        with self._lock:
+            return int(self._rows["time"][(self._head - 1) % self.capacity]) if self._count else None
+
+    def update(self, row: Tuple, closed: bool) -> None:
+        """Insert or overwrite the newest candle (same open time = in-progress update)."""
+        with self._lock:
+            last = (self._head - 1) % self.capacity
+            if self._count and self._rows["time"][last] == row[0]:
+                self._rows[last] = row
+            elif self._count and row[0] < self._rows["time"][last]:
+                return  # stale frame after a reconnect
+            else:
+                self._rows[self._head] = row
+                self._head = (self._head + 1) % self.capacity
+                self._count = min(self._count + 1, self.capacity)
+            self.last_closed = closed
+
+    def overwrite(self, record: np.void) -> bool:
+        """Replace the buffered candle with the same open time; False if it is not buffered."""
+        with self._lock:
+            idx = (np.arange(self._head - self._count, self._head)) % self.capacity
+            hit = idx[self._rows["time"][idx] == record["time"]]
+            if not len(hit):
+                return False
+            self._rows[hit[0]] = record
+            return True
+
+    def extend(self, rows: np.ndarray) -> None:
+        for r in rows:
+            self.update(tuple(r.tolist()), True)
+
+    def snapshot(self, limit: Optional[int] = None) -> np.ndarray:
+        """Chronologically ordered copy of the newest `limit` candles."""
+        with self._lock:
+            n = self._count if limit is None else min(limit, self._count)
+            idx = (np.arange(self._head - n, self._head)) % self.capacity
+            return self._rows[idx].copy()
+
+    def contiguous(self, step: Optional[int]) -> bool:
+        """True when consecutive candles are exactly `step` ms apart (always, for irregular intervals)."""
+        times = self.snapshot()["time"]
+        return step is None or len(times) < 2 or bool(np.all(np.diff(times) == step))
+
+    def merge(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Merge backfilled candles in, keeping the buffered (streamed) copy of any
+        candle present in both and the newest `capacity` candles overall.
+        Returns the rows that were not buffered before, oldest first.
+        """
+        with self._lock:
+            n = self._count
+            idx = (np.arange(self._head - n, self._head)) % self.capacity
+            current = self._rows[idx]
+            rows = np.asarray(rows, dtype=KLINE_DTYPE)
+            added = rows[~np.isin(rows["time"], current["time"])]
+            merged = np.concatenate([current, added])
+            merged = merged[np.argsort(merged["time"], kind="stable")][-self.capacity:]
+            self._store(merged)
+            return np.sort(added[added["time"] >= merged["time"][0]], order="time") if len(merged) else added
+
+    def reset(self, rows: np.ndarray) -> None:
+        """Replace the buffered candles with the newest `capacity` of `rows`."""
+        with self._lock:
+            self._store(np.asarray(rows, dtype=KLINE_DTYPE)[-self.capacity:])
+
+    def _store(self, rows: np.ndarray) -> None:
+        # caller holds the lock; rows are time-ordered and at most `capacity` long
+        self._rows[:len(rows)] = rows
+        self._count = len(rows)
+        self._head = len(rows) % self.capacity
+
+
+class KlineStreamService:
+    """Maintains ring buffers from Binance kline WebSocket streams."""
+
+    def __init__(self, ws_base: str = BINANCE_WS_BASE, capacity: int = DEFAULT_CAPACITY):
+        self.ws_base = ws_base.rstrip("/")
+        self.capacity = capacity
+        self.buffers: Dict[Tuple[str, str], CandleRingBuffer] = {}
+        self._callbacks: List[CloseCallback] = []
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fetch: Optional[Fetcher] = None
+        self.connected = False
+
+    # -- buffers --
+    def buffer(self, symbol: str, interval: str) -> CandleRingBuffer:
+        key = (symbol.upper(), interval)
+        buf = self.buffers.get(key)
+        if buf is None:
+            buf = self.buffers[key] = CandleRingBuffer(self.capacity)
+        return buf
+
+    def get_records(self, symbol: str, interval: str, limit: int) -> Optional[np.ndarray]:
+        """Newest `limit` candles, or None if the stream is down or the buffer is not warm enough."""
+        buf = self.buffers.get((symbol.upper(), interval))
+        if not self.connected or buf is None or not buf.ready or len(buf) < limit:
+            return None
+        return buf.snapshot(limit)
+
+    def get_klines(self, symbol: str, interval: str, limit: int) -> Optional[Candles]:
+        rows = self.get_records(symbol, interval, limit)
+        return None if rows is None else Candles.from_records(rows)
+
+    def get_raw_klines(self, symbol: str, interval: str, limit: int) -> Optional[List[list]]:
+        """Binance REST array layout ([open_time, open, high, low, close, volume, ...])."""
+        rows = self.get_records(symbol, interval, limit)
+        return None if rows is None else [list(r) for r in rows.tolist()]
+
+    def on_candle_close(self, callback: CloseCallback) -> None:
+        self._callbacks.append(callback)
+
+    def warm_start(self, pairs: Iterable[Tuple[str, str]], fetch: Fetcher) -> None:
+        """Seed buffers from REST history so readers are served before the first close; `fetch` also backfills gaps."""
+        self._fetch = fetch
+        for symbol, interval in pairs:
+            try:
+                rows = fetch(symbol, interval, self.capacity)
+                self.buffer(symbol, interval).extend(rows)
+            except Exception as e:
+                logger.warning(f"Warm start failed for {symbol} {interval}: {e}")
+
+    # -- ingestion --
+    def handle_message(self, raw: str | bytes) -> None:
+        msg = json.loads(raw)
+        data = msg.get("data", msg)
+        if data.get("e") != "kline":
+            return
+        k = data["k"]
+        row = (int(k["t"]), float(k["o"]), float(k["h"]), float(k["l"]), float(k["c"]),
+               float(k["v"]), int(k["T"]), float(k["q"]), int(k["n"]))
+        symbol, interval, closed = k["s"], k["i"], bool(k["x"])
+        buf = self.buffer(symbol, interval)
+        prev_time, prev_closed = buf.last_time(), buf.last_closed
+        buf.update(row, closed)
+        if not buf.ready and not buf.backfilling:
+            # A candle still open when the socket dropped never got its closing frame
+            unclosed = prev_time if prev_time is not None and not prev_closed and row[0] > prev_time else None
+            if unclosed is None and buf.contiguous(INTERVAL_MS.get(interval)):
+                buf.ready = True
+            else:
+                self._start_backfill(symbol, interval, buf, unclosed)
+        if closed:
+            record = np.array([row], dtype=KLINE_DTYPE)[0]
+            if buf.backfilling:
+                buf.pending_closes.append(record)
+            else:
+                self.publish_close(symbol, interval, record)
+
+    def publish_close(self, symbol: str, interval: str, record: np.void) -> None:
+        """Run the candle-close callbacks for one closed candle."""
+        for cb in list(self._callbacks):
+            try:
+                cb(symbol, interval, record)
+            except Exception as e:
+                logger.error(f"Candle close callback failed for {symbol} {interval}: {e}")
+
+    def mark_stale(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """Hold readers off these buffers until their next frame proves there is no gap."""
+        for symbol, interval in pairs:
+            buf = self.buffers.get((symbol.upper(), interval))
+            if buf is not None and len(buf):
+                buf.ready = False
+
+    # -- gap backfill --
+    def _start_backfill(self, symbol: str, interval: str, buf: CandleRingBuffer,
+                        unclosed: Optional[int] = None) -> None:
+        buf.backfilling = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None:
+            self._finish_backfill(symbol, interval, buf, self._fetch_gap(symbol, interval, buf), unclosed)
+        else:
+            # REST fetch off the loop; merging and callbacks stay on the stream thread
+            async def _run():
+                rows = await loop.run_in_executor(None, self._fetch_gap, symbol, interval, buf)
+                self._finish_backfill(symbol, interval, buf, rows, unclosed)
+            loop.create_task(_run())
+
+    def _fetch_gap(self, symbol: str, interval: str, buf: CandleRingBuffer) -> Optional[np.ndarray]:
+        if self._fetch is None:
+            return None
+        try:
+            return self._fetch(symbol, interval, self.capacity)
+        except Exception as e:
+            logger.warning(f"Kline gap backfill failed for {symbol} {interval}: {e}")
+            return None
+
+    def _finish_backfill(self, symbol: str, interval: str, buf: CandleRingBuffer,
+                         rows: Optional[np.ndarray], unclosed: Optional[int] = None) -> None:
+        """
+        Merge fetched candles over the gap and publish the closes missed in it.
+        `unclosed` is the open time of a candle that was still open at the
+        disconnect: its buffered OHLC is partial, so the fetched copy replaces it.
+        """
+        pending, buf.pending_closes = buf.pending_closes, []
+        step = INTERVAL_MS.get(interval)
+        current = buf.snapshot()
+        breaks = np.flatnonzero(np.diff(current["time"]) != step) if step else np.empty(0, dtype=int)
+        gap_from = int(current["time"][breaks[0]]) if len(breaks) else int(current["time"][-1])
+        closes: Dict[int, np.void] = {}
+        fetched = None if rows is None or unclosed is None else np.asarray(rows, dtype=KLINE_DTYPE)
+        if fetched is not None:
+            fetched = fetched[fetched["time"] == unclosed]
+        if rows is None or (unclosed is not None and not len(fetched)):
+            # Nothing to fill the gap with: restart the buffer from the candles streamed after it
+            start = breaks[-1] + 1 if len(breaks) else 0
+            if unclosed is not None:
+                start = max(start, int(np.searchsorted(current["time"], unclosed, side="right")))
+            buf.reset(current[start:])
+            added = np.empty(0, dtype=KLINE_DTYPE)
+        else:
+            added = buf.merge(rows)
+            if unclosed is not None and buf.overwrite(fetched[0]):
+                closes[unclosed] = fetched[0]
+        newest = buf.last_time()
+        closes.update((int(r["time"]), r) for r in added if gap_from < int(r["time"]) < newest)
+        closes.update((int(r["time"]), r) for r in pending)
+        buf.backfilling = False
+        logger.info(f"Backfilled {len(added)} {interval} candles for {symbol} after a stream gap")
+        for t in sorted(closes):
+            self.publish_close(symbol, interval, closes[t])
+        buf.ready = buf.contiguous(step)
+
+    def stream_url(self, pairs: Iterable[Tuple[str, str]]) -> str:
+        streams = "/".join(f"{s.lower()}@kline_{i}" for s, i in pairs)
+        return f"{self.ws_base}/stream?streams={streams}"
+
+    async def run(self, pairs: List[Tuple[str, str]], max_backoff: float = 30.0) -> None:
+        """Consume the combined stream forever, reconnecting with exponential backoff."""
+        import websockets
+
+        url = self.stream_url(pairs)
+        backoff = 1.0
+        while True:
+            try:
+                async with websockets.connect(url, ping_interval=20) as ws:
+                    self.mark_stale(pairs)
+                    self.connected = True
+                    backoff = 1.0
+                    async for raw in ws:
+                        try:
+                            self.handle_message(raw)
+                        except Exception as e:
+                            logger.warning(f"Bad kline frame: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Kline stream disconnected: {e}; reconnecting in {backoff:.0f}s")
+            finally:
+                self.connected = False
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, max_backoff)
+
+    def start_in_thread(self, pairs: List[Tuple[str, str]]) -> threading.Thread:
+        """Run the stream on a private event loop in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+
+        def _target():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._task = self._loop.create_task(self.run(pairs))
+            try:
+                self._loop.run_until_complete(self._task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=_target, name="kline-stream", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        if self._loop and self._task and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+
+kline_stream = KlineStreamService()
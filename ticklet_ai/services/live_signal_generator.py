@@ -3,115 +3,146 @@ Live Signal Generator - Converts real Binance market data into trading signals
 with proper persistence and business logic
 """
 import logging
+import os
 import time
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 import asyncio
 import aiohttp
 from ticklet_ai.services.supabase_client import get_client
+from ticklet_ai.services.binance_scheduler import PRIORITY_HIGH, endpoint_weight, scheduler
+from ticklet_ai.services.kline_stream import kline_stream
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.indicator_engine import IndicatorEngine, indicator_engine
+from ticklet_ai.services.kline_decoder import decode_klines
+from ticklet_ai.services.ticker_snapshot import ticker_snapshot
 from ticklet_ai.services.universe import explicit_env_symbols
 
 logger = logging.getLogger(__name__)
 
+def _close_on_loop(session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Close a session on the loop that owns its connector, never awaiting it from another loop"""
+    if loop is None or loop.is_closed():
+        return  # nothing can run the close any more; the loop's transports are gone with it
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+    else:
+        loop.run_until_complete(session.close())
+
 class LiveSignalGenerator:
     def __init__(self):
         self.binance_base = "https://api.binance.com/api/v3"
         self.supabase = get_client()
         self.active_signals = {}  # Track active signals per symbol
+        self.max_concurrency = int(os.getenv("TICKLET_KLINES_CONCURRENCY", "10"))
+        self.request_timeout = float(os.getenv("TICKLET_HTTP_TIMEOUT_SEC", "10"))
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+        
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared pooled session, recreating it if closed or bound to another loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if self._session is not None and not self._session.closed:
+                # Session belongs to a different loop; its connector must be closed there
+                _close_on_loop(self._session, self._session_loop)
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency * 2, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session (called from the app shutdown hook)"""
+        if self._session is not None and not self._session.closed:
+            if self._session_loop is asyncio.get_running_loop():
+                await self._session.close()
+            else:
+                _close_on_loop(self._session, self._session_loop)
+        self._session = None
+        self._session_loop = None
+        
+    async def _fetch_klines(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                            symbol: str) -> Optional[Candles]:
+        """Fetch 1h klines for one symbol, bounded by the shared semaphore"""
+        streamed = kline_stream.get_klines(symbol, '1h', 100)
+        if streamed is not None:
+            return streamed
+        async with semaphore:
+            try:
+                await scheduler.acquire_async(endpoint_weight("/klines"), PRIORITY_HIGH)
+                async with session.get(
+                    f"{self.binance_base}/klines",
+                    params={
+                        'symbol': symbol,
+                        'interval': '1h',
+                        'limit': 100
+                    },
+                    timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+                ) as kline_resp:
+                    scheduler.observe(kline_resp.headers, kline_resp.status)
+                    if kline_resp.status == 200:
+                        return Candles.from_records(decode_klines(await kline_resp.read()))
+                    logger.warning(f"Failed to fetch klines for {symbol}: {kline_resp.status}")
+            except Exception as e:
+                logger.warning(f"Failed to fetch klines for {symbol}: {e}")
+        return None
         
     async def fetch_market_data(self, symbols: List[str]) -> Dict[str, Any]:
         """Fetch live market data from Binance API"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Get 24hr ticker data for all symbols
-                async with session.get(f"{self.binance_base}/ticker/24hr") as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch ticker data: {response.status}")
-                        return {}
-                    
-                    all_tickers = await response.json()
+            session = await self.get_session()
+            # Get 24hr ticker data for all symbols from the shared snapshot
+            all_tickers = await ticker_snapshot.get_all_async()
+            if not all_tickers:
+                logger.error("Failed to fetch ticker data")
+                return {}
+                
+            # Filter to requested symbols
+            wanted = set(symbols)
+            symbol_data = {}
+            for ticker in all_tickers:
+                if ticker['symbol'] in wanted:
+                    symbol_data[ticker['symbol']] = dict(ticker)
                     
-                # Filter to requested symbols
-                symbol_data = {}
-                for ticker in all_tickers:
-                    if ticker['symbol'] in symbols:
-                        symbol_data[ticker['symbol']] = ticker
+            # Get klines data for technical analysis, fanned out concurrently
+            semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+            targets = [symbol for symbol in symbols if symbol in symbol_data]
+            results = await asyncio.gather(
+                *(self._fetch_klines(session, semaphore, symbol) for symbol in targets)
+            )
+            for symbol, klines in zip(targets, results):
+                if klines is not None:
+                    symbol_data[symbol]['klines'] = klines
                         
-                # Get klines data for technical analysis
-                for symbol in symbols:
-                    if symbol in symbol_data:
-                        try:
-                            async with session.get(
-                                f"{self.binance_base}/klines",
-                                params={
-                                    'symbol': symbol,
-                                    'interval': '1h',
-                                    'limit': 100
-                                }
-                            ) as kline_resp:
-                                if kline_resp.status == 200:
-                                    klines = await kline_resp.json()
-                                    symbol_data[symbol]['klines'] = klines
-                        except Exception as e:
-                            logger.warning(f"Failed to fetch klines for {symbol}: {e}")
-                            
-                return symbol_data
+            return symbol_data
                 
         except Exception as e:
             logger.error(f"Error fetching market data: {e}")
             return {}
     
-    def calculate_technical_indicators(self, klines: List) -> Dict[str, float]:
-        """Calculate technical indicators from klines data"""
-        if not klines or len(klines) < 20:
+    def calculate_technical_indicators(self, klines: List, symbol: Optional[str] = None,
+                                       interval: str = '1h') -> Dict[str, float]:
+        """
+        Calculate technical indicators from klines data
+        With a symbol, the running per-(symbol, interval) state is reused so only
+        newly closed candles are folded in; otherwise the window is computed once.
+        """
+        if klines is None or len(klines) < 20:
             return {}
             
-        closes = [float(k[4]) for k in klines]  # Close prices
-        highs = [float(k[2]) for k in klines]   # High prices
-        lows = [float(k[3]) for k in klines]    # Low prices
-        volumes = [float(k[5]) for k in klines] # Volumes
-        
-        # Simple moving averages
-        sma_20 = sum(closes[-20:]) / 20
-        sma_50 = sum(closes[-50:]) / 50 if len(closes) >= 50 else sma_20
-        
-        # RSI calculation (simplified)
-        gains = []
-        losses = []
-        for i in range(1, min(15, len(closes))):
-            change = closes[i] - closes[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        avg_gain = sum(gains) / len(gains) if gains else 0
-        avg_loss = sum(losses) / len(losses) if losses else 1
-        rs = avg_gain / avg_loss if avg_loss != 0 else 0
-        rsi = 100 - (100 / (1 + rs))
-        
-        # Volatility (ATR approximation)
-        true_ranges = []
-        for i in range(1, min(20, len(klines))):
-            tr = max(
-                highs[i] - lows[i],
-                abs(highs[i] - closes[i-1]),
-                abs(lows[i] - closes[i-1])
-            )
-            true_ranges.append(tr)
-        
-        atr = sum(true_ranges) / len(true_ranges) if true_ranges else 0
+        engine = indicator_engine if symbol else IndicatorEngine()
+        indicators = engine.sync(symbol or '', interval, klines)
         
-        return {
-            'sma_20': sma_20,
-            'sma_50': sma_50,
-            'rsi': rsi,
-            'atr': atr,
-            'current_price': closes[-1],
-            'volume': volumes[-1]
-        }
+        if indicators.get('sma_50') is None:
+            indicators['sma_50'] = indicators['sma_20']
+        if indicators.get('rsi') is None:
+            indicators['rsi'] = 50.0
+        if indicators.get('atr') is None:
+            indicators['atr'] = 0.0
+        return indicators
     
     def generate_signal_from_data(self, symbol: str, ticker_data: Dict, indicators: Dict) -> Optional[Dict]:
         """Generate trading signal based on market data and indicators"""
@@ -285,7 +316,7 @@ class LiveSignalGenerator:
                 try:
                     # Calculate technical indicators
                     klines = ticker_data.get('klines', [])
-                    indicators = self.calculate_technical_indicators(klines)
+                    indicators = self.calculate_technical_indicators(klines, symbol, '1h')
                     
                     # Generate signal
                     signal = self.generate_signal_from_data(symbol, ticker_data, indicators)
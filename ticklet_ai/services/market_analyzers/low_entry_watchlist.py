@@ -1,6 +1,6 @@
-import talib
 import numpy as np
 from ticklet_ai.services.data_sources import get_klines_from_exchange
+from ticklet_ai.services.indicator_panel import load_panel
 from ticklet_ai.services.ai_helpers.low_entry_commentator import analyze_entry_opportunity
 
 def get_low_entry_watchlist(symbols: list[str], interval: str = "5m", lookback: int = 50) -> list[dict]:
@@ -17,59 +17,54 @@ def get_low_entry_watchlist(symbols: list[str], interval: str = "5m", lookback:
     """
     low_entry_watchlist = []
 
-    for symbol in symbols:
-        # Pull live candlestick data
-        candles = get_klines_from_exchange(symbol, interval, lookback)
-        if not candles or len(candles) < lookback:
-            # Skip if insufficient data is retrieved
-            continue
+    # Pull live candlestick data for the whole list; symbols with insufficient data are left out
+    panel = load_panel(symbols, interval, lookback, fetch=get_klines_from_exchange)
+    if not len(panel):
+        return low_entry_watchlist
 
-        # Extract closing prices
-        closing_prices = np.array([candle['close'] for candle in candles])
-        highs = np.array([candle['high'] for candle in candles])
-        lows = np.array([candle['low'] for candle in candles])
+    # Indicators for every symbol in one vectorized pass (TA-Lib compatible)
+    closing_prices = panel.close[:, -1]
+    ema_21 = panel.ema(21)[:, -1]
+    rsi = panel.rsi(14)[:, -1]
+    macd, macdsignal, macdhist = (a[:, -1] for a in panel.macd(12, 26, 9))
+    atr = panel.atr(14)[:, -1]
 
-        # Calculate TA-Lib indicators
-        ema_21 = talib.EMA(closing_prices, timeperiod=21)
-        rsi = talib.RSI(closing_prices, timeperiod=14)
-        macd, macdsignal, macdhist = talib.MACD(closing_prices, fastperiod=12, slowperiod=26, signalperiod=9)
-        atr = talib.ATR(highs, lows, closing_prices, timeperiod=14)
+    # Low entry condition: close < ema_21 AND rsi < 40 AND macdhist < 0
+    low_entry = (closing_prices < ema_21) & (rsi < 40) & (macdhist < 0)
 
-        # Get current values
-        current_price = closing_prices[-1]
-        current_ema_21 = ema_21[-1]
-        current_rsi = rsi[-1]
-        current_macdhist = macdhist[-1]
-        current_atr = atr[-1]
+    for i in np.flatnonzero(low_entry):
+        symbol = panel.symbols[i]
+        current_price = float(closing_prices[i])
+        current_rsi = float(rsi[i])
+        current_macdhist = float(macdhist[i])
+        current_atr = float(atr[i])
 
-        # Low entry condition: close < ema_21 AND rsi < 40 AND macdhist < 0
-        if current_price < current_ema_21 and current_rsi < 40 and current_macdhist < 0:
-            # Estimate projected entry price
-            projected_entry = current_price - (current_atr * 0.8)
+        # Estimate projected entry price
+        projected_entry = current_price - (current_atr * 0.8)
 
-            # Call AI module for commentary and recommendation
-            ai_analysis = analyze_entry_opportunity(symbol, {
-                "current_price": current_price,
-                "projected_entry": projected_entry,
-                "rsi": current_rsi,
-                "macdhist": current_macdhist,
-                "atr": current_atr
-            })
+        # Call AI module for commentary and recommendation
+        ai_analysis = analyze_entry_opportunity(symbol, {
+            "current_price": current_price,
+            "projected_entry": projected_entry,
+            "rsi": current_rsi,
+            "macdhist": current_macdhist,
+            "atr": current_atr
+        })
 
-            # Add to watchlist
-            low_entry_watchlist.append({
-                "symbol": symbol,
-                "current_price": round(current_price, 6),
-                "projected_entry": round(projected_entry, 6),
-                "status": "Retest Expected",
-                "commentary": ai_analysis["commentary"],
-                "ai_recommendation": {
-                    "confidence": ai_analysis["confidence"],
-                    "leverage": ai_analysis["leverage"],
-                    "position_size_pct": ai_analysis["position_size_pct"],
-                    "timeframe": ai_analysis["timeframe"]
-                }
-            })
+        # Add to watchlist
+        low_entry_watchlist.append({
+            "symbol": symbol,
+            "current_price": round(current_price, 6),
+            "projected_entry": round(projected_entry, 6),
+            "status": "Retest Expected",
+            "commentary": ai_analysis["commentary"],
+            "ai_recommendation": {
+                "confidence": ai_analysis["confidence"],
+                "leverage": ai_analysis["leverage"],
+                "position_size_pct": ai_analysis["position_size_pct"],
+                "timeframe": ai_analysis["timeframe"]
+            }
+        })
 
     # Sort by highest AI confidence score
     low_entry_watchlist.sort(key=lambda x: x["ai_recommendation"]["confidence"], reverse=True)
@@ -1,5 +1,6 @@
 from ticklet_ai.services.data_sources import get_klines_from_exchange
 from ticklet_ai.services.ai_helpers.bounce_predictor import score_bounce
+from ticklet_ai.services.candles import Candles
 import numpy as np
 
 def get_near_lows(all_candles: dict, threshold: float = 0.03) -> list[dict]:
@@ -7,7 +8,7 @@ def get_near_lows(all_candles: dict, threshold: float = 0.03) -> list[dict]:
     Detect symbols trading near their lowest price over a recent window.
 
     Args:
-        all_candles (dict): Dictionary where keys are symbols and values are lists of candle data.
+        all_candles (dict): Dictionary where keys are symbols and values are Candles (or lists of candle dicts).
         threshold (float): Percentage threshold from the low to filter symbols.
 
     Returns:
@@ -20,8 +21,8 @@ def get_near_lows(all_candles: dict, threshold: float = 0.03) -> list[dict]:
         if len(candles) < 50:
             continue
 
-        # Extract closing prices from the last 50 candles
-        closing_prices = np.array([candle['close'] for candle in candles[-50:]])
+        # Closing prices from the last 50 candles
+        closing_prices = Candles.coerce(candles).close[-50:]
 
         # Calculate the lowest closing price over the lookback period
         lookback_low = np.min(closing_prices)
@@ -1,60 +1,64 @@
-import requests
+from ticklet_ai.services.binance_scheduler import PRIORITY_NORMAL, binance_get
+import numpy as np
 from typing import List, Dict, Any
 import time
+from ticklet_ai.services.candle_store import load_klines
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.kline_decoder import decode_klines
+from ticklet_ai.services.single_flight import flights
+from ticklet_ai.services.ticker_snapshot import ticker_snapshot
 
 BINANCE_API_BASE = "https://api.binance.com/api/v3"
 
-def get_klines(symbol: str, interval: str, limit: int = 1000, start_time: int = None, end_time: int = None) -> List[Dict[str, Any]]:
+def fetch_raw_klines(symbol: str, interval: str, limit: int, start_time: int = None, end_time: int = None,
+                     priority: int = PRIORITY_NORMAL) -> np.ndarray:
     """
-    Fetch historical klines from Binance API
-    Returns list of candles with OHLCV data
+    Fetch klines from Binance, decoded straight into a KLINE_DTYPE record array
+    Identical concurrent requests share one upstream call (treat the result as read-only)
     """
-    try:
-        url = f"{BINANCE_API_BASE}/klines"
-        params = {
-            "symbol": symbol,
-            "interval": interval,
-            "limit": min(limit, 1000)  # Binance limit
-        }
-        
-        if start_time:
-            params["startTime"] = start_time
-        if end_time:
-            params["endTime"] = end_time
-            
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        raw_klines = response.json()
+    key = ("klines", symbol.upper(), interval, min(limit, 1000), start_time, end_time)
+    return flights.do(key, lambda: _request_klines(symbol, interval, limit, start_time, end_time, priority))
+
+def _request_klines(symbol: str, interval: str, limit: int, start_time: int, end_time: int,
+                    priority: int) -> np.ndarray:
+    params = {
+        "symbol": symbol,
+        "interval": interval,
+        "limit": min(limit, 1000)  # Binance limit
+    }
+    
+    if start_time:
+        params["startTime"] = start_time
+    if end_time:
+        params["endTime"] = end_time
         
-        # Convert to standardized format
-        klines = []
-        for kline in raw_klines:
-            klines.append({
-                "time": int(kline[0]),
-                "open": float(kline[1]),
-                "high": float(kline[2]),
-                "low": float(kline[3]),
-                "close": float(kline[4]),
-                "volume": float(kline[5]),
-                "close_time": int(kline[6]),
-                "quote_volume": float(kline[7]),
-                "trades_count": int(kline[8])
-            })
-            
-        return klines
+    response = binance_get("/klines", params, priority=priority)
+    response.raise_for_status()
+    
+    return decode_klines(response.content)
+
+def get_klines(symbol: str, interval: str, limit: int = 1000, start_time: int = None, end_time: int = None) -> Candles:
+    """
+    Fetch historical klines, served from the local candle store where possible
+    Returns array-backed Candles (iterates as kline dicts for older callers)
+    """
+    try:
+        rows = load_klines(fetch_raw_klines, symbol, interval, limit, start_time, end_time)
+        return Candles.from_records(rows)
         
     except Exception as e:
         print(f"Error fetching klines for {symbol}: {e}")
-        return []
+        return Candles.empty()
 
 def get_24hr_ticker(symbol: str) -> Dict[str, Any]:
     """Get 24hr ticker statistics for a symbol"""
+    cached = ticker_snapshot.get(symbol)
+    if cached is not None:
+        return cached
     try:
-        url = f"{BINANCE_API_BASE}/ticker/24hr"
         params = {"symbol": symbol}
         
-        response = requests.get(url, params=params, timeout=10)
+        response = binance_get("/ticker/24hr", params)
         response.raise_for_status()
         
         return response.json()
@@ -63,13 +67,15 @@ def get_24hr_ticker(symbol: str) -> Dict[str, Any]:
         print(f"Error fetching ticker for {symbol}: {e}")
         return {}
 
+def _request_exchange_info() -> Dict[str, Any]:
+    response = binance_get("/exchangeInfo")
+    response.raise_for_status()
+    return response.json()
+
 def get_exchange_info() -> Dict[str, Any]:
     """Get exchange information including symbols"""
     try:
-        url = f"{BINANCE_API_BASE}/exchangeInfo"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return flights.do(("exchangeInfo",), _request_exchange_info)
     except Exception as e:
         print(f"Error fetching exchange info: {e}")
         return {}
\ No newline at end of file
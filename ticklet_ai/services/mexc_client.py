@@ -20,7 +20,12 @@ class MexcClient:
         return self.adapters.positions.read(symbol)
 
     def get_24h_volume_usdt(self, symbol) -> float:
-        return self.adapters.market.volume_usdt(symbol)
+        market = getattr(self.adapters, "market", None)
+        if market is not None:
+            return market.volume_usdt(symbol)
+        # No exchange adapter wired: fall back to the shared Binance 24h snapshot
+        from ticklet_ai.services.ticker_snapshot import ticker_snapshot
+        return ticker_snapshot.quote_volume(symbol)
 
     def add_margin(self, symbol, amount_usdt: float):
         return self.adapters.positions.add_margin(symbol, amount_usdt)
@@ -25,11 +25,15 @@ def _load() -> Tuple[pd.DataFrame, pd.Series]:
     y = df["win"].astype(int)
     return X, y
 
+def fit_model(X: pd.DataFrame, y: pd.Series, n_jobs: int = -1) -> RandomForestClassifier:
+    """The win classifier used by train() and walk-forward folds."""
+    model = RandomForestClassifier(n_estimators=300, min_samples_split=4, min_samples_leaf=2, n_jobs=n_jobs, random_state=42)
+    return model.fit(X, y)
+
 def train() -> Dict[str, Any]:
     X, y = _load()
     Xtr, Xte, ytr, yte = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-    model = RandomForestClassifier(n_estimators=300, min_samples_split=4, min_samples_leaf=2, n_jobs=-1, random_state=42)
-    model.fit(Xtr, ytr)
+    model = fit_model(Xtr, ytr)
     yhat = model.predict(Xte)
     acc = accuracy_score(yte, yhat)
     try:
@@ -1,5 +1,6 @@
-import joblib, pandas as pd
+import joblib, numpy as np, pandas as pd
 from pathlib import Path
+from typing import List, Optional
 from ..utils.paths import MODELS_DIR
 
 MODEL = MODELS_DIR / "rf_model.pkl"
@@ -7,12 +8,46 @@ FEATURE_COLS = ["rsi","macd","vol","atr","ema_fast","ema_slow","bb_upper","bb_lo
                 "funding_rate","spread","bid_ask_imbalance","volatility","regime",
                 "trending_score","anomaly_score"]
 
+def load_model(path: Path = MODEL):
+    """The trained model, or None when none has been trained yet."""
+    if not path.exists():
+        return None
+    return joblib.load(path)
+
+def feature_row(features: dict) -> List[float]:
+    return [float(features.get(k, 0.0)) for k in FEATURE_COLS]
+
+def feature_frame(rows: List[dict]) -> pd.DataFrame:
+    return pd.DataFrame([feature_row(f) for f in rows], columns=FEATURE_COLS)
+
 def predict_win_prob(features: dict) -> float:
-    if not MODEL.exists():
-        return 0.50
-    model = joblib.load(MODEL)
-    x = pd.DataFrame([{k: float(features.get(k, 0.0)) for k in FEATURE_COLS}])
+    model = load_model()
     proba = getattr(model, "predict_proba", None)
     if proba is None:
         return 0.50
-    return float(proba(x)[:,1][0])
\ No newline at end of file
+    return float(proba(feature_frame([features]))[:,1][0])
+
+def predict_win_probs(rows: List[Optional[dict]], model=None) -> np.ndarray:
+    """
+    Win probabilities for many feature dicts: one model load and one
+    predict_proba call. Rows that are None or not numeric get 0.5, as do all
+    rows when no model has been trained.
+    """
+    out = np.full(len(rows), 0.50)
+    if not rows:
+        return out
+    proba = getattr(load_model() if model is None else model, "predict_proba", None)
+    if proba is None:
+        return out
+    keep, matrix = [], []
+    for i, features in enumerate(rows):
+        if features is None:
+            continue
+        try:
+            matrix.append(feature_row(features))
+        except (TypeError, ValueError):
+            continue
+        keep.append(i)
+    if keep:
+        out[keep] = proba(pd.DataFrame(matrix, columns=FEATURE_COLS))[:,1]
+    return out
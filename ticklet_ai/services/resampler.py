@@ -0,0 +1,147 @@
+"""
+Multi-timeframe resampling.
+
+Derives higher timeframes from one base interval per symbol so that every
+timeframe is built from the same candles. ``resample`` is the batch path;
+``TimeframeResampler`` folds closed base candles into the derived timeframes
+incrementally and emits a "candle closed" event per derived timeframe.
+"""
+import logging
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ticklet_ai.services.candle_store import INTERVAL_MS, KLINE_DTYPE
+
+logger = logging.getLogger(__name__)
+
+CloseCallback = Callable[[str, str, np.void], None]
+
+
+def resample_base() -> Optional[str]:
+    """Base interval to derive strategy timeframes from (TICKLET_RESAMPLE_BASE), or None to stream each."""
+    base = os.getenv("TICKLET_RESAMPLE_BASE", "").strip()
+    return base if base in INTERVAL_MS else None
+
+
+def can_derive(base_interval: str, target_interval: str) -> bool:
+    base, target = INTERVAL_MS.get(base_interval), INTERVAL_MS.get(target_interval)
+    return bool(base and target and target >= base and target % base == 0)
+
+
+def resample(rows: np.ndarray, base_interval: str, target_interval: str,
+             drop_partial_head: bool = True) -> np.ndarray:
+    """
+    Aggregate base candles into `target_interval` candles (OHLC first/max/min/last,
+    volumes and trade counts summed). A trailing partial bucket is kept as the
+    in-progress candle; a leading partial bucket is dropped because its open is unknown.
+    """
+    if not can_derive(base_interval, target_interval):
+        raise ValueError(f"cannot derive {target_interval} from {base_interval}")
+    base_ms, target_ms = INTERVAL_MS[base_interval], INTERVAL_MS[target_interval]
+    if len(rows) == 0:
+        return np.empty(0, dtype=KLINE_DTYPE)
+    if base_ms == target_ms:
+        return np.array(rows, dtype=KLINE_DTYPE)
+
+    buckets = (rows["time"] // target_ms) * target_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(rows)] - 1
+
+    out = np.empty(len(starts), dtype=KLINE_DTYPE)
+    out["time"] = buckets[starts]
+    out["open"] = rows["open"][starts]
+    out["high"] = np.maximum.reduceat(rows["high"], starts)
+    out["low"] = np.minimum.reduceat(rows["low"], starts)
+    out["close"] = rows["close"][ends]
+    out["volume"] = np.add.reduceat(rows["volume"], starts)
+    out["close_time"] = out["time"] + target_ms - 1
+    out["quote_volume"] = np.add.reduceat(rows["quote_volume"], starts)
+    out["trades_count"] = np.add.reduceat(rows["trades_count"], starts)
+
+    if drop_partial_head and len(out) and rows["time"][0] != out["time"][0]:
+        out = out[1:]
+    return out
+
+
+class TimeframeResampler:
+    """Incrementally folds closed base candles into derived timeframe candles."""
+
+    def __init__(self, base_interval: str, targets: Iterable[str]):
+        self.base_interval = base_interval
+        self.base_ms = INTERVAL_MS[base_interval]
+        self.targets = [t for t in targets if t != base_interval and can_derive(base_interval, t)]
+        self._partial: Dict[Tuple[str, str], np.ndarray] = {}
+        self._callbacks: List[CloseCallback] = []
+        self._lock = threading.Lock()
+
+    def on_candle_close(self, callback: CloseCallback) -> None:
+        self._callbacks.append(callback)
+
+    def partial(self, symbol: str, interval: str) -> Optional[np.void]:
+        rec = self._partial.get((symbol.upper(), interval))
+        return None if rec is None else rec[0]
+
+    def add(self, symbol: str, row: np.void) -> List[Tuple[str, np.void, bool]]:
+        """
+        Fold one closed base candle in. Returns (interval, candle, closed) for every
+        derived timeframe; closed candles are also published to the callbacks.
+        """
+        symbol = symbol.upper()
+        updates = []
+        with self._lock:
+            for interval in self.targets:
+                target_ms = INTERVAL_MS[interval]
+                bucket = (int(row["time"]) // target_ms) * target_ms
+                key = (symbol, interval)
+                cur = self._partial.get(key)
+                if cur is None or int(cur["time"][0]) != bucket:
+                    if int(row["time"]) != bucket:
+                        continue  # joined mid-bucket: wait for the next full bucket
+                    cur = np.zeros(1, dtype=KLINE_DTYPE)
+                    cur["time"] = bucket
+                    cur["open"] = row["open"]
+                    cur["high"] = row["high"]
+                    cur["low"] = row["low"]
+                    cur["close_time"] = bucket + target_ms - 1
+                    self._partial[key] = cur
+                cur["high"] = max(float(cur["high"][0]), float(row["high"]))
+                cur["low"] = min(float(cur["low"][0]), float(row["low"]))
+                cur["close"] = row["close"]
+                cur["volume"] += row["volume"]
+                cur["quote_volume"] += row["quote_volume"]
+                cur["trades_count"] += row["trades_count"]
+                closed = int(row["time"]) + self.base_ms >= bucket + target_ms
+                updates.append((interval, cur[0].copy(), closed))
+                if closed:
+                    del self._partial[key]
+        for interval, candle, closed in updates:
+            if not closed:
+                continue
+            for cb in list(self._callbacks):
+                try:
+                    cb(symbol, interval, candle)
+                except Exception as e:
+                    logger.error(f"Resampled close callback failed for {symbol} {interval}: {e}")
+        return updates
+
+    def attach(self, stream) -> None:
+        """
+        Feed from a KlineStreamService: base closes are folded in and the derived
+        candles are written to the stream's buffers, so readers of any derived
+        timeframe are served from the single base subscription. Closed derived
+        candles go through the stream's close dispatch, so consumers attached
+        to the stream (indicator engine, regime labeller) see them like
+        streamed closes.
+        """
+        def _on_close(symbol: str, interval: str, row: np.void) -> None:
+            if interval != self.base_interval:
+                return
+            for target, candle, closed in self.add(symbol, row):
+                stream.buffer(symbol, target).update(tuple(candle.tolist()), closed)
+                if closed:
+                    stream.publish_close(symbol.upper(), target, candle)
+
+        stream.on_candle_close(_on_close)
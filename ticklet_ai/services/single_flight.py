@@ -0,0 +1,67 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key while a call is already in flight
+wait for that call and share its result (or exception) instead of issuing a
+duplicate upstream request. Nothing is cached once the call completes.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Dedupes identical in-flight calls across threads (``do``) and within an event loop (``do_async``)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop_key = (id(asyncio.get_running_loop()), key)
+        fut = self._async_calls.get(loop_key)
+        if fut is not None:
+            # shield: a cancelled follower must not cancel the shared call
+            return await asyncio.shield(fut)
+        fut = asyncio.ensure_future(fn())
+        self._async_calls[loop_key] = fut
+        fut.add_done_callback(lambda _: self._async_calls.pop(loop_key, None))
+        return await asyncio.shield(fut)
+
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._async_calls)
+
+
+flights = SingleFlight()
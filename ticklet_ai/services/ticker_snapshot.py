@@ -0,0 +1,80 @@
+"""
+Shared 24h ticker snapshot.
+
+One ``/ticker/24hr`` download (all symbols) is cached for a TTL and indexed
+by symbol, so the universe ranking, live signal scans and volume checks stop
+downloading the multi-hundred-KB payload independently.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ticklet_ai.services.binance_scheduler import PRIORITY_HIGH, binance_get
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SEC = float(os.getenv("TICKLET_TICKER_TTL_SEC", "30"))
+
+
+class TickerSnapshot:
+    """TTL-refreshed, symbol-indexed copy of the full 24h ticker."""
+
+    def __init__(self, ttl_sec: float = DEFAULT_TTL_SEC, fetch=None):
+        self.ttl_sec = ttl_sec
+        self._fetch = fetch or self._fetch_all
+        self._tickers: List[Dict[str, Any]] = []
+        self._by_symbol: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fetch_all() -> List[Dict[str, Any]]:
+        response = binance_get("/ticker/24hr", priority=PRIORITY_HIGH)
+        response.raise_for_status()
+        return response.json()
+
+    def _fresh(self) -> bool:
+        return bool(self._tickers) and (time.monotonic() - self._fetched_at) < self.ttl_sec
+
+    def refresh(self, force: bool = False) -> List[Dict[str, Any]]:
+        """Re-download the snapshot if it has expired; concurrent callers share one download."""
+        if not force and self._fresh():
+            return self._tickers
+        with self._lock:
+            if not force and self._fresh():
+                return self._tickers
+            try:
+                tickers = self._fetch()
+            except Exception as e:
+                # Serve the stale snapshot rather than nothing
+                logger.error(f"Error refreshing 24h ticker snapshot: {e}")
+                return self._tickers
+            self._tickers = tickers
+            self._by_symbol = {t.get("symbol"): t for t in tickers}
+            self._fetched_at = time.monotonic()
+            return self._tickers
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        return self.refresh()
+
+    async def get_all_async(self) -> List[Dict[str, Any]]:
+        if self._fresh():
+            return self._tickers
+        return await asyncio.to_thread(self.refresh)
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        return self._by_symbol.get(symbol.upper())
+
+    def quote_volume(self, symbol: str) -> float:
+        ticker = self.get(symbol)
+        try:
+            return float((ticker or {}).get("quoteVolume") or 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+
+
+ticker_snapshot = TickerSnapshot()
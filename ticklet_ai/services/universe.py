@@ -6,9 +6,8 @@ Priority:
 2) If 'any', use per-strategy declared symbols (registry), when provided.
 3) Otherwise, auto-select a universe from Binance (top USDT pairs by 24h quote volume, filters applied).
 """
-import os, requests
-
-BINANCE_TICKER_24H = "https://api.binance.com/api/v3/ticker/24hr"
+import os
+from ticklet_ai.services.ticker_snapshot import ticker_snapshot
 
 def explicit_env_symbols() -> list[str] | None:
     raw = os.getenv("TICKLET_SYMBOLS","any").strip()
@@ -19,9 +18,7 @@ def explicit_env_symbols() -> list[str] | None:
 def default_auto_symbols(limit: int = 40, min_quote_volume: float = 100_000.0) -> list[str]:
     # USDT pairs by quote volume (desc)
     try:
-        r = requests.get(BINANCE_TICKER_24H, timeout=10)
-        r.raise_for_status()
-        data = r.json()
+        data = ticker_snapshot.get_all()
         ranked = sorted(
             [d for d in data if d.get("symbol","").endswith("USDT")],
             key=lambda d: float(d.get("quoteVolume") or 0.0),
@@ -0,0 +1,203 @@
+"""
+Walk-forward backtests.
+
+Slides rolling train/test windows over a long candle history. For each fold
+the ml_core model is retrained on the trades of the train window and scores
+the trades of the following test window, so every reported prediction is out
+of sample.
+
+Candidate trades (strategy signals, their ML features and simulated
+outcomes) are built in fixed blocks of candles and cached per block in the
+shared indicator cache. Overlapping folds slice the same arrays, and a
+rerun over an extended or rolled history only rescans the blocks at its
+edges. Folds are trained in parallel processes.
+"""
+import os
+import time
+import uuid
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ticklet_ai.services.backtest import (
+    BacktestParams, ProgressCallback, _get_strategy_evaluator, _scan_candidates, _simulate_trade_outcomes,
+    load_backtest_candles,
+)
+from ticklet_ai.services.batch_backtest import process_pool
+from ticklet_ai.services.candle_store import INTERVAL_MS
+from ticklet_ai.services.candles import Candles
+from ticklet_ai.services.indicator_cache import IndicatorCache, indicator_cache, window_key
+from ticklet_ai.services.leverage import resolve_leverage
+from ticklet_ai.services.ml_infer import FEATURE_COLS, feature_row
+
+DEFAULT_WORKERS = int(os.getenv("TICKLET_WALKFORWARD_WORKERS", str(os.cpu_count() or 2)))
+HORIZON = 20  # candles a trade can stay open (see _simulate_trade_outcomes)
+CHUNK_CANDLES = int(os.getenv("TICKLET_WALKFORWARD_CHUNK", "500"))  # candles per cached candidate block
+
+
+@dataclass
+class WalkForwardParams:
+    train_candles: int = 2000
+    test_candles: int = 500
+    step_candles: Optional[int] = None  # defaults to test_candles (adjacent test windows)
+    min_train_trades: int = 50
+    threshold: float = 0.5  # minimum win probability to take a test trade
+
+
+def fold_ranges(n: int, train: int, test: int, step: Optional[int] = None) -> List[Tuple[int, int, int, int]]:
+    """(train_start, train_end, test_start, test_end) candle index ranges, ends exclusive."""
+    step = step or test
+    return [(s, s + train, s + train, s + train + test) for s in range(0, n - train - test + 1, step)]
+
+
+def _chunks(time: np.ndarray, interval: str) -> List[Tuple[int, int]]:
+    """(start, end) index ranges of the candles in each CHUNK_CANDLES-long block of open time."""
+    step = INTERVAL_MS.get(interval) or (int(time[1] - time[0]) if len(time) > 1 else 1)
+    block = time // (step * CHUNK_CANDLES)
+    edges = [0, *(np.flatnonzero(np.diff(block)) + 1).tolist(), len(time)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _scan(params: BacktestParams, klines: Candles,
+          leverage: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Candidates of one candle range as (open time, feature matrix, pnl_abs, win)."""
+    pending = _scan_candidates(params, klines, _get_strategy_evaluator(params.strategy_name))
+    outcomes = _simulate_trade_outcomes([p[2] for p in pending], [p[0] for p in pending], klines, leverage)
+    index, rows, pnl, win = [], [], [], []
+    for (i, _, _, _, _, features), outcome in zip(pending, outcomes):
+        if not outcome or features is None:
+            continue
+        try:
+            rows.append(feature_row(features))
+        except (TypeError, ValueError):
+            continue
+        index.append(i)
+        pnl.append(outcome["pnl_abs"])
+        win.append(outcome["win"])
+    return (klines.time[np.asarray(index, dtype=np.int64)],
+            np.asarray(rows, dtype=float).reshape(-1, len(FEATURE_COLS)),
+            np.asarray(pnl, dtype=float), np.asarray(win, dtype=bool))
+
+
+def build_candidates(params: BacktestParams, klines: Candles,
+                     cache: Optional[IndicatorCache] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every candidate trade in the history as (candle index, feature matrix,
+    pnl_abs, win), in candle order. Candidates without numeric features or
+    without an outcome are left out.
+
+    The history is scanned in blocks of CHUNK_CANDLES candles aligned on open
+    time, each together with the HORIZON candles after it that its outcomes
+    look at, and every block is cached under its own candle window. Extending
+    the history or moving its start rescans only the blocks whose candles
+    changed.
+    """
+    leverage = resolve_leverage(10)
+    if not len(klines):
+        return _scan(params, klines, leverage)
+    cache = cache or indicator_cache
+    key = (params.strategy_name, params.min_volume, params.min_confidence_pct, leverage, CHUNK_CANDLES)
+    parts = []
+    for start, end in _chunks(klines.time, params.interval):
+        chunk = klines[start:min(end + HORIZON, len(klines))]
+        window = window_key(chunk.time, chunk.high, chunk.low, chunk.close)
+        parts.append(cache.get_or_compute(params.symbol, params.interval, "walk_forward_candidates", key, window,
+                                          lambda chunk=chunk: _scan(params, chunk, leverage)))
+    times, X, pnl, win = (np.concatenate(cols) for cols in zip(*parts))
+    return np.searchsorted(klines.time, times), X, pnl, win
+
+
+def _metrics(pnl: np.ndarray, win: np.ndarray) -> Dict[str, Any]:
+    n = len(pnl)
+    return {"trades": n, "wins": int(win.sum()), "win_rate": float(win.mean()) if n else 0.0,
+            "pnl_abs": round(float(pnl.sum()), 2)}
+
+
+def _run_fold(fold: Dict[str, Any], X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray,
+              y_test: np.ndarray, pnl_test: np.ndarray, wf: WalkForwardParams) -> Dict[str, Any]:
+    """Retrain on one train window and evaluate its test window."""
+    from sklearn.metrics import roc_auc_score
+    from ticklet_ai.services.ml_core import fit_model
+
+    fold = dict(fold, train_trades=len(y_train), baseline=_metrics(pnl_test, y_test))
+    if len(y_train) < wf.min_train_trades or len(np.unique(y_train)) < 2:
+        fold["skipped"] = "not enough train trades of both outcomes"
+        return fold
+    model = fit_model(pd.DataFrame(X_train, columns=FEATURE_COLS), y_train.astype(int), n_jobs=1)
+    if not len(y_test):
+        fold["filtered"] = _metrics(pnl_test, y_test)
+        return fold
+    probs = model.predict_proba(pd.DataFrame(X_test, columns=FEATURE_COLS))[:, 1]
+    take = probs >= wf.threshold
+    fold["accuracy"] = round(float(((probs >= 0.5) == y_test).mean()), 4)
+    fold["auc"] = round(float(roc_auc_score(y_test, probs)), 4) if len(np.unique(y_test)) == 2 else None
+    fold["filtered"] = _metrics(pnl_test[take], y_test[take])
+    return fold
+
+
+def _sum_metrics(folds: List[Dict[str, Any]], name: str) -> Dict[str, Any]:
+    parts = [f[name] for f in folds if name in f]
+    trades = sum(p["trades"] for p in parts)
+    wins = sum(p["wins"] for p in parts)
+    return {"trades": trades, "wins": wins, "win_rate": (wins / trades) if trades else 0.0,
+            "pnl_abs": round(sum(p["pnl_abs"] for p in parts), 2)}
+
+
+def run_walk_forward(params: BacktestParams, wf: Optional[WalkForwardParams] = None,
+                     klines: Optional[Candles] = None, max_workers: Optional[int] = None,
+                     on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """
+    Walk-forward backtest over `params`' history (or `klines`). Train
+    candidates whose 20-candle outcome would reach into the test window are
+    dropped from that fold's training set. `on_progress` is called with the
+    number of finished folds.
+    """
+    wf = wf or WalkForwardParams()
+    started = time.time()
+    klines = Candles.coerce(load_backtest_candles(params) if klines is None else klines)
+    ranges = fold_ranges(len(klines), wf.train_candles, wf.test_candles, wf.step_candles)
+    if not ranges:
+        return {"error": f"Need at least {wf.train_candles + wf.test_candles} candles, got {len(klines)}",
+                "folds": []}
+
+    index, X, pnl, win = build_candidates(params, klines)
+    jobs = []
+    for k, (train_start, train_end, test_start, test_end) in enumerate(ranges):
+        tr = slice(*np.searchsorted(index, [train_start, train_end - HORIZON]))
+        te = slice(*np.searchsorted(index, [test_start, test_end]))
+        fold = {"fold": k,
+                "train_start": int(klines.time[train_start]), "train_end": int(klines.time[train_end - 1]),
+                "test_start": int(klines.time[test_start]), "test_end": int(klines.time[test_end - 1])}
+        jobs.append((fold, X[tr], win[tr], X[te], win[te], pnl[te], wf))
+
+    workers = max(1, min(max_workers or DEFAULT_WORKERS, len(jobs)))
+    folds: List[Dict[str, Any]] = []
+    if on_progress is not None:
+        on_progress(0, len(jobs), {"folds": 0, "candidates": len(index)})
+    with ExitStack() as stack:
+        if workers == 1:
+            done = (_run_fold(*job) for job in jobs)
+        else:
+            done = stack.enter_context(process_pool(workers)).map(_run_fold, *zip(*jobs))
+        for fold in done:
+            folds.append(fold)
+            if on_progress is not None:
+                on_progress(len(folds), len(jobs), {"folds": len(folds), "candidates": len(index)})
+
+    return {
+        "id": str(uuid.uuid4()),
+        "strategy": params.strategy_name,
+        "symbol": params.symbol,
+        "interval": params.interval,
+        "data_points": len(klines),
+        "candidates": len(index),
+        "folds": folds,
+        "baseline": _sum_metrics(folds, "baseline"),
+        "filtered": _sum_metrics(folds, "filtered"),
+        "threshold": wf.threshold,
+        "duration_s": round(time.time() - started, 2),
+        "timestamp": int(time.time()),
+    }
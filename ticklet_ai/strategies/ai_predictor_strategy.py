@@ -6,9 +6,12 @@ Integrates with AI models for advanced signal generation.
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Optional, Tuple
 import logging
 
+from ticklet_ai.services.rolling_quantile import tercile_regime
+
 logger = logging.getLogger(__name__)
 
 class AIPredictorStrategy:
@@ -89,25 +92,34 @@ class AIPredictorStrategy:
         lower = sma - (std * 2)
         return upper, lower
     
-    def _detect_patterns(self, prices: pd.Series) -> pd.Series:
+    def _detect_patterns(self, prices: pd.Series, window: int = 10) -> pd.Series:
         """Detect price patterns using pattern recognition"""
-        patterns = pd.Series(0.0, index=prices.index)
+        values = prices.to_numpy(dtype=float)
+        patterns = np.zeros(len(values))
+        n_windows = len(values) - window
+        if n_windows <= 0:
+            return pd.Series(patterns, index=prices.index)
         
-        # Simple pattern detection (can be enhanced with ML)
-        for i in range(10, len(prices)):
-            window = prices.iloc[i-10:i]
-            
-            # Ascending triangle pattern
-            if self._is_ascending_triangle(window):
-                patterns.iloc[i] = 0.8
-            # Double bottom pattern
-            elif self._is_double_bottom(window):
-                patterns.iloc[i] = 0.7
-            # Cup and handle pattern
-            elif self._is_cup_handle(window):
-                patterns.iloc[i] = 0.6
+        # Row k is the window prices[k:k+window], scored into position k+window
+        windows = sliding_window_view(values, window)[:n_windows]
+        scores = np.select(
+            [self._ascending_triangle_mask(windows), self._double_bottom_mask(windows), self._cup_handle_mask(windows)],
+            [0.8, 0.7, 0.6], default=0.0)
+        
+        # Windows with gaps keep the per-window checks (pandas NaN handling)
+        for k in np.flatnonzero(~np.isfinite(windows).all(axis=1)):
+            current = prices.iloc[k:k + window]
+            if self._is_ascending_triangle(current):
+                scores[k] = 0.8
+            elif self._is_double_bottom(current):
+                scores[k] = 0.7
+            elif self._is_cup_handle(current):
+                scores[k] = 0.6
+            else:
+                scores[k] = 0.0
         
-        return patterns
+        patterns[window:] = scores
+        return pd.Series(patterns, index=prices.index)
     
     def _analyze_volume_patterns(self, volume: pd.Series) -> pd.Series:
         """Analyze volume patterns"""
@@ -126,14 +138,8 @@ class AIPredictorStrategy:
         returns = prices.pct_change()
         volatility = returns.rolling(window=20).std()
         
-        # Classify volatility into regimes
-        vol_quantiles = volatility.quantile([0.33, 0.67])
-        
-        regime = pd.Series(1, index=prices.index)  # Default: medium
-        regime[volatility <= vol_quantiles.iloc[0]] = 0  # Low volatility
-        regime[volatility >= vol_quantiles.iloc[1]] = 2  # High volatility
-        
-        return regime
+        # Classify against trailing terciles (full-sample quantiles would look ahead)
+        return pd.Series(tercile_regime(volatility, window=100), index=prices.index)
     
     def _generate_ml_predictions(self, df: pd.DataFrame) -> pd.Series:
         """Generate ML predictions (simulated)"""
@@ -184,6 +190,35 @@ class AIPredictorStrategy:
         
         return np.clip(confidence, 0.1, 0.95)
     
+    @staticmethod
+    def _window_slopes(values: np.ndarray) -> np.ndarray:
+        """Least-squares slope of each row against 0..m-1 (closed form of np.polyfit(x, y, 1)[0])"""
+        x = np.arange(values.shape[1]) - (values.shape[1] - 1) / 2
+        return values @ x / (x @ x)
+    
+    def _ascending_triangle_mask(self, windows: np.ndarray) -> np.ndarray:
+        """Vectorized _is_ascending_triangle over rows of price windows"""
+        highs = sliding_window_view(windows, 3, axis=1).max(axis=2)
+        return self._window_slopes(highs) > 0.001  # Ascending trend in highs
+    
+    def _double_bottom_mask(self, windows: np.ndarray) -> np.ndarray:
+        """Vectorized _is_double_bottom over rows of price windows"""
+        lows = sliding_window_view(windows, 3, axis=1).min(axis=2)
+        if lows.shape[1] < 6:
+            return np.zeros(len(windows), dtype=bool)
+        # Check for two similar lows
+        min_val = lows.min(axis=1, keepdims=True)
+        return (lows <= min_val * 1.02).sum(axis=1) >= 2
+    
+    def _cup_handle_mask(self, windows: np.ndarray) -> np.ndarray:
+        """Vectorized _is_cup_handle over rows of price windows"""
+        mid_idx = windows.shape[1] // 2
+        first_half = windows[:, :mid_idx]
+        second_half = windows[:, mid_idx:]
+        # Check if it forms a U-shape
+        return ((first_half[:, -1] > first_half.min(axis=1)) &
+                (second_half[:, 0] > second_half.min(axis=1)))
+    
     def _is_ascending_triangle(self, window: pd.Series) -> bool:
         """Check for ascending triangle pattern"""
         # Simplified pattern detection
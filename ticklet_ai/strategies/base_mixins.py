@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import pandas as pd
 
 class AiMlHooks:
@@ -16,6 +16,11 @@ class RegimeFilterMixin:
         from .market_regime_core import label_regime
         return label_regime(df)
 
+    def current_regime(self, symbol: str, interval: str) -> Optional[str]:
+        """Latest streaming label for a symbol (None until its candles have been seen)."""
+        from .market_regime_core import regime_labeller
+        return regime_labeller.current(symbol, interval)
+
     def is_bull(self, row: pd.Series) -> bool:
         return row.get("regime") == "bull"
 
@@ -1,7 +1,7 @@
 from freqtrade.strategy import DecimalParameter, IntParameter, BooleanParameter
-import talib.abstract as ta
 import pandas as pd
 from pandas import DataFrame
+from ticklet_ai.services.indicator_cache import CachedIndicators
 from ticklet_ai.strategies.base_strategy import BaseStrategy
 
 
@@ -54,25 +54,27 @@ class BullStrategy(BaseStrategy):
             self.logger.warning("Dataframe is empty or missing 'close' column.")
             return dataframe
 
+        indicators = CachedIndicators.from_dataframe(dataframe, metadata.get('pair'), self.timeframe)
+
         # EMA indicators for trend analysis
-        dataframe['ema_short'] = ta.EMA(dataframe['close'], timeperiod=self.ema_short_period.value)
-        dataframe['ema_long'] = ta.EMA(dataframe['close'], timeperiod=self.ema_long_period.value)
+        dataframe['ema_short'] = indicators.ema(self.ema_short_period.value)
+        dataframe['ema_long'] = indicators.ema(self.ema_long_period.value)
         dataframe['ema_trend'] = dataframe['ema_short'] - dataframe['ema_long']
 
         # RSI for momentum analysis
-        dataframe['rsi'] = ta.RSI(dataframe['close'], timeperiod=self.rsi_period.value)
+        dataframe['rsi'] = indicators.rsi(self.rsi_period.value)
 
         # MACD for trend confirmation (optional)
         if self.macd_enabled.value:
-            macd = ta.MACD(dataframe['close'])
-            dataframe['macd'] = macd['macd']
-            dataframe['macdsignal'] = macd['macdsignal']
-            dataframe['macdhist'] = macd['macdhist']
+            macd, macdsignal, macdhist = indicators.macd(12, 26, 9)
+            dataframe['macd'] = macd
+            dataframe['macdsignal'] = macdsignal
+            dataframe['macdhist'] = macdhist
             self.logger.debug("MACD indicators calculated.")
 
         # ATR for volatility assessment (optional)
         if self.atr_enabled.value:
-            dataframe['atr'] = ta.ATR(dataframe, timeperiod=self.atr_period.value)
+            dataframe['atr'] = indicators.atr(self.atr_period.value)
             dataframe['atr_normalized'] = dataframe['atr'] / dataframe['close']
             self.logger.debug("ATR indicators calculated.")
 
@@ -85,7 +87,7 @@ class BullStrategy(BaseStrategy):
 
         # Volume-based indicators for confirmation
         if 'volume' in dataframe.columns:
-            dataframe['volume_sma'] = ta.SMA(dataframe['volume'], timeperiod=20)
+            dataframe['volume_sma'] = indicators.sma(20, 'volume')
             dataframe['volume_ratio'] = dataframe['volume'] / dataframe['volume_sma']
 
         self.logger.debug(f"Bull strategy indicators populated for {metadata.get('pair', 'unknown pair')}.")
@@ -9,6 +9,8 @@ import numpy as np
 from typing import Dict, List, Optional
 import logging
 
+from ticklet_ai.services.rolling_quantile import tercile_regime
+
 logger = logging.getLogger(__name__)
 
 class ConditionStrategy:
@@ -67,36 +69,25 @@ class ConditionStrategy:
             return df
     
     def _classify_volatility_regime(self, volatility: pd.Series) -> pd.Series:
-        """Classify volatility into regimes"""
-        vol_quantiles = volatility.rolling(window=100).quantile([0.33, 0.67])
-        
-        regime = pd.Series("medium", index=volatility.index)
-        regime[volatility <= vol_quantiles.iloc[:, 0]] = "low"
-        regime[volatility >= vol_quantiles.iloc[:, 1]] = "high"
-        
-        return regime
+        """Classify volatility into regimes against its trailing 100-candle terciles"""
+        labels = np.array(["low", "medium", "high"], dtype=object)
+        return pd.Series(labels[tercile_regime(volatility, window=100)], index=volatility.index)
     
     def _detect_market_regime(self, df: pd.DataFrame) -> pd.Series:
         """Detect market regime: trending, consolidating, or volatile"""
-        regime = pd.Series("neutral", index=df.index)
+        period = self.config['trend_period']
         
-        for i in range(self.config['trend_period'], len(df)):
-            current_data = df.iloc[i-self.config['trend_period']:i]
-            
-            # Calculate regime characteristics
-            trend_strength = current_data['trend_strength'].mean()
-            volatility = current_data['volatility'].mean()
-            
-            # Determine regime
-            if trend_strength > self.config['regime_threshold']:
-                if volatility < self.config['consolidation_threshold']:
-                    regime.iloc[i] = "trending"
-                else:
-                    regime.iloc[i] = "volatile_trend"
-            elif volatility < self.config['consolidation_threshold']:
-                regime.iloc[i] = "consolidating"
-            else:
-                regime.iloc[i] = "volatile"
+        # Mean over the previous `period` rows (iloc[i-period:i]), NaNs skipped like DataFrame.mean
+        trend_strength = df['trend_strength'].rolling(window=period, min_periods=1).mean().shift(1)
+        volatility = df['volatility'].rolling(window=period, min_periods=1).mean().shift(1)
+        
+        # Determine regime
+        trending = (trend_strength > self.config['regime_threshold']).to_numpy()
+        calm = (volatility < self.config['consolidation_threshold']).to_numpy()
+        regime = pd.Series(np.select([trending & calm, trending, calm],
+                                     ["trending", "volatile_trend", "consolidating"], default="volatile"),
+                           index=df.index)
+        regime.iloc[:period] = "neutral"
         
         return regime
     
@@ -129,88 +120,60 @@ class ConditionStrategy:
         
         df = self.calculate_indicators(df)
         
-        for i in range(self.config['trend_period'], len(df)):
-            current = df.iloc[i]
-            self.current_regime = current['market_regime']
-            
-            signal = self._check_condition_entry(current, df.iloc[i-10:i])
-            if signal:
-                signals.append(signal)
+        period = self.config['trend_period']
+        if len(df) > period:
+            self.current_regime = df['market_regime'].iloc[-1]
         
-        return signals
-    
-    def _check_condition_entry(self, current: pd.Series, history: pd.DataFrame) -> Optional[Dict]:
-        """Check entry conditions based on market regime"""
-        regime = current['market_regime']
-        
-        if regime == "trending":
-            return self._check_trending_entry(current)
-        elif regime == "consolidating":
-            return self._check_consolidation_entry(current)
-        elif regime == "volatile":
-            return self._check_volatile_entry(current)
-        elif regime == "volatile_trend":
-            return self._check_volatile_trend_entry(current)
-        
-        return None
-    
-    def _check_trending_entry(self, current: pd.Series) -> Optional[Dict]:
-        """Entry logic for trending markets"""
-        trending_conditions = [
-            current['trend_strength'] > self.config['regime_threshold'],
-            current['condition_confidence'] >= self.config['min_confidence'],
-            current['volume_ratio'] > 1.0,
-            current['vol_regime'] != "high"
-        ]
+        signal_types = self._condition_entry_types(df)
+        signal_types[:period] = None
         
-        if all(trending_conditions):
-            direction = "long" if current['trend_direction'] > 0 else "short"
-            return self._create_condition_signal(direction, current, "trending")
-        
-        return None
-    
-    def _check_consolidation_entry(self, current: pd.Series) -> Optional[Dict]:
-        """Entry logic for consolidating markets"""
-        consolidation_conditions = [
-            current['volatility'] < self.config['consolidation_threshold'],
-            current['condition_confidence'] >= self.config['min_confidence'] * 0.8,
-            current['volume_ratio'] > self.config['breakout_threshold']  # Breakout signal
-        ]
-        
-        if all(consolidation_conditions):
-            direction = "long" if current['trend_direction'] > 0 else "short"
-            return self._create_condition_signal(direction, current, "breakout")
-        
-        return None
-    
-    def _check_volatile_entry(self, current: pd.Series) -> Optional[Dict]:
-        """Entry logic for volatile markets"""
-        volatile_conditions = [
-            current['volatility'] > self.config['regime_threshold'],
-            current['condition_confidence'] >= self.config['min_confidence'] * 1.2,  # Higher threshold
-            current['volume_ratio'] > 1.5,
-            current['trend_strength'] > 0.01  # Some directional bias
-        ]
-        
-        if all(volatile_conditions):
+        for i in np.flatnonzero(signal_types):  # rows with an entry (None is falsy)
+            current = df.iloc[i]
             direction = "long" if current['trend_direction'] > 0 else "short"
-            return self._create_condition_signal(direction, current, "volatile")
+            signals.append(self._create_condition_signal(direction, current, signal_types[i]))
         
-        return None
+        return signals
     
-    def _check_volatile_trend_entry(self, current: pd.Series) -> Optional[Dict]:
-        """Entry logic for volatile trending markets"""
-        volatile_trend_conditions = [
-            current['trend_strength'] > self.config['regime_threshold'] * 0.7,
-            current['condition_confidence'] >= self.config['min_confidence'] * 1.1,
-            current['volume_ratio'] > 1.3
-        ]
-        
-        if all(volatile_trend_conditions):
-            direction = "long" if current['trend_direction'] > 0 else "short"
-            return self._create_condition_signal(direction, current, "volatile_trend")
-        
-        return None
+    def _condition_entry_types(self, df: pd.DataFrame) -> np.ndarray:
+        """Signal type per row from the regime-specific entry conditions (None where no entry)"""
+        cfg = self.config
+        regime = df['market_regime']
+        trend_strength = df['trend_strength']
+        confidence = df['condition_confidence']
+        volume_ratio = df['volume_ratio']
+        volatility = df['volatility']
+        
+        # Trending: strong trend, confident, volume above average, volatility not high
+        trending = ((regime == "trending") &
+                    (trend_strength > cfg['regime_threshold']) &
+                    (confidence >= cfg['min_confidence']) &
+                    (volume_ratio > 1.0) &
+                    (df['vol_regime'] != "high"))
+        
+        # Consolidating: quiet market with a volume breakout
+        breakout = ((regime == "consolidating") &
+                    (volatility < cfg['consolidation_threshold']) &
+                    (confidence >= cfg['min_confidence'] * 0.8) &
+                    (volume_ratio > cfg['breakout_threshold']))
+        
+        # Volatile: higher confidence threshold and some directional bias
+        volatile = ((regime == "volatile") &
+                    (volatility > cfg['regime_threshold']) &
+                    (confidence >= cfg['min_confidence'] * 1.2) &
+                    (volume_ratio > 1.5) &
+                    (trend_strength > 0.01))
+        
+        # Volatile trend
+        volatile_trend = ((regime == "volatile_trend") &
+                          (trend_strength > cfg['regime_threshold'] * 0.7) &
+                          (confidence >= cfg['min_confidence'] * 1.1) &
+                          (volume_ratio > 1.3))
+        
+        signal_types = np.full(len(df), None, dtype=object)
+        for signal_type, mask in (("trending", trending), ("breakout", breakout),
+                                  ("volatile", volatile), ("volatile_trend", volatile_trend)):
+            signal_types[mask.to_numpy()] = signal_type
+        return signal_types
     
     def _create_condition_signal(self, direction: str, data: pd.Series, signal_type: str) -> Dict:
         """Create a condition-adaptive signal"""
@@ -1,8 +1,8 @@
 from freqtrade.strategy import DecimalParameter, IntParameter, BooleanParameter
-import talib.abstract as ta
 import pandas as pd
 from pandas import DataFrame
 from functools import reduce
+from ticklet_ai.services.indicator_cache import CachedIndicators
 from ticklet_ai.strategies.base_strategy import BaseStrategy
 
 
@@ -50,24 +50,26 @@ class JamBotStrategy(BaseStrategy):
             self.logger.warning("Dataframe is empty or missing 'close' column.")
             return dataframe
 
+        indicators = CachedIndicators.from_dataframe(dataframe, metadata.get('pair'), self.timeframe)
+
         # EMA
-        dataframe['ema_short'] = ta.EMA(dataframe['close'], timeperiod=self.ema_short_period.value)
-        dataframe['ema_long'] = ta.EMA(dataframe['close'], timeperiod=self.ema_long_period.value)
+        dataframe['ema_short'] = indicators.ema(self.ema_short_period.value)
+        dataframe['ema_long'] = indicators.ema(self.ema_long_period.value)
 
         # RSI
-        dataframe['rsi'] = ta.RSI(dataframe['close'], timeperiod=self.rsi_period.value)
+        dataframe['rsi'] = indicators.rsi(self.rsi_period.value)
 
         # MACD (optional)
         if self.macd_enabled.value:
-            macd = ta.MACD(dataframe['close'])
-            dataframe['macd'] = macd['macd']
-            dataframe['macdsignal'] = macd['macdsignal']
-            dataframe['macdhist'] = macd['macdhist']
+            macd, macdsignal, macdhist = indicators.macd(12, 26, 9)
+            dataframe['macd'] = macd
+            dataframe['macdsignal'] = macdsignal
+            dataframe['macdhist'] = macdhist
             self.logger.debug("MACD indicators calculated.")
 
         # ATR (optional)
         if self.atr_enabled.value:
-            dataframe['atr'] = ta.ATR(dataframe, timeperiod=self.atr_period.value)
+            dataframe['atr'] = indicators.atr(self.atr_period.value)
             self.logger.debug("ATR indicator calculated.")
 
         # Debug: Log indicator calculations
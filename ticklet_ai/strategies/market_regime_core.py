@@ -1,45 +1,189 @@
 from __future__ import annotations
+import threading
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
 import pandas as pd
 import numpy as np
 
+from ticklet_ai.services.indicator_kernels import directional_movement as _directional_movement
+from ticklet_ai.services.indicator_kernels import true_range as _true_range
+
 def ema(series: pd.Series, span: int) -> pd.Series:
     return series.ewm(span=span, adjust=False).mean()
 
 def true_range(df: pd.DataFrame) -> pd.Series:
-    prev_close = df["close"].shift(1)
-    tr = pd.concat([
-        (df["high"] - df["low"]).abs(),
-        (df["high"] - prev_close).abs(),
-        (df["low"]  - prev_close).abs(),
-    ], axis=1).max(axis=1)
-    return tr
+    tr = _true_range(df["high"].to_numpy(dtype=float), df["low"].to_numpy(dtype=float),
+                     df["close"].to_numpy(dtype=float))
+    return pd.Series(tr, index=df.index)
+
+def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    return pd.Series(values).rolling(period).mean().to_numpy()
+
+def _adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    # Regime ADX smooths with simple rolling means (RegimeState mirrors this);
+    # indicator_kernels.adx is the TA-Lib Wilder variant over the same DM and TR
+    plus_dm, minus_dm = _directional_movement(high, low)
+    atr = _rolling_mean(_true_range(high, low, close), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di  = 100 * _rolling_mean(plus_dm, period) / atr
+        minus_di = 100 * _rolling_mean(minus_dm, period) / atr
+        di_sum = plus_di + minus_di
+        dx = np.abs(plus_di - minus_di) / np.where(di_sum == 0, np.nan, di_sum) * 100
+    return np.nan_to_num(_rolling_mean(dx, period), nan=0.0, posinf=np.inf, neginf=-np.inf)
 
 def adx(df: pd.DataFrame, period: int = 14) -> pd.Series:
-    up = df["high"].diff()
-    down = -df["low"].diff()
-    plus_dm  = np.where((up > down) & (up > 0), up, 0.0)
-    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
-    tr = true_range(df)
-    atr = tr.rolling(period).mean()
-    plus_di  = 100 * pd.Series(plus_dm, index=df.index).rolling(period).mean() / atr
-    minus_di = 100 * pd.Series(minus_dm, index=df.index).rolling(period).mean() / atr
-    dx = (abs(plus_di - minus_di) / (plus_di + minus_di).replace(0, np.nan)) * 100
-    return dx.rolling(period).mean().fillna(0)
+    values = _adx(df["high"].to_numpy(dtype=float), df["low"].to_numpy(dtype=float),
+                  df["close"].to_numpy(dtype=float), period)
+    return pd.Series(values, index=df.index)
+
+def regime_columns(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                   fast: int = 50,
+                   slow: int = 200,
+                   adx_thr: float = 18.0,
+                   vol_thr: float = 0.012) -> Dict[str, np.ndarray]:
+    """Regime columns (ema_fast, ema_slow, adx, vol, regime) as arrays, without building frames."""
+    close_s = pd.Series(close)
+    ema_fast = ema(close_s, fast).to_numpy()
+    ema_slow = ema(close_s, slow).to_numpy()
+    adx_v = _adx(high, low, close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol = _true_range(high, low, close) / np.concatenate(([np.nan], close[:-1]))
+
+    trending = (adx_v >= adx_thr) & (vol >= vol_thr)
+    cond_bull = (ema_fast > ema_slow) & trending
+    cond_bear = (ema_fast < ema_slow) & trending
+
+    regime = np.where(cond_bull, "bull",
+               np.where(cond_bear, "bear", "chop")).astype(object)
+    return {"ema_fast": ema_fast, "ema_slow": ema_slow, "adx": adx_v, "vol": vol, "regime": regime}
 
 def label_regime(df: pd.DataFrame,
                  fast: int = 50,
                  slow: int = 200,
                  adx_thr: float = 18.0,
                  vol_thr: float = 0.012) -> pd.DataFrame:
-    df = df.copy()
-    df["ema_fast"] = ema(df["close"], fast)
-    df["ema_slow"] = ema(df["close"], slow)
-    df["adx"] = adx(df)
-    df["vol"] = true_range(df) / df["close"].shift(1)
-
-    cond_bull = (df["ema_fast"] > df["ema_slow"]) & (df["adx"] >= adx_thr) & (df["vol"] >= vol_thr)
-    cond_bear = (df["ema_fast"] < df["ema_slow"]) & (df["adx"] >= adx_thr) & (df["vol"] >= vol_thr)
-
-    df["regime"] = np.where(cond_bull, "bull",
-                     np.where(cond_bear, "bear", "chop"))
-    return df
\ No newline at end of file
+    """Adds the ema_fast, ema_slow, adx, vol and regime columns to `df` in place and returns it."""
+    cols = regime_columns(df["high"].to_numpy(dtype=float), df["low"].to_numpy(dtype=float),
+                          df["close"].to_numpy(dtype=float), fast, slow, adx_thr, vol_thr)
+    # not DataFrame.assign: without Copy-on-Write (pandas 2.2) it deep-copies the whole frame
+    for name, col in cols.items():
+        df[name] = col
+    return df
+
+
+class RegimeState:
+    """Streaming label_regime for one series: O(1) work per candle."""
+
+    def __init__(self, fast: int = 50, slow: int = 200, adx_thr: float = 18.0,
+                 vol_thr: float = 0.012, period: int = 14):
+        self.alpha_fast = 2.0 / (fast + 1)
+        self.alpha_slow = 2.0 / (slow + 1)
+        self.adx_thr, self.vol_thr, self.period = adx_thr, vol_thr, period
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self.adx = 0.0
+        self.vol = np.nan
+        self.regime = "chop"
+        self.last_time: Optional[int] = None
+        self._prev: Optional[Tuple[float, float, float]] = None
+        self._tr: deque = deque(maxlen=period)
+        self._plus_dm: deque = deque(maxlen=period)
+        self._minus_dm: deque = deque(maxlen=period)
+        self._dx: deque = deque(maxlen=period)
+
+    def update(self, high: float, low: float, close: float, time_ms: Optional[int] = None) -> str:
+        high, low, close = np.float64(high), np.float64(low), np.float64(close)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if self._prev is None:
+                tr, plus_dm, minus_dm, self.vol = abs(high - low), 0.0, 0.0, np.nan
+            else:
+                prev_high, prev_low, prev_close = self._prev
+                tr = np.fmax(abs(high - low), np.fmax(abs(high - prev_close), abs(low - prev_close)))
+                up, down = high - prev_high, prev_low - low
+                plus_dm = up if (up > down and up > 0) else 0.0
+                minus_dm = down if (down > up and down > 0) else 0.0
+                self.vol = tr / prev_close
+            self._tr.append(tr)
+            self._plus_dm.append(plus_dm)
+            self._minus_dm.append(minus_dm)
+
+            dx = np.nan
+            if len(self._tr) == self.period:
+                atr = np.float64(sum(self._tr)) / self.period
+                plus_di = 100 * (np.float64(sum(self._plus_dm)) / self.period) / atr
+                minus_di = 100 * (np.float64(sum(self._minus_dm)) / self.period) / atr
+                di_sum = plus_di + minus_di
+                dx = abs(plus_di - minus_di) / (np.nan if di_sum == 0 else di_sum) * 100
+            self._dx.append(dx)
+            adx_v = np.float64(sum(self._dx)) / self.period if len(self._dx) == self.period else np.nan
+            self.adx = 0.0 if np.isnan(adx_v) else float(adx_v)
+
+        self.ema_fast = close if self.ema_fast is None else self.ema_fast + self.alpha_fast * (close - self.ema_fast)
+        self.ema_slow = close if self.ema_slow is None else self.ema_slow + self.alpha_slow * (close - self.ema_slow)
+        self._prev = (high, low, close)
+        self.last_time = time_ms
+
+        trending = self.adx >= self.adx_thr and self.vol >= self.vol_thr
+        if self.ema_fast > self.ema_slow and trending:
+            self.regime = "bull"
+        elif self.ema_fast < self.ema_slow and trending:
+            self.regime = "bear"
+        else:
+            self.regime = "chop"
+        return self.regime
+
+
+class RegimeLabeller:
+    """Per-(symbol, interval) streaming regime states, fed by closed candles."""
+
+    def __init__(self, **params: Any):
+        self.params = params
+        self.states: Dict[Tuple[str, str], RegimeState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, symbol: str, interval: str, reset: bool = False) -> RegimeState:
+        key = (symbol.upper(), interval)
+        with self._lock:
+            st = self.states.get(key)
+            if st is None or reset:
+                st = self.states[key] = RegimeState(**self.params)
+            return st
+
+    def update(self, symbol: str, interval: str, row) -> str:
+        """O(1) update from one closed candle (record or kline dict)."""
+        st = self._state(symbol, interval)
+        if st.last_time is not None and int(row["time"]) <= st.last_time:
+            return st.regime
+        return st.update(float(row["high"]), float(row["low"]), float(row["close"]), int(row["time"]))
+
+    def sync(self, symbol: str, interval: str, time: np.ndarray, high: np.ndarray,
+             low: np.ndarray, close: np.ndarray) -> str:
+        """
+        Fold in candles newer than the state; the state is rebuilt from this
+        history when it does not line up with it (first call or after a gap).
+        """
+        st = self._state(symbol, interval)
+        start = 0
+        if st.last_time is not None:
+            k = int(np.searchsorted(time, st.last_time))
+            if k < len(time) and int(time[k]) == st.last_time:
+                start = k + 1
+            elif len(time) and st.last_time > int(time[-1]):
+                start = len(time)  # already ahead of this history
+            else:
+                st = self._state(symbol, interval, reset=True)
+        for t, h, l, c in zip(time[start:].tolist(), high[start:].tolist(), low[start:].tolist(), close[start:].tolist()):
+            st.update(h, l, c, t)
+        return st.regime
+
+    def current(self, symbol: str, interval: str) -> Optional[str]:
+        st = self.states.get((symbol.upper(), interval))
+        return None if st is None or st.last_time is None else st.regime
+
+    def attach(self, stream) -> None:
+        """Keep labels current from a KlineStreamService's candle-close events."""
+        stream.on_candle_close(self.update)
+
+
+regime_labeller = RegimeLabeller()
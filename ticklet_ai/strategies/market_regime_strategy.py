@@ -15,8 +15,7 @@ class MarketRegimeStrategy(IStrategy, RegimeFilterMixin, ConditionGateMixin, AiM
     use_custom_stoploss = False
 
     def populate_indicators(self, dataframe: DataFrame, metadata: Dict[str, Any]) -> DataFrame:
-        df = dataframe.copy()
-        df = label_regime(df)
+        df = label_regime(dataframe)
         for col, default in [
             ("ai_confidence", 0.0), ("ml_confidence", 0.0), ("anomaly_score", 0.0),
             ("usd_volume", 0.0), ("not_delisted", True), ("btc_corr_ok", True)
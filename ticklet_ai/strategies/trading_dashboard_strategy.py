@@ -1,7 +1,7 @@
 from freqtrade.strategy import DecimalParameter, IntParameter, BooleanParameter
-import talib.abstract as ta
 import pandas as pd
 from pandas import DataFrame
+from ticklet_ai.services.indicator_cache import CachedIndicators
 from ticklet_ai.strategies.base_strategy import BaseStrategy
 
 
@@ -49,12 +49,14 @@ class TradingDashboardStrategy(BaseStrategy):
             self.logger.warning("Dataframe is empty or missing 'close' column.")
             return dataframe
 
+        indicators = CachedIndicators.from_dataframe(dataframe, metadata.get('pair'), self.timeframe)
+
         # EMA
-        dataframe['ema_short'] = ta.EMA(dataframe['close'], timeperiod=self.ema_short_period.value)
-        dataframe['ema_long'] = ta.EMA(dataframe['close'], timeperiod=self.ema_long_period.value)
+        dataframe['ema_short'] = indicators.ema(self.ema_short_period.value)
+        dataframe['ema_long'] = indicators.ema(self.ema_long_period.value)
 
         # RSI
-        dataframe['rsi'] = ta.RSI(dataframe['close'], timeperiod=self.rsi_period.value)
+        dataframe['rsi'] = indicators.rsi(self.rsi_period.value)
 
         # Confidence (Simulated: Derived from volatility and volume)
         dataframe['confidence'] = 1 - (dataframe['rsi'] / 100)  # Example confidence metric
@@ -5,7 +5,8 @@ DATA_DIR = Path(os.getenv("TICKLET_DATA_DIR", "./data")).resolve()
 MODELS_DIR = Path(os.getenv("TICKLET_MODELS_DIR", str(DATA_DIR / "models"))).resolve()
 LOGS_DIR = Path(os.getenv("TICKLET_LOGS_DIR", str(DATA_DIR / "logs"))).resolve()
 CURVES_DIR = DATA_DIR / "curves"
+CANDLES_DIR = Path(os.getenv("TICKLET_CANDLES_DIR", str(DATA_DIR / "candles"))).resolve()
 
 def ensure_dirs():
-    for p in (DATA_DIR, MODELS_DIR, LOGS_DIR, CURVES_DIR):
-        p.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+    for p in (DATA_DIR, MODELS_DIR, LOGS_DIR, CURVES_DIR, CANDLES_DIR):
+        p.mkdir(parents=True, exist_ok=True)